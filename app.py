@@ -1,175 +1,101 @@
 import os
-import re
+import io
 import base64
 import time
+import threading
 from datetime import datetime
-from typing import Optional, Tuple
-
-import requests
-from bs4 import BeautifulSoup
-from pptx import Presentation
-from pptx.util import Pt
-from pptx.dml.color import RGBColor
-
-# -------------------- scrape utils --------------------
-def _clean(s: Optional[str]) -> str:
-    import html, unicodedata
-    if not s: return ""
-    s = html.unescape(s)
-    s = unicodedata.normalize("NFKC", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s.replace("\u2212", "-")
-
-def _norm_heading(h: str) -> Optional[str]:
-    h = _clean(h).lower().rstrip(":")
-    MAP = {
-        "importance":"importance",
-        "objective":"objective",
-        "design, setting, and participants":"dsp",
-        "design, settings, and participants":"dsp",
-        "participants":"dsp",
-        "intervention":"interventions",
-        "interventions":"interventions",
-        "main outcomes and measures":"moam",
-        "outcomes":"moam",
-        "results":"results",
-        "conclusions and relevance":"conclusions",
-        "conclusions":"conclusions",
-        "meaning":"meaning",
-        "trial registration":"trial_registration",
-    }
-    return MAP.get(h)
-
-def _parse_abstract_dom(soup: BeautifulSoup) -> dict:
-    out = {}
-    abstract = soup.find(id="abstract") or soup.select_one("#abstract")
-    if not abstract: return out
-    for p in abstract.find_all("p", recursive=True):
-        strong = p.find("strong")
-        if not strong: continue
-        key = _norm_heading(strong.get_text(" ", strip=True))
-        if not key: continue
-        whole = p.get_text(" ", strip=True)
-        content = re.sub(r"^\s*"+re.escape(strong.get_text(strip=True))+r"\s*:?\s*", "", whole, flags=re.I)
-        out[key] = _clean(content)
-    return out
-
-def _parse_abstract_meta(soup: BeautifulSoup) -> dict:
-    out = {}
-    meta = soup.find("meta", attrs={"name":"citation_abstract"})
-    if not meta or not meta.get("content"): return out
-    inner = BeautifulSoup(meta["content"], "lxml")
-    for h in inner.find_all(["h3","strong"]):
-        key = _norm_heading(h.get_text(" ", strip=True))
-        if not key: continue
-        content = ""
-        sib = h.find_next_sibling()
-        if sib and sib.name == "p":
-            content = sib.get_text(" ", strip=True)
-        else:
-            par = h.parent if h.parent and h.parent.name == "p" else None
-            if par:
-                whole = par.get_text(" ", strip=True)
-                content = re.sub(r"^\s*"+re.escape(h.get_text(strip=True))+r"\s*:?\s*", "", whole, flags=re.I)
-        if content:
-            out[key] = _clean(content)
-    return out
-
-def _parse_key_points(soup: BeautifulSoup) -> dict:
-    out = {"question":"", "findings":"", "meaning":""}
-    hdr = None
-    for tag in soup.find_all(["h2","h3","h4"]):
-        if _clean(tag.get_text()).lower() == "key points":
-            hdr = tag; break
-    if not hdr: return out
-    container = hdr.parent
-    for p in container.find_all("p"):
-        t = _clean(p.get_text(" ", strip=True))
-        m = re.match(r"(question|findings|meaning)\.?\s*(.+)", t, flags=re.I)
-        if m:
-            k, v = m.group(1).lower(), _clean(m.group(2))
-            out[k] = v
-    return out
-
-def _pull_comparator(text: str) -> str:
-    t = _clean(text)
-    for pat in [r"\bvs\.?\s+([^.;:]+)", r"\bversus\s+([^.;:]+)", r"\bcompared with\s+([^.;:]+)"]:
-        m = re.search(pat, t, flags=re.I)
-        if m: return _clean(m.group(1))
-    return ""
-
-def _pull_settings_locations(sections: dict) -> str:
-    dsp = sections.get("dsp","")
-    if not dsp: return ""
-    loc_rgx = re.compile(
-        r"(?:\d+\s+(?:center|centers|site|sites|unit|units|hospital|hospitals)|across the\s+[A-Za-z ,\-]+|in\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?|multicenter|single[- ]center)",
-        flags=re.I
-    )
-    sentences = re.split(r"(?<=[.!?])\s+", dsp)
-    for s in sentences:
-        if loc_rgx.search(s):
-            return _clean(s)[:250]
-    return ""
-
-def _pull_primary_outcome(moam: str, backup_texts: str = "") -> str:
-    for t in [moam, backup_texts]:
-        tt = _clean(t)
-        m = re.search(r"(primary (?:outcome|endpoint)[^.;:]*[.;:]?)", tt, flags=re.I)
-        if m: return _clean(m.group(1))
-    return _clean(moam)
-
+from typing import Callable, List, Optional, Tuple
+
+from va_records import VARecord
+
+# requests / bs4 / pptx ağır modüller: MCP el sıkışmasını geciktirmemek için
+# ilk kullanımda (fonksiyon içinde) import edilir.
+
+# -------------------- extraction core --------------------
+# Çıkarım (parse + sezgiler) extraction.py'de, HTTP havuzu fetchers.py'de;
+# jama_scraper.py ile aynı çekirdek paylaşılır. Eski adlar geriye dönük uyum için burada.
+from extraction import HEURISTICS_VERSION, compile_patterns, derive_va, first_sentence, rest_sentences
+from fetchers import HTTP_HEADERS, WARM_HOSTS, HttpFetcher, get_session, warm_http_pool
+from deadline import DeadlineExceeded
+
+# -------------------- templates --------------------
+_template_cache = {}
+_template_lock = threading.Lock()
+
+def load_template_bytes(template_path: str) -> bytes:
+    """Şablon dosyasını belleğe alır; dosya değişmedikçe (mtime/size) diskten tekrar okumaz."""
+    st = os.stat(template_path)
+    key = os.path.abspath(template_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _template_cache.get(key)
+    if hit and hit[0] == stamp:
+        return hit[1]
+    with open(template_path, "rb") as f:
+        data = f.read()
+    with _template_lock:
+        _template_cache[key] = (stamp, data)
+    return data
+
+def preload_template(template_path: str) -> int:
+    """Şablonu önbelleğe alır ve python-pptx ile bir kez açarak import/parse maliyetini öder."""
+    from pptx import Presentation
+    data = load_template_bytes(template_path)
+    Presentation(io.BytesIO(data))
+    return len(data)
+
+def warm_worker() -> dict:
+    """
+    CPU havuzu süreçlerinin başlatıcısı: bs4/lxml ve python-pptx importu, desen derleme ve
+    kayıtlı şablonların önbelleğe alınması ilk gerçek isteğe kalmaz. Hatalar havuzu bozmaz.
+    """
+    done = {}
+    steps = [("parser", lambda: __import__("bs4").BeautifulSoup("<p></p>", "lxml") and 1),
+             ("patterns", compile_patterns)]
+    from template_registry import get_registry
+    for e in get_registry().describe():
+        if e["exists"]:
+            steps.append((f"template:{e['name']}", lambda p=e["path"]: preload_template(p)))
+    for name, fn in steps:
+        try:
+            done[name] = fn()
+        except Exception as e:
+            done[name] = f"error: {e}"
+    return done
+
+_digest_cache = {}
+
+def template_digest(template_path: str) -> str:
+    """Şablon içeriğinin sha256 özeti; dosya değişmedikçe yeniden hesaplanmaz."""
+    import hashlib
+    st = os.stat(template_path)
+    key = (os.path.abspath(template_path), st.st_mtime_ns, st.st_size)
+    digest = _digest_cache.get(key)
+    if digest is None:
+        digest = hashlib.sha256(load_template_bytes(template_path)).hexdigest()
+        _digest_cache[key] = digest
+    return digest
+
+# -------------------- scrape --------------------
 def scrape_url(url: str) -> dict:
+    return scrape_url_raw(url)[0]
+
+def scrape_url_raw(url: str) -> Tuple[dict, dict]:
+    """({"url","title","va"}, ham bölümler) döndürür; ham bölümler depoda saklanır."""
+    return parse_html(fetch_url(url), url)
+
+# Sunucu iki aşamayı ayrı havuzlarda çalıştırır: fetch (IO) ve parse (CPU süreci).
+def fetch_url(url: str, deadline=None) -> str:
+    """Sayfa HTML'i; `deadline` (deadline.Deadline) verilirse 25 sn'lik üst sınır kalan süreyle kısalır."""
     try:
-        r = requests.get(url, headers={"User-Agent":"Mozilla/5.0","Accept-Language":"en-US,en;q=0.9"}, timeout=25)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "lxml")
-
-        title = ""
-        h1 = soup.find("h1")
-        if h1: title = _clean(h1.get_text(" ", strip=True))
-        if not title:
-            og = soup.find("meta", attrs={"property":"og:title"})
-            if og and og.get("content"): title = _clean(og["content"])
-        if not title:
-            ct = soup.find("meta", attrs={"name":"citation_title"})
-            if ct and ct.get("content"): title = _clean(ct["content"])
-
-        secs = _parse_abstract_dom(soup) or _parse_abstract_meta(soup)
-        kp = _parse_key_points(soup)
-
-        participants = secs.get("dsp","")
-        intervention = secs.get("interventions","")
-        moam_text    = secs.get("moam","")
-        results      = secs.get("results","")
-        importance   = secs.get("importance","")
-        objective    = secs.get("objective","")
-        conclusions  = secs.get("conclusions","") or secs.get("meaning","")
-
-        before       = kp["question"]  or importance
-        findings_sum = kp["findings"]  or results
-        implications = kp["meaning"]   or conclusions
-
-        comparator   = _pull_comparator(intervention) or _pull_comparator(participants)
-        settings_locs= _pull_settings_locations(secs)
-        primary_out  = _pull_primary_outcome(moam_text, participants + " " + intervention)
-
-        return {
-            "url": url,
-            "title": title,
-            "va": {
-                "the_study": {
-                    "participants": participants,
-                    "intervention": intervention,
-                    "comparator": comparator,
-                    "primary_outcome": primary_out,
-                    "settings_locations": settings_locs
-                },
-                "findings": {
-                    "summary": findings_sum,
-                    "key_numbers": []
-                }
-            }
-        }
+        return HttpFetcher(timeout=25).fetch(url, deadline)
+    except Exception as e:
+        raise Exception(f"URL scraping failed: {str(e)}")
+
+def parse_html(html_src: str, url: str) -> Tuple[dict, dict]:
+    import extraction
+    try:
+        rec, raw = extraction.extract_article(html_src, url)
+        return rec.to_dict(), raw
     except Exception as e:
         raise Exception(f"URL scraping failed: {str(e)}")
 
@@ -181,76 +107,131 @@ def _find_shape(slide, name):
     return None
 
 def _set_text(shape, txt, size=16):
+    from pptx.util import Pt
+    from pptx.dml.color import RGBColor
+    import autofit
     if shape is None or not getattr(shape, "has_text_frame", False): return
-    tf = shape.text_frame; tf.clear()
+    # punto: kutuya sığan en büyük değer (en fazla `size`)
+    fit = autofit.fit_shape(shape, txt or "", size, font=autofit.shape_font(shape))
+    tf = shape.text_frame; tf.clear(); tf.word_wrap = True
     run = tf.paragraphs[0].add_run()
     run.text = txt or ""
-    run.font.size = Pt(size); run.font.color.rgb = RGBColor(0,0,0)
+    run.font.size = Pt(fit); run.font.color.rgb = RGBColor(0,0,0)
 
-def _first_sentence(t: str) -> str:
-    t = (t or "").strip()
-    if not t: return ""
-    return re.split(r"(?<=[.!?])\s+", t, maxsplit=1)[0].strip()
+# Render çıktısını etkileyen her değişiklikte artırılmalı (artifact önbelleği anahtarına girer).
+RENDERER_VERSION = "app-pptx/2"
 
-def render_to_pptx(data: dict, template_path: str, output_path: str) -> str:
+def slide_texts(data) -> List[Tuple[str, str, int]]:
+    """
+    Şablondan bağımsız türetilmiş metinler: [(şekil adı, metin, en büyük punto)].
+    İlk/kalan cümleler ve "Intervention vs <karşılaştırma>" alt başlığı bir kez hesaplanır;
+    birden fazla şablona render ederken tüm şablonlar aynı listeyi kullanır.
+    """
+    rec = data if isinstance(data, VARecord) else VARecord.from_dict(data)
+    ts = rec.va.the_study
+    pop, inter, comp = ts.participants, ts.intervention, ts.comparator
+    summary = rec.va.findings.summary
+    return [
+        ("title", rec.title, 22),
+        ("footer_citation", rec.url, 10),
+        ("population_subtitle", first_sentence(pop), 16),
+        ("population_description", pop, 14),
+        ("intervention_subtitle", f"Intervention vs {comp}" if comp else first_sentence(inter), 16),
+        ("intervention_description", inter, 14),
+        ("settings_locations_description", ts.settings_locations, 14),
+        ("primary_outcome_description", ts.primary_outcome, 14),
+        ("findings_description_1", first_sentence(summary), 14),
+        ("findings_description_2", rest_sentences(summary), 14),
+    ]
+
+def render_texts_to_pptx(texts: List[Tuple[str, str, int]], template_path: str, output_path: str) -> str:
+    """slide_texts() çıktısını şablona basar; punto her şablonun kutularına göre ayrı sığdırılır."""
     try:
-        va = data.get("va", {})
-        ts = va.get("the_study", {})
-        fd = va.get("findings", {})
-
         # Check if template exists
         if not os.path.exists(template_path):
             raise FileNotFoundError(f"Template file not found: {template_path}")
 
-        prs = Presentation(template_path)
+        from pptx import Presentation
+        prs = Presentation(io.BytesIO(load_template_bytes(template_path)))
         slide = prs.slides[0]
+        for name, txt, size in texts:
+            _set_text(_find_shape(slide, name), txt, size)
 
-        _set_text(_find_shape(slide,"title"), data.get("title",""), 22)
-        _set_text(_find_shape(slide,"footer_citation"), data.get("url",""), 10)
-
-        pop = ts.get("participants","")
-        _set_text(_find_shape(slide,"population_subtitle"), _first_sentence(pop), 16)
-        _set_text(_find_shape(slide,"population_description"), pop, 14)
-
-        inter = ts.get("intervention","")
-        comp  = ts.get("comparator","")
-        inter_sub = f"Intervention vs {comp}" if comp else _first_sentence(inter)
-        _set_text(_find_shape(slide,"intervention_subtitle"), inter_sub, 16)
-        _set_text(_find_shape(slide,"intervention_description"), inter, 14)
-
-        _set_text(_find_shape(slide,"settings_locations_description"), ts.get("settings_locations",""), 14)
-        _set_text(_find_shape(slide,"primary_outcome_description"), ts.get("primary_outcome",""), 14)
-
-        summary = fd.get("summary","")
-        _set_text(_find_shape(slide,"findings_description_1"), _first_sentence(summary), 14)
-        rest = re.split(r"(?<=[.!?])\s+", (summary or "").strip(), maxsplit=1)
-        _set_text(_find_shape(slide,"findings_description_2"), rest[1].strip() if len(rest)>1 else "", 14)
-
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
         prs.save(output_path)
         return output_path
     except Exception as e:
         raise Exception(f"PowerPoint creation failed: {str(e)}")
 
+def render_to_pptx(data, template_path: str, output_path: str) -> str:
+    """`data` bir VARecord ya da onun sözlük (MCP tel formatı) karşılığı olabilir."""
+    try:
+        texts = slide_texts(data)
+    except Exception as e:
+        raise Exception(f"PowerPoint creation failed: {str(e)}")
+    return render_texts_to_pptx(texts, template_path, output_path)
+
+def template_output_path(output_path: str, template_name: str) -> str:
+    """Çoklu şablonda şablon başına çıktı adı: visual_abstract.pptx -> visual_abstract-<ad>.pptx"""
+    base, ext = os.path.splitext(output_path)
+    return f"{base}-{template_name}{ext or '.pptx'}"
+
+def render_to_pptx_cached(data, template_path: str, output_path: str) -> Tuple[str, bool]:
+    """
+    Aynı veri + şablon + renderer sürümü daha önce render edildiyse saklanan PPTX'i
+    `output_path`'e kopyalar; değilse render edip önbelleğe ekler. (yol, önbellekten_mi)
+    """
+    key, hit = lookup_artifact(data, template_path, output_path)
+    if hit:
+        return output_path, True
+    render_to_pptx(data, template_path, output_path)
+    store_artifact(key, output_path)
+    return output_path, False
+
+def lookup_artifact(data, template_path: str, output_path: str) -> Tuple[Optional[str], bool]:
+    """(önbellek anahtarı, isabet) — isabette dosya `output_path`'e kopyalanmıştır. Önbellek kapalıysa anahtar None."""
+    from artifact_cache import artifact_key, get_cache
+    cache = get_cache()
+    if not cache.enabled or not os.path.exists(template_path):
+        return None, False
+    key = artifact_key(data, template_digest(template_path), RENDERER_VERSION)
+    return key, cache.materialize(key, output_path) is not None
+
+def store_artifact(key: Optional[str], output_path: str):
+    if key:
+        from artifact_cache import get_cache
+        get_cache().put(key, output_path)
+
 # -------------------- GitHub upload --------------------
+GITHUB_TIMEOUT = float(os.environ.get("GITHUB_TIMEOUT_SECONDS", "30"))
+# GitHub Enterprise veya yerel stub (bench_github.py) için değiştirilebilir
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
 def upload_to_github_release(
     filename: str,
     title: str,
     repo_full_name: str,
     github_token: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+    deadline=None,
 ) -> Tuple[Optional[str], Optional[str]]:
     """
     'latest-abstract' tag'li release yaratır (varsa silip baştan), PPTX'i asset olarak yükler,
-    herkese açık browser_download_url döndürür.
+    herkese açık browser_download_url döndürür. `on_stage` verilirse her API adımında çağrılır.
+    Her API çağrısının timeout'u GITHUB_TIMEOUT_SECONDS ile, `deadline` verilirse kalan süreyle sınırlıdır.
     """
+    stage = on_stage or (lambda _s: None)
+    def t() -> float:
+        return deadline.timeout(GITHUB_TIMEOUT, "GitHub") if deadline is not None else GITHUB_TIMEOUT
     try:
         if not repo_full_name or "/" not in repo_full_name:
             return None, "Geçersiz repo formatı. 'kullanici/repoadi' olmalı."
         if not github_token:
             return None, "GitHub token gerekli."
 
+        http = get_session()
         owner, repo = repo_full_name.split("/", 1)
-        api_base = f"https://api.github.com/repos/{owner}/{repo}"
+        api_base = f"{GITHUB_API_URL}/repos/{owner}/{repo}"
         headers_json = {
             "Authorization": f"Bearer {github_token}",
             "Accept": "application/vnd.github+json",
@@ -259,22 +240,25 @@ def upload_to_github_release(
         safe_title = (title or "JAMA Abstract")[:70]
 
         # repo erişimi
-        repo_check = requests.get(api_base, headers=headers_json)
+        stage("upload:repo")
+        repo_check = http.get(api_base, headers=headers_json, timeout=t())
         if repo_check.status_code != 200:
             return None, f"Repo erişimi başarısız: {repo_check.status_code} {repo_check.text}"
 
         # eski release + tag sil
-        r = requests.get(f"{api_base}/releases/tags/{tag}", headers=headers_json)
+        stage("upload:cleanup")
+        r = http.get(f"{api_base}/releases/tags/{tag}", headers=headers_json, timeout=t())
         if r.status_code == 200:
             rel = r.json()
             rid = rel["id"]
-            assets = requests.get(f"{api_base}/releases/{rid}/assets", headers=headers_json).json()
+            assets = http.get(f"{api_base}/releases/{rid}/assets", headers=headers_json, timeout=t()).json()
             for a in assets:
-                requests.delete(f"{api_base}/releases/assets/{a['id']}", headers=headers_json)
-            requests.delete(f"{api_base}/releases/{rid}", headers=headers_json)
-            requests.delete(f"{api_base}/git/refs/tags/{tag}", headers=headers_json)
+                http.delete(f"{api_base}/releases/assets/{a['id']}", headers=headers_json, timeout=t())
+            http.delete(f"{api_base}/releases/{rid}", headers=headers_json, timeout=t())
+            http.delete(f"{api_base}/git/refs/tags/{tag}", headers=headers_json, timeout=t())
 
         # yeni release
+        stage("upload:release")
         rel_body = {
             "tag_name": tag,
             "name": f"JAMA Abstract - {safe_title}",
@@ -282,21 +266,22 @@ def upload_to_github_release(
             "draft": False,
             "prerelease": False
         }
-        cr = requests.post(f"{api_base}/releases", json=rel_body, headers=headers_json)
+        cr = http.post(f"{api_base}/releases", json=rel_body, headers=headers_json, timeout=t())
         # özel durum: boş repo
         if cr.status_code == 422 and "Repository is empty" in cr.text:
             # boş repoyu README ile başlat
-            default_branch = (requests.get(api_base, headers=headers_json).json().get("default_branch")) or "main"
+            default_branch = (http.get(api_base, headers=headers_json, timeout=t()).json().get("default_branch")) or "main"
             readme = "# Auto Init\n\nPPTX assets for visual abstracts."
-            init = requests.put(
+            init = http.put(
                 f"{api_base}/contents/README.md",
                 headers=headers_json,
-                json={"message":"init", "content": base64.b64encode(readme.encode()).decode(), "branch": default_branch}
+                json={"message":"init", "content": base64.b64encode(readme.encode()).decode(), "branch": default_branch},
+                timeout=t(),
             )
             if init.status_code not in (200,201):
                 return None, f"README oluşturulamadı: {init.status_code} {init.text}"
-            time.sleep(1)
-            cr = requests.post(f"{api_base}/releases", json=rel_body, headers=headers_json)
+            time.sleep(min(1, t()))
+            cr = http.post(f"{api_base}/releases", json=rel_body, headers=headers_json, timeout=t())
 
         if cr.status_code != 201:
             return None, f"Release oluşturma hatası: {cr.status_code} {cr.text}"
@@ -304,6 +289,7 @@ def upload_to_github_release(
         rel = cr.json()
         upload_url = rel["upload_url"].split("{")[0]
 
+        stage("upload:asset")
         with open(filename, "rb") as f:
             binary = f.read()
         headers_upload = {
@@ -311,12 +297,14 @@ def upload_to_github_release(
             "Accept": "application/vnd.github+json",
             "Content-Type": "application/octet-stream",
         }
-        ur = requests.post(f"{upload_url}?name={os.path.basename(filename)}", data=binary, headers=headers_upload)
+        ur = http.post(f"{upload_url}?name={os.path.basename(filename)}", data=binary, headers=headers_upload, timeout=t())
         if ur.status_code != 201:
             return None, f"Dosya yükleme hatası: {ur.status_code} {ur.text}"
 
         asset = ur.json()
         return asset.get("browser_download_url"), None
+    except DeadlineExceeded as e:
+        return None, f"GitHub yükleme durduruldu: {e}"
     except Exception as e:
         return None, f"GitHub yükleme hatası: {e}"
 
@@ -330,7 +318,8 @@ def create_graphical_abstract_from_url(url: str) -> Tuple[str, str]:
     # (İsteğe bağlı) LLM kısaltma adımı: burada data['va'] üzerinde uygulanabilir.
     # if os.getenv("USE_LLM_SHORTEN") == "1": data = run_llm_shorten(data)
 
-    template = os.environ.get("JAMA_TEMPLATE", "templates/abstract.pptx")
+    from template_registry import default_template
+    template = default_template()
     out_dir  = os.environ.get("OUTPUT_DIR", "outputs")
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, "visual_abstract.pptx")
@@ -0,0 +1,369 @@
+# article_store.py
+# Çekilen {"url","title","va"} kayıtları için kalıcı SQLite deposu.
+#
+# - Anahtar: DOI varsa "doi:<doi>", yoksa normalize edilmiş makale URL'si (canonical_url);
+#   `url` sütunu kayıttaki özgün adresi (gösterim için), `url_key` normalize halini (arama için) tutar
+# - WAL modu: bir yazar çalışırken okuyucular (ör. search_articles) bloklanmaz
+# - FTS5 indeksi: başlık, katılımcılar, müdahale ve bulgular üzerinde tam metin arama
+# - watch tablosu: izlenen makaleler ve koşullu istek doğrulayıcıları (ETag /
+#   Last-Modified) + son gövde/kayıt özetleri (watch.py)
+# - Ham bölümler (parse_abstract_* / parse_key_points çıktısı) ve sezgi sürümü
+#   ("modül/sürüm") kayıtla birlikte saklanır; sezgiler değişince yalnızca
+#   sürümü eski kayıtlar yeniden türetilir, sayfalar yeniden indirilmez.
+# - versions tablosu: makale başına son ARTICLE_VERSIONS kayıt sürümü (payload.record_hash
+#   ile); istemcinin bildiği eski bir sürüme göre yalnızca değişen alanlar döndürülebilir.
+#
+#   ARTICLE_VERSIONS (varsayılan: 20)
+#
+#   python article_store.py search "pulmonary rehabilitation"
+#   python article_store.py import va.jsonl
+#   python article_store.py rederive        # sezgi sürümü eski kayıtları ham bölümlerden yeniden türet
+
+import os, re, json, time, sqlite3, threading, argparse
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_DB_PATH = "data/articles.sqlite3"
+ARTICLE_VERSIONS = int(os.environ.get("ARTICLE_VERSIONS", "20"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key        TEXT PRIMARY KEY,
+    url        TEXT NOT NULL,
+    url_key    TEXT,
+    doi        TEXT,
+    title      TEXT,
+    record     TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    raw        TEXT,
+    heuristics_version TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_url_key ON articles(url_key);
+CREATE INDEX IF NOT EXISTS articles_heuristics ON articles(heuristics_version);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    key UNINDEXED, title, participants, intervention, findings,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS watch (
+    url             TEXT PRIMARY KEY,
+    fetch_url       TEXT NOT NULL,
+    output_filename TEXT,
+    github_repo     TEXT,
+    etag            TEXT,
+    last_modified   TEXT,
+    body_hash       TEXT,
+    record_hash     TEXT,
+    added_at        REAL NOT NULL,
+    checked_at      REAL,
+    changed_at      REAL,
+    last_status     TEXT
+);
+CREATE TABLE IF NOT EXISTS versions (
+    key     TEXT NOT NULL,
+    hash    TEXT NOT NULL,
+    record  TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (key, hash)
+);
+"""
+
+def canonical_url(url: str) -> str:
+    """Şema/host küçük harf, https, sorgu ve fragment'sız, sondaki / atılmış URL."""
+    parts = urlsplit((url or "").strip())
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, parts.netloc.lower(), path, "", ""))
+
+def canonical_key(url: str, doi: Optional[str] = None) -> str:
+    if doi:
+        doi = re.sub(r"^(?:https?://(?:dx\.)?doi\.org/|doi:)", "", doi.strip(), flags=re.I)
+        return "doi:" + doi.lower()
+    return canonical_url(url)
+
+def _fts_fields(record: Dict) -> tuple:
+    va = record.get("va") or {}
+    ts = va.get("the_study") or {}
+    fd = va.get("findings") or {}
+    return (record.get("title", ""), ts.get("participants", ""),
+            ts.get("intervention", ""), fd.get("summary", ""))
+
+# Eski şemalı veritabanlarına sonradan eklenen sütunlar
+_MIGRATIONS = {
+    "raw": "ALTER TABLE articles ADD COLUMN raw TEXT",
+    "heuristics_version": "ALTER TABLE articles ADD COLUMN heuristics_version TEXT",
+    # eski satırların `url` sütunu zaten normalize edilmiş adresti
+    "url_key": "ALTER TABLE articles ADD COLUMN url_key TEXT",
+}
+
+_TOKEN_RGX = re.compile(r"\w+", re.UNICODE)
+
+def _quote_query(query: str) -> str:
+    """FTS5 sözdizimi hatası veren serbest metni, token'ları tırnaklayarak güvenli hale getirir."""
+    return " ".join(f'"{t}"' for t in _TOKEN_RGX.findall(query))
+
+class ArticleStore:
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(SCHEMA.split(";")[0])  # articles tablosu (eski şemada sütunlar eksik olabilir)
+            cols = {r["name"] for r in conn.execute("PRAGMA table_info(articles)")}
+            for col, ddl in _MIGRATIONS.items():
+                if col not in cols:
+                    conn.execute(ddl)
+                    if col == "url_key":
+                        conn.execute("UPDATE articles SET url_key = url")
+            conn.execute("DROP INDEX IF EXISTS articles_url")
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 bağlantıları thread'ler arasında paylaşılmaz; thread başına bir bağlantı.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, conn, key: str, record: Dict, raw: Optional[Dict], heuristics_version: Optional[str]):
+        # raw verilmezse (ör. JSONL import) önceden saklanan ham bölümler korunur.
+        conn.execute(
+            "INSERT INTO articles(key, url, url_key, doi, title, record, updated_at, raw, heuristics_version) "
+            "VALUES (?,?,?,?,?,?,?,?,?) "
+            "ON CONFLICT(key) DO UPDATE SET url=excluded.url, url_key=excluded.url_key, doi=excluded.doi, "
+            "title=excluded.title, record=excluded.record, updated_at=excluded.updated_at, "
+            "raw=COALESCE(excluded.raw, articles.raw), "
+            "heuristics_version=COALESCE(excluded.heuristics_version, articles.heuristics_version)",
+            (key, (record.get("url") or "").strip(), canonical_url(record.get("url", "")), record.get("doi"),
+             record.get("title", ""), json.dumps(record, ensure_ascii=False), time.time(),
+             json.dumps(raw, ensure_ascii=False) if raw is not None else None, heuristics_version),
+        )
+        conn.execute("DELETE FROM articles_fts WHERE key = ?", (key,))
+        conn.execute(
+            "INSERT INTO articles_fts(key, title, participants, intervention, findings) VALUES (?,?,?,?,?)",
+            (key, *_fts_fields(record)),
+        )
+        self._add_version(conn, key, record)
+
+    def _add_version(self, conn, key: str, record: Dict):
+        from payload import record_hash
+        conn.execute(
+            "INSERT INTO versions(key, hash, record, seen_at) VALUES (?,?,?,?) "
+            "ON CONFLICT(key, hash) DO UPDATE SET record=excluded.record, seen_at=excluded.seen_at",
+            (key, record_hash(record), json.dumps(record, ensure_ascii=False), time.time()),
+        )
+        conn.execute(
+            "DELETE FROM versions WHERE key = ? AND hash NOT IN "
+            "(SELECT hash FROM versions WHERE key = ? ORDER BY seen_at DESC LIMIT ?)",
+            (key, key, max(1, ARTICLE_VERSIONS)),
+        )
+
+    def upsert(self, record: Dict, raw: Optional[Dict] = None,
+               heuristics_version: Optional[str] = None) -> str:
+        """
+        Kaydı ekler ya da günceller; kayıt anahtarını döndürür. `raw` ham bölümler,
+        `heuristics_version` bunları kayda dönüştüren sezgilerin sürümüdür ("app/1").
+        """
+        key = canonical_key(record.get("url", ""), record.get("doi"))
+        url_key = canonical_url(record.get("url", ""))
+        conn = self._conn()
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if key != url_key:
+                    # aynı makale daha önce DOI'siz (URL anahtarıyla) kaydedildiyse tek satırda birleşir
+                    conn.execute("UPDATE OR IGNORE articles SET key = ? WHERE key = ?", (key, url_key))
+                    conn.execute("DELETE FROM articles WHERE key = ?", (url_key,))
+                    conn.execute("DELETE FROM articles_fts WHERE key = ?", (url_key,))
+                    conn.execute("UPDATE OR IGNORE versions SET key = ? WHERE key = ?", (key, url_key))
+                    conn.execute("DELETE FROM versions WHERE key = ?", (url_key,))
+                self._write(conn, key, record, raw, heuristics_version)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return key
+
+    def rederive(self, derivers: Dict[str, tuple], batch_size: int = 500) -> Dict[str, int]:
+        """
+        Ham bölümü olan ve sezgi sürümü güncel olmayan kayıtları yeniden türetir.
+        `derivers`: {"app": ("app/2", derive_va), ...}; anahtar sürüm önekidir,
+        derive_va(raw) bir VA nesnesi döndürür. Sayfalar yeniden indirilmez.
+        """
+        from va_records import VARecord
+        conn = self._conn()
+        stats = {"checked": 0, "updated": 0, "changed": 0, "skipped": 0}
+        current = sorted({v for v, _ in derivers.values()})
+        placeholders = ",".join("?" * len(current))
+        rows = conn.execute(
+            "SELECT key, record, raw, heuristics_version FROM articles "
+            f"WHERE raw IS NOT NULL AND (heuristics_version IS NULL OR heuristics_version NOT IN ({placeholders}))",
+            tuple(current),
+        ).fetchall()
+        for i in range(0, len(rows), batch_size):
+            with self._write_lock:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for row in rows[i:i + batch_size]:
+                        stats["checked"] += 1
+                        family = (row["heuristics_version"] or "").split("/", 1)[0]
+                        if family not in derivers:
+                            stats["skipped"] += 1
+                            continue
+                        version, derive = derivers[family]
+                        old = json.loads(row["record"])
+                        rec = VARecord.from_dict(old)
+                        rec.va = derive(json.loads(row["raw"]))
+                        new = dict(old, **rec.to_dict())
+                        self._write(conn, row["key"], new, None, version)
+                        stats["updated"] += 1
+                        stats["changed"] += new != old
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        return stats
+
+    def _row(self, conn, url_or_key: str):
+        row = conn.execute("SELECT key, record FROM articles WHERE key = ?", (url_or_key,)).fetchone()
+        if row is None:
+            row = conn.execute("SELECT key, record FROM articles WHERE url_key = ? ORDER BY updated_at DESC LIMIT 1",
+                               (canonical_url(url_or_key),)).fetchone()
+        return row
+
+    def get(self, url_or_key: str) -> Optional[Dict]:
+        """Anahtar, DOI anahtarı ya da (normalize edilmiş) URL ile kaydı döndürür."""
+        row = self._row(self._conn(), url_or_key)
+        return json.loads(row["record"]) if row else None
+
+    def version(self, url_or_key: str, digest: str) -> Optional[Dict]:
+        """Makalenin record_hash'i `digest` olan saklı sürümü (son ARTICLE_VERSIONS içinde) ya da None."""
+        conn = self._conn()
+        row = self._row(conn, url_or_key)
+        if row is None:
+            return None
+        hit = conn.execute("SELECT record FROM versions WHERE key = ? AND hash = ?", (row["key"], digest)).fetchone()
+        return json.loads(hit["record"]) if hit else None
+
+    # ---- izlenen makaleler (watch.py) ----
+    _WATCH_FIELDS = ("etag", "last_modified", "body_hash", "record_hash", "checked_at", "changed_at", "last_status")
+
+    def track(self, url: str, output_filename: str = "", github_repo: str = "") -> str:
+        """`url`'i izlemeye alır (varsa hedefleri günceller); izleme anahtarını döndürür."""
+        key = canonical_url(url)
+        with self._write_lock:
+            self._conn().execute(
+                "INSERT INTO watch(url, fetch_url, output_filename, github_repo, added_at) VALUES (?,?,?,?,?) "
+                "ON CONFLICT(url) DO UPDATE SET fetch_url=excluded.fetch_url, "
+                "output_filename=COALESCE(excluded.output_filename, watch.output_filename), "
+                "github_repo=COALESCE(excluded.github_repo, watch.github_repo)",
+                (key, url.strip(), output_filename or None, github_repo or None, time.time()),
+            )
+        return key
+
+    def untrack(self, url: str) -> bool:
+        with self._write_lock:
+            cur = self._conn().execute("DELETE FROM watch WHERE url = ?", (canonical_url(url),))
+        return cur.rowcount > 0
+
+    def tracked(self, checked_before: Optional[float] = None) -> List[Dict]:
+        """İzlenen makaleler; `checked_before` verilirse yalnızca o zamandan önce kontrol edilenler."""
+        sql = "SELECT * FROM watch"
+        args: tuple = ()
+        if checked_before is not None:
+            sql += " WHERE checked_at IS NULL OR checked_at < ?"
+            args = (checked_before,)
+        return [dict(r) for r in self._conn().execute(sql + " ORDER BY checked_at IS NOT NULL, checked_at", args)]
+
+    def update_watch(self, url: str, **fields):
+        """Doğrulayıcıları / özetleri / kontrol zamanlarını günceller."""
+        cols = [c for c in fields if c in self._WATCH_FIELDS]
+        if not cols:
+            return
+        with self._write_lock:
+            self._conn().execute(
+                f"UPDATE watch SET {', '.join(c + ' = ?' for c in cols)} WHERE url = ?",
+                (*(fields[c] for c in cols), canonical_url(url)),
+            )
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """FTS5 (bm25) ile arar; en alakalı `limit` kaydın özetini döndürür."""
+        limit = max(1, min(int(limit), 100))
+        sql = (
+            "SELECT a.url, a.title, "
+            "snippet(articles_fts, -1, '[', ']', '…', 12) AS snippet, bm25(articles_fts) AS score "
+            "FROM articles_fts JOIN articles a ON a.key = articles_fts.key "
+            "WHERE articles_fts MATCH ? ORDER BY score LIMIT ?"
+        )
+        conn = self._conn()
+        try:
+            rows = conn.execute(sql, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            quoted = _quote_query(query)
+            if not quoted:
+                return []
+            rows = conn.execute(sql, (quoted, limit)).fetchall()
+        return [{"url": r["url"], "title": r["title"], "snippet": r["snippet"],
+                 "score": round(-r["score"], 4)} for r in rows]
+
+def default_derivers() -> Dict[str, tuple]:
+    """Bilinen sezgi aileleri: sürüm öneki -> (güncel sürüm, derive_va)."""
+    import extraction
+    # app/ ve jama_scraper/ damgalı eski kayıtlar ortak çekirdekle yeniden türetilir.
+    current = (extraction.HEURISTICS_VERSION, extraction.derive_va)
+    return {family: current for family in ("core", "app", "jama_scraper")}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store() -> ArticleStore:
+    """ARTICLE_DB (varsayılan data/articles.sqlite3) için süreç genelinde tek depo."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArticleStore(os.environ.get("ARTICLE_DB", DEFAULT_DB_PATH))
+    return _store
+
+# -------------------- cli --------------------
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Yerel makale deposu (SQLite + FTS5).")
+    ap.add_argument("--db", default=os.environ.get("ARTICLE_DB", DEFAULT_DB_PATH))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("search", help="Tam metin arama")
+    sp.add_argument("query")
+    sp.add_argument("-n", "--limit", type=int, default=10)
+    ip = sub.add_parser("import", help="JSONL dosyasındaki kayıtları depoya ekle")
+    ip.add_argument("jsonl")
+    sub.add_parser("rederive", help="Sezgi sürümü eski kayıtları saklanan ham bölümlerden yeniden türet")
+    args = ap.parse_args()
+
+    store = ArticleStore(args.db)
+    if args.cmd == "search":
+        t0 = time.perf_counter()
+        hits = store.search(args.query, args.limit)
+        for h in hits:
+            print(f"{h['score']:8.3f}  {h['title']}\n          {h['url']}\n          {h['snippet']}")
+        print(f"{len(hits)} sonuç, {(time.perf_counter()-t0)*1000:.1f} ms")
+    elif args.cmd == "import":
+        from jsonl import iter_jsonl
+        n = 0
+        for rec in iter_jsonl(args.jsonl):
+            store.upsert(rec); n += 1
+        print(f"{n} kayıt eklendi/güncellendi ({store.count()} toplam)")
+    elif args.cmd == "rederive":
+        t0 = time.perf_counter()
+        stats = store.rederive(default_derivers())
+        print(f"{stats['checked']} eski kayıt, {stats['updated']} yeniden türetildi "
+              f"({stats['changed']} değişti, {stats['skipped']} bilinmeyen sürüm), "
+              f"{time.perf_counter()-t0:.2f} sn")
@@ -0,0 +1,189 @@
+# artifact_cache.py
+# Render edilmiş PPTX dosyaları için içerik adresli LRU önbellek.
+#
+# Anahtar = sha256(normalize edilmiş VA verisi + şablon içeriği + renderer sürümü).
+# Aynı veri ve şablonla gelen tekrar istekler (istemci retry'ları) yeniden render
+# edilmez; saklanan dosya doğrudan kullanılır. Önbellek girdi sayısı ve toplam
+# boyutla sınırlıdır; sınır aşılınca en uzun süredir kullanılmayan girdi silinir.
+# LRU indeksi ve isabet sayaçları dizindeki index.sqlite3'te tutulur; aynı dizini
+# kullanan tüm süreçler (çok işçili HTTP dağıtımı) tek önbelleği paylaşır.
+#
+#   ARTIFACT_CACHE_DIR          (varsayılan: data/artifacts)
+#   ARTIFACT_CACHE_MAX_ENTRIES  (varsayılan: 256; 0 = kapalı)
+#   ARTIFACT_CACHE_MAX_MB       (varsayılan: 512)
+
+import os, json, time, shutil, sqlite3, hashlib, threading, tempfile
+from typing import Optional
+
+from va_records import VARecord
+
+def artifact_key(data, template_digest: str, renderer_version: str) -> str:
+    """Veri (VARecord veya sözlük), şablon özeti ve renderer sürümünden kararlı anahtar."""
+    rec = data if isinstance(data, VARecord) else VARecord.from_dict(data)
+    # VARecord'a indirgemek, render'ı etkilemeyen alan sırası/fazla alan farklarını eler.
+    d = rec.to_dict()
+    d.pop("doi", None)   # slayda basılmaz; anahtar DOI'den bağımsız
+    payload = json.dumps(d, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    h = hashlib.sha256()
+    for part in (renderer_version, template_digest, payload):
+        h.update(part.encode("utf-8")); h.update(b"\0")
+    return h.hexdigest()
+
+class ArtifactCache:
+    def __init__(self, root: str, max_entries: int = 256, max_bytes: int = 512 * 1024 * 1024, ext: str = ".pptx"):
+        self.root, self.max_entries, self.max_bytes, self.ext = root, max_entries, max_bytes, ext
+        self._local = threading.local()
+        os.makedirs(root, exist_ok=True)
+        self.index_path = os.path.join(root, "index.sqlite3")
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                     "used_at REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries(used_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._reconcile()
+
+    def _conn(self) -> sqlite3.Connection:
+        # İndeks SQLite'ta: aynı dizini kullanan tüm işçi süreçler tek LRU'yu paylaşır.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _reconcile(self):
+        """Diskteki dosyalarla indeksi eşitler (eski sürümden kalan dosyalar son erişim sırasıyla eklenir)."""
+        files = {}
+        for name in os.listdir(self.root):
+            if name.endswith(self.ext):
+                st = os.stat(os.path.join(self.root, name))
+                files[name[:-len(self.ext)]] = (st.st_size, st.st_mtime)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            known = {k for (k,) in conn.execute("SELECT key FROM entries")}
+            conn.executemany("INSERT OR IGNORE INTO entries(key, size, used_at) VALUES (?,?,?)",
+                             [(k, size, mtime) for k, (size, mtime) in files.items() if k not in known])
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in known - set(files)])
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _count(self, name: str, n: int = 1):
+        self._conn().execute("INSERT INTO counters(name, value) VALUES (?, ?) "
+                             "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, n))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key + self.ext)
+
+    def get(self, key: str) -> Optional[str]:
+        """İsabet varsa saklanan dosyanın yolunu döndürür ve girdiyi en yeni yapar."""
+        conn = self._conn()
+        p = self.path(key)
+        if conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is None:
+            self._count("misses")
+            return None
+        if not os.path.exists(p):
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count("misses")
+            return None
+        conn.execute("UPDATE entries SET used_at = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return p
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        p = self.get(key)
+        if p is None:
+            return None
+        try:
+            with open(p, "rb") as f:
+                return f.read()
+        except FileNotFoundError:   # başka bir işçi arada sildi
+            return None
+
+    def put(self, key: str, src_path: str) -> str:
+        """`src_path` dosyasını önbelleğe kopyalar (atomik) ve saklanan yolu döndürür."""
+        dst = self.path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(src_path, tmp)
+            os.replace(tmp, dst)
+        except BaseException:
+            try: os.unlink(tmp)
+            except OSError: pass
+            raise
+        size = os.path.getsize(dst)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR REPLACE INTO entries(key, size, used_at) VALUES (?,?,?)", (key, size, time.time()))
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return dst
+
+    def materialize(self, key: str, out_path: str) -> Optional[str]:
+        """İsabet varsa saklanan dosyayı `out_path`'e kopyalar; yoksa None."""
+        p = self.get(key)
+        if p is None:
+            return None
+        d = os.path.dirname(out_path)
+        if d: os.makedirs(d, exist_ok=True)
+        try:
+            shutil.copyfile(p, out_path)
+        except FileNotFoundError:   # başka bir işçi arada sildi
+            return None
+        return out_path
+
+    def _evict(self, conn):
+        # yazma işlemi (BEGIN IMMEDIATE) içinde çağrılır: işçiler arasında tek tahliyeci
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        evicted = 0
+        while count and (count > self.max_entries or total > self.max_bytes):
+            key, size = conn.execute("SELECT key, size FROM entries ORDER BY used_at LIMIT 1").fetchone()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1; total -= size; evicted += 1
+            try:
+                os.unlink(self.path(key))
+            except OSError:
+                pass
+        if evicted:
+            self._count("evictions", evicted)
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {"entries": entries, "bytes": total, "hits": counters.get("hits", 0),
+                "misses": counters.get("misses", 0), "evictions": counters.get("evictions", 0)}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> ArtifactCache:
+    """Ortam değişkenlerinden yapılandırılan süreç genelinde tek önbellek."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ArtifactCache(
+                    os.environ.get("ARTIFACT_CACHE_DIR", os.path.join("data", "artifacts")),
+                    max_entries=int(os.environ.get("ARTIFACT_CACHE_MAX_ENTRIES", "256")),
+                    max_bytes=int(float(os.environ.get("ARTIFACT_CACHE_MAX_MB", "512")) * 1024 * 1024),
+                )
+    return _cache
@@ -0,0 +1,154 @@
+# autofit.py
+# Şablondaki adlandırılmış kutular için font-metrik tabanlı metin sığdırma.
+#
+# Her kutu için, kutu boyutu (EMU) ve iç boşluklarından kullanılabilir alanı
+# hesaplar; metni glif genişlik tablosuyla satırlara kaydırır ve kutuya sığan
+# en büyük punto değerini ikili arama ile bulur. Office / render gerekmez.
+#
+# Genişlik tabloları 1000 birim/em cinsindendir. Varsayılan tablo Helvetica
+# AFM metrikleridir (Arial / Liberation Sans ile birebir aynı). AUTOFIT_FONT_DIR
+# altında <font>.ttf/.otf varsa ve fontTools kuruluysa gerçek metrikler okunur.
+# Tablolar ve kelime genişlikleri bellekte tutulur: kutu başına maliyet mikrosaniye
+# mertebesindedir.
+
+import math, os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+EMU_PER_PT = 12700
+LINE_SPACING = 1.2          # satır yüksekliği / punto
+DEFAULT_FONT = os.environ.get("AUTOFIT_FONT", "Helvetica")
+MIN_SIZE = 8.0
+STEP = 0.5
+
+# python-pptx varsayılan iç boşlukları (bodyPr lIns/rIns=0.1", tIns/bIns=0.05")
+_DEFAULT_MARGIN_LR = 91440
+_DEFAULT_MARGIN_TB = 45720
+
+# Helvetica AFM genişlikleri, ASCII 32..126
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_EXTRA = {"–": 556, "—": 1000, "≤": 549, "≥": 549, "±": 584, "×": 584, "·": 278, "’": 222, "“": 333, "”": 333}
+
+# Helvetica tablosunu ölçekleyerek yaklaşılan aileler (ortalama genişlik oranı)
+_FAMILY_SCALE = {
+    "helvetica": 1.0, "arial": 1.0, "liberation sans": 1.0, "arimo": 1.0,
+    "calibri": 0.88, "carlito": 0.88, "segoe ui": 0.97, "verdana": 1.13, "tahoma": 0.98,
+}
+
+class Metrics:
+    __slots__ = ("name", "widths", "default")
+
+    def __init__(self, name: str, widths: Dict[str, float], default: float):
+        self.name, self.widths, self.default = name, widths, default
+
+    def width(self, s: str) -> float:
+        """`s` metninin em/1000 cinsinden genişliği."""
+        w, d = self.widths, self.default
+        return sum(w.get(ch, d) for ch in s)
+
+def _builtin_metrics(font: str) -> Metrics:
+    scale = _FAMILY_SCALE.get(font.lower(), 1.0)
+    widths = {chr(32 + i): w * scale for i, w in enumerate(_HELVETICA)}
+    widths.update({ch: w * scale for ch, w in _HELVETICA_EXTRA.items()})
+    return Metrics(font, widths, 556 * scale)
+
+def _fonttools_metrics(font: str) -> Optional[Metrics]:
+    font_dir = os.environ.get("AUTOFIT_FONT_DIR")
+    if not font_dir:
+        return None
+    path = next((p for p in (os.path.join(font_dir, font + ext) for ext in (".ttf", ".otf")) if os.path.exists(p)), None)
+    if not path:
+        return None
+    try:
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return None
+    tt = TTFont(path, lazy=True)
+    upem = tt["head"].unitsPerEm
+    hmtx = tt["hmtx"]
+    cmap = tt.getBestCmap() or {}
+    k = 1000.0 / upem
+    widths = {chr(cp): hmtx[g][0] * k for cp, g in cmap.items() if g in hmtx.metrics}
+    return Metrics(font, widths, widths.get("n", 556.0))
+
+@lru_cache(maxsize=32)
+def load_metrics(font: str = DEFAULT_FONT) -> Metrics:
+    """Font adı için genişlik tablosu (fontTools varsa gerçek, yoksa gömülü tablo)."""
+    return _fonttools_metrics(font) or _builtin_metrics(font)
+
+@lru_cache(maxsize=2048)
+def _paragraph_widths(text: str, font: str) -> Tuple[Tuple[float, ...], ...]:
+    """Her paragraf için kelime genişlikleri (em/1000); punto bağımsız olduğu için önbelleklenir."""
+    m = load_metrics(font)
+    return tuple(tuple(m.width(w) for w in para.split()) for para in text.split("\n"))
+
+def count_lines(text: str, size_pt: float, width_emu: int, font: str = DEFAULT_FONT) -> int:
+    """`width_emu` genişliğinde `size_pt` puntoyla kelime kaydırıldığında satır sayısı."""
+    limit = width_emu / EMU_PER_PT * 1000.0 / size_pt   # satır genişliği, em/1000
+    space = load_metrics(font).width(" ")
+    lines = 0
+    for words in _paragraph_widths(text, font):
+        lines += 1
+        cur = -space
+        for w in words:
+            if w > limit:
+                # boşluksuz uzun parça (URL vb.) yeni satırda başlar ve harf düzeyinde bölünür
+                n = math.ceil(w / limit)
+                lines += n - 1 + (cur >= 0)
+                cur = w - (n - 1) * limit
+                continue
+            if cur + space + w > limit:
+                lines += 1
+                cur = w
+            else:
+                cur += space + w
+    return lines
+
+@lru_cache(maxsize=4096)
+def fit_font_size(text: str, width_emu: int, height_emu: int, max_size: float,
+                  min_size: float = MIN_SIZE, font: str = DEFAULT_FONT) -> float:
+    """Kutuya sığan en büyük puntoyu (STEP adımlarla) döndürür; hiçbiri sığmazsa `min_size`."""
+    if not text or width_emu <= 0 or height_emu <= 0:
+        return max_size
+    def fits(size: float) -> bool:
+        return count_lines(text, size, width_emu, font) * size * LINE_SPACING * EMU_PER_PT <= height_emu
+    if fits(max_size):
+        return max_size
+    lo, hi = 0, int((max_size - min_size) / STEP)   # adım indeksi: size = min_size + i*STEP
+    if not fits(min_size):
+        return min_size
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if fits(min_size + mid * STEP):
+            lo = mid
+        else:
+            hi = mid - 1
+    return min_size + lo * STEP
+
+def _margin(v, default: int) -> int:
+    return default if v is None else int(v)
+
+def fit_shape(shape, text: str, max_size: float, min_size: float = MIN_SIZE, font: Optional[str] = None) -> float:
+    """Adlandırılmış şekil için en büyük uygun puntoyu döndürür (boyutu bilinmiyorsa `max_size`)."""
+    w, h = getattr(shape, "width", None), getattr(shape, "height", None)
+    if not w or not h:
+        return max_size
+    tf = shape.text_frame
+    inner_w = int(w) - _margin(tf.margin_left, _DEFAULT_MARGIN_LR) - _margin(tf.margin_right, _DEFAULT_MARGIN_LR)
+    inner_h = int(h) - _margin(tf.margin_top, _DEFAULT_MARGIN_TB) - _margin(tf.margin_bottom, _DEFAULT_MARGIN_TB)
+    return fit_font_size(text or "", inner_w, inner_h, float(max_size), float(min_size), font or DEFAULT_FONT)
+
+def shape_font(shape) -> Optional[str]:
+    """Şablonda kutuya atanmış ilk run'ın font adı (metin silinmeden önce okunmalı)."""
+    for p in shape.text_frame.paragraphs:
+        for r in p.runs:
+            if r.font.name:
+                return r.font.name
+    return None
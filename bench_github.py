@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+GitHub yükleme yolu için yerel API stub'ı ve benchmark.
+
+GitHubStub, app.upload_to_github_release'in kullandığı uç noktaları bellekte taklit eder:
+  GET    /repos/{o}/{r}                          repo erişimi (+ default_branch)
+  GET    /repos/{o}/{r}/releases/tags/{tag}      mevcut release
+  GET    /repos/{o}/{r}/releases/{id}/assets     release asset'leri
+  DELETE /repos/{o}/{r}/releases/assets/{id}     asset sil
+  DELETE /repos/{o}/{r}/releases/{id}            release sil
+  DELETE /repos/{o}/{r}/git/refs/tags/{tag}      tag sil
+  POST   /repos/{o}/{r}/releases                 release oluştur (boş repoda 422)
+  PUT    /repos/{o}/{r}/contents/{path}          dosya oluştur (boş repoyu başlatır)
+  POST   /uploads/repos/{o}/{r}/releases/{id}/assets?name=   asset yükle
+Her çağrı yöntem + rota bazında sayılır; alınan/gönderilen bayt, isteğe bağlı gecikme ve
+hata enjeksiyonu (ör. "POST:/releases=503x1": ilk eşleşen POST'ta 503) desteklenir.
+
+Benchmark, GITHUB_API_URL'i stub'a yönlendirip gerçek upload_to_github_release'i çalıştırır:
+  - mevcut asset sayısı büyüdükçe yayın başına API çağrısı, gönderilen bayt ve süre
+  - boş repo yolu (422 -> README ile başlatma -> yeniden deneme)
+  - hata senaryoları: 403 (repo erişimi), 422 (release), 5xx (asset yükleme)
+
+Kullanım:
+    python bench_github.py
+    python bench_github.py --assets 0,1,10,50 --size-kb 512 --latency-ms 80 --runs 3 --json
+    python bench_github.py --serve-only --port 8766      # GITHUB_API_URL=http://127.0.0.1:8766
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TOKEN = "stub-token"
+
+# (yöntem, rota adı, desen); rota adları sayaçlarda kullanılır
+ROUTES = [
+    ("GET", "repo", re.compile(r"^/repos/([^/]+)/([^/]+)$")),
+    ("GET", "release_by_tag", re.compile(r"^/repos/([^/]+)/([^/]+)/releases/tags/([^/]+)$")),
+    ("GET", "list_assets", re.compile(r"^/repos/([^/]+)/([^/]+)/releases/(\d+)/assets$")),
+    ("DELETE", "delete_asset", re.compile(r"^/repos/([^/]+)/([^/]+)/releases/assets/(\d+)$")),
+    ("DELETE", "delete_release", re.compile(r"^/repos/([^/]+)/([^/]+)/releases/(\d+)$")),
+    ("DELETE", "delete_tag", re.compile(r"^/repos/([^/]+)/([^/]+)/git/refs/tags/([^/]+)$")),
+    ("POST", "create_release", re.compile(r"^/repos/([^/]+)/([^/]+)/releases$")),
+    ("PUT", "put_contents", re.compile(r"^/repos/([^/]+)/([^/]+)/contents/(.+)$")),
+    ("POST", "upload_asset", re.compile(r"^/uploads/repos/([^/]+)/([^/]+)/releases/(\d+)/assets$")),
+]
+
+
+class _Repo:
+    def __init__(self, empty: bool = False):
+        self.empty = empty
+        self.releases = {}   # id -> {"id", "tag_name", "assets": {id: name}}
+        self.tags = set()
+
+
+class GitHubStub:
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self._lock = threading.Lock()
+        self._next_id = 1000
+        self.repos = {}
+        self.faults = []     # [method, substr, status, kalan]
+        self.calls = {}
+        self.bytes_in = self.bytes_out = 0
+        self.base_url = ""
+        self._server = None
+
+    # ---- durum hazırlama ----
+    def _id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def add_repo(self, full_name: str, empty: bool = False, release_tag: str = "", assets: int = 0):
+        with self._lock:
+            repo = self.repos[full_name] = _Repo(empty)
+            if release_tag:
+                rid = self._id()
+                repo.releases[rid] = {"id": rid, "tag_name": release_tag,
+                                      "assets": {self._id(): f"old_{i}.pptx" for i in range(assets)}}
+                repo.tags.add(release_tag)
+
+    def inject(self, spec: str):
+        """"METHOD:yol_parçası=STATUS[xN]" — N verilmezse her eşleşmede."""
+        m = re.match(r"^([A-Z]+):([^=]+)=(\d{3})(?:x(\d+))?$", spec)
+        if not m:
+            raise ValueError(f"Geçersiz hata enjeksiyonu: {spec}")
+        with self._lock:
+            self.faults.append([m.group(1), m.group(2), int(m.group(3)), int(m.group(4)) if m.group(4) else -1])
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls, self.bytes_in, self.bytes_out = {}, 0, 0
+
+    def counters(self) -> dict:
+        with self._lock:
+            return {"calls": sum(self.calls.values()), "by_route": dict(self.calls),
+                    "bytes_in": self.bytes_in, "bytes_out": self.bytes_out}
+
+    # ---- istek işleme ----
+    def _fault(self, method: str, path: str):
+        for f in self.faults:
+            if f[0] == method and f[1] in path and f[3] != 0:
+                if f[3] > 0:
+                    f[3] -= 1
+                return f[2]
+        return None
+
+    def handle(self, method: str, target: str, headers, body: bytes):
+        """(status, json_payload | None)"""
+        parts = urlsplit(target)
+        path, query = parts.path, parse_qs(parts.query)
+        with self._lock:
+            self.bytes_in += len(body)
+            route, args = "unknown", ()
+            for m, name, rx in ROUTES:
+                hit = rx.match(path) if m == method else None
+                if hit:
+                    route, args = name, hit.groups()
+                    break
+            self.calls[f"{method} {route}"] = self.calls.get(f"{method} {route}", 0) + 1
+            status = self._fault(method, path)
+            if status is not None:
+                return status, {"message": f"injected {status}"}
+            if headers.get("Authorization") != f"Bearer {TOKEN}":
+                return 401, {"message": "Bad credentials"}
+            if route == "unknown":
+                return 404, {"message": "Not Found"}
+            repo = self.repos.get(f"{args[0]}/{args[1]}")
+            if repo is None:
+                return 404, {"message": "Not Found"}
+            return self._dispatch(route, args[2:], repo, query, body)
+
+    def _dispatch(self, route, args, repo: _Repo, query, body: bytes):
+        if route == "repo":
+            return 200, {"default_branch": "main", "private": False}
+        if route == "release_by_tag":
+            for rel in repo.releases.values():
+                if rel["tag_name"] == args[0]:
+                    return 200, self._release_json(rel)
+            return 404, {"message": "Not Found"}
+        if route == "list_assets":
+            rel = repo.releases.get(int(args[0]))
+            if rel is None:
+                return 404, {"message": "Not Found"}
+            return 200, [{"id": aid, "name": name} for aid, name in rel["assets"].items()]
+        if route == "delete_asset":
+            for rel in repo.releases.values():
+                if rel["assets"].pop(int(args[0]), None) is not None:
+                    return 204, None
+            return 404, {"message": "Not Found"}
+        if route == "delete_release":
+            return (204, None) if repo.releases.pop(int(args[0]), None) else (404, {"message": "Not Found"})
+        if route == "delete_tag":
+            if args[0] in repo.tags:
+                repo.tags.discard(args[0])
+                return 204, None
+            return 422, {"message": "Reference does not exist"}
+        if route == "create_release":
+            if repo.empty:
+                return 422, {"message": "Repository is empty."}
+            req = json.loads(body or b"{}")
+            tag = req.get("tag_name", "")
+            if any(r["tag_name"] == tag for r in repo.releases.values()):
+                return 422, {"message": "Validation Failed", "errors": [{"code": "already_exists"}]}
+            rid = self._id()
+            rel = repo.releases[rid] = {"id": rid, "tag_name": tag, "assets": {}}
+            repo.tags.add(tag)
+            return 201, self._release_json(rel)
+        if route == "put_contents":
+            repo.empty = False
+            return 201, {"content": {"path": args[0]}}
+        if route == "upload_asset":
+            rel = repo.releases.get(int(args[0]))
+            if rel is None:
+                return 404, {"message": "Not Found"}
+            name = (query.get("name") or ["asset"])[0]
+            aid = self._id()
+            rel["assets"][aid] = name
+            return 201, {"id": aid, "name": name, "size": len(body),
+                         "browser_download_url": f"{self.base_url}/download/{rel['tag_name']}/{name}"}
+        return 404, {"message": "Not Found"}
+
+    def _release_json(self, rel) -> dict:
+        return {"id": rel["id"], "tag_name": rel["tag_name"],
+                "upload_url": f"{self.base_url}/uploads/{self._repo_of(rel)}/releases/{rel['id']}/assets{{?name,label}}"}
+
+    def _repo_of(self, rel) -> str:
+        for name, repo in self.repos.items():
+            if rel["id"] in repo.releases:
+                return f"repos/{name}"
+        return "repos/unknown/unknown"
+
+    # ---- sunucu ----
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True   # başlık + gövde ayrı yazılır; gecikmeli ACK ölçümü bozmasın
+
+            def _serve(self):
+                n = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(n) if n else b""
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, payload = stub.handle(self.command, self.path, self.headers, body)
+                out = b"" if payload is None else json.dumps(payload).encode()
+                with stub._lock:
+                    stub.bytes_out += len(out)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+            def log_message(self, format, *args):
+                pass
+
+        ThreadingHTTPServer.daemon_threads = True
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="github-stub", daemon=True).start()
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+# -------------------- benchmark --------------------
+def _publish(stub: GitHubStub, app, path: str, repo: str) -> dict:
+    """Tek yayın: sonuç, çağrı sayısı (rota bazında), gönderilen bayt ve süre."""
+    stub.reset_counters()
+    t0 = time.perf_counter()
+    url, err = app.upload_to_github_release(path, "Bench Article", repo, TOKEN)
+    ms = (time.perf_counter() - t0) * 1000
+    c = stub.counters()
+    return {"ok": bool(url), "error": err, "calls": c["calls"], "by_route": c["by_route"],
+            "bytes_sent": c["bytes_in"], "ms": round(ms, 2)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="GitHub release yükleme yolu: yerel API stub'ı ve benchmark")
+    ap.add_argument("--assets", default="0,1,5,20,50", help="Mevcut release'teki asset sayıları (virgüllü)")
+    ap.add_argument("--size-kb", type=int, default=256, help="Yüklenecek dosya boyutu")
+    ap.add_argument("--latency-ms", type=float, default=0, help="Çağrı başına stub gecikmesi (gerçek RTT benzetimi)")
+    ap.add_argument("--runs", type=int, default=3, help="Senaryo başına tekrar")
+    ap.add_argument("--inject", action="append", default=[], help='Ek hata enjeksiyonu, ör. "POST:/releases=503x1"')
+    ap.add_argument("--json", action="store_true", help="Sonucu JSON olarak yaz")
+    ap.add_argument("--serve-only", action="store_true", help="Yalnızca stub sunucuyu çalıştır")
+    ap.add_argument("--port", type=int, default=0, help="--serve-only için port")
+    args = ap.parse_args()
+
+    stub = GitHubStub(args.latency_ms)
+    for spec in args.inject:
+        stub.inject(spec)
+    base = stub.start(port=args.port)
+    if args.serve_only:
+        stub.add_repo("bench/abstracts")
+        stub.add_repo("bench/empty", empty=True)
+        print(f"GitHub stub: GITHUB_API_URL={base}  token={TOKEN}  repolar: bench/abstracts, bench/empty")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stub.stop()
+        return 0
+
+    os.environ["GITHUB_API_URL"] = base   # app import edilmeden önce
+    sys.path.insert(0, HERE)
+    import app
+
+    work = tempfile.mkdtemp(prefix="jama-gh-")
+    path = os.path.join(work, "visual_abstract.pptx")
+    with open(path, "wb") as f:
+        f.write(os.urandom(args.size_kb * 1024))
+
+    report = {"file_bytes": args.size_kb * 1024, "latency_ms": args.latency_ms, "scaling": [], "scenarios": {}}
+    try:
+        # yayın başına maliyet, mevcut asset sayısına göre (her turda aynı başlangıç durumu)
+        for n in [int(x) for x in args.assets.split(",") if x.strip()]:
+            runs = []
+            for _ in range(args.runs):
+                stub.add_repo("bench/abstracts", release_tag="latest-abstract", assets=n)
+                runs.append(_publish(stub, app, path, "bench/abstracts"))
+            r = runs[-1]
+            report["scaling"].append({"existing_assets": n, "ok": all(x["ok"] for x in runs), "calls": r["calls"],
+                                      "bytes_sent": r["bytes_sent"],
+                                      "median_ms": round(statistics.median(x["ms"] for x in runs), 2)})
+
+        stub.add_repo("bench/fresh")
+        report["scenarios"]["first_publish"] = _publish(stub, app, path, "bench/fresh")
+        stub.add_repo("bench/empty", empty=True)
+        report["scenarios"]["empty_repo"] = _publish(stub, app, path, "bench/empty")
+
+        faults = {
+            "repo_403": ("GET:/repos/bench/f403", "bench/f403", 403),
+            "release_422": ("POST:/repos/bench/f422/releases", "bench/f422", 422),
+            "asset_502": ("POST:/uploads/repos/bench/f502", "bench/f502", 502),
+        }
+        for name, (spec, repo, status) in faults.items():
+            stub.add_repo(repo)
+            stub.inject(f"{spec}={status}")
+            report["scenarios"][name] = _publish(stub, app, path, repo)
+    finally:
+        stub.stop()
+        import shutil
+        shutil.rmtree(work, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"dosya: {args.size_kb} KB, stub gecikmesi: {args.latency_ms:g} ms/çağrı")
+    print(f"{'mevcut asset':>13}{'çağrı':>8}{'gönderilen bayt':>17}{'medyan ms':>11}")
+    for r in report["scaling"]:
+        print(f"{r['existing_assets']:>13}{r['calls']:>8}{r['bytes_sent']:>17}{r['median_ms']:>11.1f}"
+              + ("" if r["ok"] else "  BAŞARISIZ"))
+    print()
+    for name, r in report["scenarios"].items():
+        status = "ok" if r["ok"] else f"hata: {(r['error'] or '')[:70]}"
+        print(f"{name:<14} {r['calls']:>3} çağrı {r['ms']:>8.1f} ms  {status}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Uçtan uca, ağa çıkmayan yük testi.
+
+İki parçadan oluşur:
+  - JamaStandIn: kayıtlı makale sayfalarını (fixtures/articles/*.html) jamanetwork.com
+    yerine sunan yerel HTTP sunucusu. Yanıt gecikmesi (+ jitter), rastgele 5xx hataları
+    ve saniye başına istek sınırı (aşılınca 429 + Retry-After) ayarlanabilir. Yanıtlar
+    içerik özetinden ETag taşır; eşleşen If-None-Match'e 304 döner.
+  - Yük sürücüsü: server.py araçlarını (scrape_jama_article, create_powerpoint) süreç
+    içinden, gerçek IO/CPU havuzları, deadline ve önbellek yoluyla çağırır. Sabit
+    eşzamanlılık (kapalı döngü, --concurrency) veya sabit geliş hızı (açık döngü, --rate)
+    ile çalışır.
+
+Rapor: çıktı hızı (başarılı çağrı/sn), p50/p95/p99/maks gecikme, sonuç türüne göre hata
+oranları (error / busy) ve stand-in sunucu sayaçları. --max-p95-ms / --min-throughput
+verilirse eşik aşıldığında çıkış kodu 1 olur (gerileme kontrolü).
+
+Kullanım:
+    python bench_load.py --concurrency 16 --duration 20
+    python bench_load.py --rate 40 --duration 30 --latency-ms 300 --jitter-ms 100 --error-rate 0.02
+    python bench_load.py --tool create_powerpoint --concurrency 8 --unique
+    python bench_load.py --tool mixed --rate 20 --throttle-rps 15 --json
+    python bench_load.py --serve-only --port 8765        # yalnızca stand-in sunucu
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures", "articles")
+
+# app.render_to_pptx'in doldurduğu şekil adları (şablon yoksa taslak şablon bunlarla üretilir)
+TEMPLATE_SHAPES = (
+    "title", "footer_citation", "population_subtitle", "population_description",
+    "intervention_subtitle", "intervention_description",
+    "settings_locations_description", "primary_outcome_description",
+    "findings_description_1", "findings_description_2",
+)
+
+
+# -------------------- stand-in sunucu --------------------
+class _StandInServer(ThreadingHTTPServer):
+    # istek iş parçacıkları kapanışı bekletmez; yalnızca bu sunucu için (stdlib sınıfı değişmez)
+    daemon_threads = True
+
+
+class JamaStandIn:
+    """
+    /journals/<dergi>/fullarticle/<ad> -> fixtures/<ad>.html; bilinmeyen yollar kayıtlı
+    sayfalar arasında sırayla dağıtılır (her URL farklı makale gibi davranır).
+    """
+
+    def __init__(self, root: str = FIXTURES, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, throttle_rps: float = 0, seed: int = 0):
+        self.pages = {}
+        for path in sorted(glob.glob(os.path.join(root, "*.html"))):
+            with open(path, "rb") as f:
+                self.pages[os.path.splitext(os.path.basename(path))[0]] = f.read()
+        if not self.pages:
+            raise FileNotFoundError(f"Kayıtlı sayfa bulunamadı: {root}")
+        self.names = sorted(self.pages)
+        self.latency, self.jitter = latency_ms / 1000, jitter_ms / 1000
+        self.error_rate, self.throttle_rps = error_rate, throttle_rps
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens, self._refill = throttle_rps, time.monotonic()
+        self.counters = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "throttled": 0, "bytes": 0}
+        self._server = None
+        self.base_url = ""
+
+    def _take_token(self) -> bool:
+        if not self.throttle_rps:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.throttle_rps, self._tokens + (now - self._refill) * self.throttle_rps)
+            self._refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def set_page(self, name: str, body: bytes):
+        """Kayıtlı sayfayı değiştirir (ör. yayın sonrası düzeltme benzetimi)."""
+        with self._lock:
+            self.pages[name] = body
+
+    def _page(self, path: str) -> bytes:
+        name = path.rstrip("/").rsplit("/", 1)[-1].split("?", 1)[0]
+        if name.endswith(".html"):
+            name = name[:-5]
+        if name not in self.pages:
+            # "<ad>-<n>": aynı kayıtlı sayfanın farklı URL'li kopyası
+            base = name.rsplit("-", 1)[0]
+            name = base if base in self.pages else self.names[sum(map(ord, path)) % len(self.names)]
+        return self.pages[name]
+
+    def _count(self, key: str, nbytes: int = 0):
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters[key] += 1
+            self.counters["bytes"] += nbytes
+
+    def handle(self, req: BaseHTTPRequestHandler):
+        if not self._take_token():
+            self._count("throttled")
+            return 429, b"Too Many Requests", {"Retry-After": "1"}
+        with self._lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._count("errors")
+            return self._rng.choice((500, 502, 503)), b"Upstream error", {}
+        body = self._page(req.path)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if req.headers.get("If-None-Match") == etag:
+            self._count("not_modified")
+            return 304, b"", {"ETag": etag}
+        self._count("ok", len(body))
+        return 200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag}
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive: HttpFetcher havuzu gerçekçi çalışsın
+
+            def _reply(self, head_only: bool):
+                code, body, headers = standin.handle(self)
+                self.send_response(code)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head_only:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(False)
+
+            def do_HEAD(self):
+                self._reply(True)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = _StandInServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="jama-standin", daemon=True).start()
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def url(self, i: int) -> str:
+        return f"{self.base_url}/journals/jama/fullarticle/{self.names[i % len(self.names)]}?v={i}"
+
+
+def build_stub_template(path: str) -> str:
+    """app.render_to_pptx'in beklediği adlı şekilleri içeren tek slaytlık taslak şablon."""
+    from pptx import Presentation
+    from pptx.util import Inches
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    for i, name in enumerate(TEMPLATE_SHAPES):
+        # 2 sütun x 5 satır: varsayılan 10 x 7.5 inç slayta sığar
+        box = slide.shapes.add_textbox(Inches(0.3 + (i % 2) * 4.8), Inches(0.3 + (i // 2) * 1.4), Inches(4.5), Inches(1.3))
+        box.name = name
+    prs.save(path)
+    return path
+
+
+# -------------------- yük sürücüsü --------------------
+def _pct(sorted_ms, p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    k = min(len(sorted_ms) - 1, max(0, math.ceil(p / 100 * len(sorted_ms)) - 1))   # nearest-rank
+    return round(sorted_ms[k], 1)
+
+
+def _outcome(res: dict) -> str:
+    if res.get("busy"):
+        return "busy"
+    r = str(res.get("result", ""))
+    return "error" if r.startswith("Hata") or "başarısız" in r else "ok"
+
+
+class LoadDriver:
+    def __init__(self, server, standin: JamaStandIn, tool: str, unique: bool):
+        self.server, self.standin, self.tool, self.unique = server, standin, tool, unique
+        self.samples = []   # (tool, outcome, ms, cached)
+        self._seq = 0
+        self._data = []     # create_powerpoint için önceden çekilmiş veriler
+
+    async def prepare(self):
+        if self.tool in ("create_powerpoint", "mixed"):
+            for i in range(len(self.standin.names)):
+                res = await self.server.scrape_jama_article(self.standin.url(i))
+                if res.get("data"):
+                    self._data.append(res["data"])
+            if not self._data:
+                raise RuntimeError("create_powerpoint için veri çekilemedi")
+
+    async def call(self):
+        i = self._seq
+        self._seq += 1
+        tool = self.tool if self.tool != "mixed" else ("scrape_jama_article", "create_powerpoint")[i % 2]
+        t0 = time.perf_counter()
+        try:
+            if tool == "scrape_jama_article":
+                res = await self.server.scrape_jama_article(self.standin.url(i))
+            else:
+                data = dict(self._data[i % len(self._data)])
+                if self.unique:   # önbelleği atla: her çağrı gerçek render
+                    data["title"] = f"{data.get('title', '')} #{i}"
+                res = await self.server.create_powerpoint(data, output_filename=f"load_{i}.pptx")
+            outcome = _outcome(res)
+        except Exception:
+            res, outcome = {}, "error"
+        self.samples.append((tool, outcome, (time.perf_counter() - t0) * 1000, bool(res.get("cached"))))
+
+    async def closed_loop(self, concurrency: int, duration: float):
+        end = time.monotonic() + duration
+
+        async def worker():
+            while time.monotonic() < end:
+                await self.call()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, rate: float, duration: float):
+        # Sabit geliş hızı: yavaşlayan sunucu kuyruk biriktirir (koordineli ihmal yok)
+        tasks, t0, n = [], time.monotonic(), 0
+        while True:
+            due = t0 + n / rate
+            if due - t0 >= duration:
+                break
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            tasks.append(asyncio.create_task(self.call()))
+            n += 1
+        await asyncio.gather(*tasks)
+
+    def report(self, wall: float) -> dict:
+        out = {"wall_seconds": round(wall, 3), "tools": {}}
+        for tool in sorted({s[0] for s in self.samples}):
+            rows = [s for s in self.samples if s[0] == tool]
+            ok_ms = sorted(s[2] for s in rows if s[1] == "ok")
+            all_ms = sorted(s[2] for s in rows)
+            n = len(rows)
+            count = lambda k: sum(1 for s in rows if s[1] == k)
+            out["tools"][tool] = {
+                "calls": n,
+                "ok": len(ok_ms),
+                "throughput_per_s": round(len(ok_ms) / wall, 2) if wall else 0.0,
+                "error_rate": round(count("error") / n, 4) if n else 0.0,
+                "busy_rate": round(count("busy") / n, 4) if n else 0.0,
+                "cache_hits": sum(1 for s in rows if s[3]),
+                "latency_ms": {"p50": _pct(ok_ms, 50), "p95": _pct(ok_ms, 95), "p99": _pct(ok_ms, 99),
+                               "max": round(ok_ms[-1], 1) if ok_ms else 0.0,
+                               "mean": round(statistics.fmean(ok_ms), 1) if ok_ms else 0.0},
+                "latency_all_ms": {"p50": _pct(all_ms, 50), "p99": _pct(all_ms, 99)},
+            }
+        ok = sum(t["ok"] for t in out["tools"].values())
+        out["throughput_per_s"] = round(ok / wall, 2) if wall else 0.0
+        return out
+
+
+def _print_report(rep: dict):
+    print(f"{'araç':<22}{'çağrı':>7}{'başarılı/sn':>13}{'p50':>9}{'p95':>9}{'p99':>9}{'hata':>8}{'meşgul':>8}")
+    for tool, t in rep["tools"].items():
+        lat = t["latency_ms"]
+        print(f"{tool:<22}{t['calls']:>7}{t['throughput_per_s']:>13.2f}{lat['p50']:>9.1f}{lat['p95']:>9.1f}"
+              f"{lat['p99']:>9.1f}{t['error_rate']:>8.1%}{t['busy_rate']:>8.1%}")
+    print(f"toplam çıktı hızı: {rep['throughput_per_s']:.2f}/sn  ({rep['wall_seconds']:.1f} sn)")
+    s = rep["standin"]
+    print(f"stand-in: {s['requests']} istek, {s['ok']} ok, {s['errors']} 5xx, {s['throttled']} 429")
+    ex = rep.get("executors") or {}
+    for name, st in ex.items():
+        if st:
+            print(f"havuz {name}: {st['workers']} işçi + {st['queue']} kuyruk, reddedilen {st['rejected']}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Yerel JAMA stand-in sunucusuyla MCP araçları yük testi")
+    ap.add_argument("--fixtures", default=FIXTURES, help="Kayıtlı makale sayfaları klasörü")
+    ap.add_argument("--tool", choices=("scrape_jama_article", "create_powerpoint", "mixed"),
+                    default="scrape_jama_article")
+    g = ap.add_mutually_exclusive_group()
+    g.add_argument("--concurrency", type=int, default=8, help="Kapalı döngü: eşzamanlı çağrı sayısı")
+    g.add_argument("--rate", type=float, help="Açık döngü: saniyede başlatılan çağrı")
+    ap.add_argument("--duration", type=float, default=10.0, help="Ölçüm süresi (sn)")
+    ap.add_argument("--warmup", type=float, default=1.0, help="Ölçüm öncesi ısınma süresi (sn)")
+    ap.add_argument("--latency-ms", type=float, default=0, help="Stand-in yanıt gecikmesi")
+    ap.add_argument("--jitter-ms", type=float, default=0, help="Gecikmeye eklenen ± rastgele sapma")
+    ap.add_argument("--error-rate", type=float, default=0, help="Rastgele 5xx oranı (0-1)")
+    ap.add_argument("--throttle-rps", type=float, default=0, help="Saniye başına istek sınırı (aşılınca 429)")
+    ap.add_argument("--template", help="PPTX şablonu (verilmezse taslak şablon üretilir)")
+    ap.add_argument("--unique", action="store_true", help="create_powerpoint: her çağrıda farklı veri (önbelleksiz)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--max-p95-ms", type=float, help="Herhangi bir aracın p95'i bunu aşarsa çıkış kodu 1")
+    ap.add_argument("--min-throughput", type=float, help="Toplam çıktı hızı bunun altındaysa çıkış kodu 1")
+    ap.add_argument("--json", action="store_true", help="Raporu JSON olarak yaz")
+    ap.add_argument("--serve-only", action="store_true", help="Yalnızca stand-in sunucuyu çalıştır")
+    ap.add_argument("--port", type=int, default=0, help="--serve-only için port")
+    args = ap.parse_args()
+
+    standin = JamaStandIn(args.fixtures, args.latency_ms, args.jitter_ms, args.error_rate,
+                          args.throttle_rps, args.seed)
+    if args.serve_only:
+        base = standin.start(port=args.port)
+        print(f"JAMA stand-in: {base}/journals/jama/fullarticle/<{'|'.join(standin.names)}>")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            standin.stop()
+        return 0
+
+    # Çıktılar ve önbellek geçici klasörde; havuzlar ortamdan okunduğu için server importundan önce
+    work = tempfile.mkdtemp(prefix="jama-load-")
+    os.environ.setdefault("OUTPUT_DIR", os.path.join(work, "outputs"))
+    os.environ.setdefault("ARTIFACT_CACHE_DIR", os.path.join(work, "artifacts"))
+    os.environ.setdefault("ARTICLE_DB", os.path.join(work, "articles.sqlite3"))
+    template = args.template or os.environ.get("JAMA_TEMPLATE", "templates/abstract.pptx")
+    if args.tool != "scrape_jama_article" and not os.path.exists(template):
+        template = build_stub_template(os.path.join(work, "template.pptx"))
+    os.environ["JAMA_TEMPLATE"] = template
+
+    standin.start()
+    sys.path.insert(0, HERE)
+    import logging
+    logging.disable(logging.ERROR)   # çağrı başına log satırları ölçümü bozmasın; hatalar raporda sayılır
+    import executors
+    import server
+
+    driver = LoadDriver(server, standin, args.tool, args.unique)
+    baseline = {}   # ısınma sonrası havuz sayaçları; rapor yalnızca ölçüm aralığını gösterir
+
+    async def run():
+        await driver.prepare()
+        if args.warmup > 0:
+            await driver.closed_loop(min(args.concurrency or 4, 4), args.warmup)
+            driver.samples.clear()
+            for k in standin.counters:
+                standin.counters[k] = 0
+        baseline.update(executors.stats())
+        t0 = time.perf_counter()
+        if args.rate:
+            await driver.open_loop(args.rate, args.duration)
+        else:
+            await driver.closed_loop(args.concurrency, args.duration)
+        return time.perf_counter() - t0
+
+    try:
+        wall = asyncio.run(run())
+    finally:
+        standin.stop()
+        executors.shutdown()
+        shutil.rmtree(work, ignore_errors=True)
+
+    rep = driver.report(wall)
+    rep["config"] = {k: v for k, v in vars(args).items() if k not in ("json", "serve_only", "port")}
+    rep["standin"] = dict(standin.counters)
+    rep["executors"] = {}
+    for name, st in executors.stats().items():
+        if st:
+            before = baseline.get(name) or {}
+            st = dict(st, submitted=st["submitted"] - before.get("submitted", 0),
+                      rejected=st["rejected"] - before.get("rejected", 0))
+        rep["executors"][name] = st
+
+    failed = []
+    if args.max_p95_ms is not None:
+        failed += [f"{t}: p95 {v['latency_ms']['p95']} ms > {args.max_p95_ms}"
+                   for t, v in rep["tools"].items() if v["latency_ms"]["p95"] > args.max_p95_ms]
+    if args.min_throughput is not None and rep["throughput_per_s"] < args.min_throughput:
+        failed.append(f"çıktı hızı {rep['throughput_per_s']}/sn < {args.min_throughput}")
+    rep["failed"] = failed
+
+    if args.json:
+        print(json.dumps(rep, ensure_ascii=False, indent=2))
+    else:
+        _print_report(rep)
+        for f in failed:
+            print(f"EŞİK AŞILDI: {f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Çıkarım çekirdeği parity benchmark'ı.
+
+fixtures/articles/*.html corpus'unu iki giriş noktasından geçirir:
+  - app.scrape_url_raw    (MCP yolu; HttpFetcher, yerel bir HTTP sunucusu üzerinden)
+  - jama_scraper.extract_file (CLI yolu; FileFetcher)
+ve her sayfanın çıktısını birbiriyle ve `<ad>.expected.json` ile karşılaştırır.
+fixtures/issues/*.html içindekiler sayfalarında extraction.extract_issue_links çıktısı
+(bağlantı başına url/başlık/tür) `<ad>.expected.json` ile karşılaştırılır.
+fixtures/key_numbers/cases.json'daki metinler key_numbers.parse_key_numbers ile
+ayrıştırılıp elle yazılmış beklenen çıktıyla karşılaştırılır (--update bunları değiştirmez).
+Ardından her yol için sayfa başına süreyi ölçer. Uyuşmazlık varsa çıkış kodu 1 olur.
+
+Kullanım:
+    python bench_parity.py
+    python bench_parity.py --runs 200 --json
+    python bench_parity.py --update        # expected.json dosyalarını yeniden yaz
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures", "articles")
+ISSUE_FIXTURES = os.path.join(HERE, "fixtures", "issues")
+KEY_NUMBER_CASES = os.path.join(HERE, "fixtures", "key_numbers", "cases.json")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(root: str):
+    """Fixture klasörünü rastgele bir portta sunar; (server, base_url) döndürür."""
+    handler = functools.partial(_QuietHandler, directory=root)
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}"
+
+
+def expected_path(html_path: str) -> str:
+    return os.path.splitext(html_path)[0] + ".expected.json"
+
+
+def check_issues(root: str, update: bool) -> list:
+    """İçindekiler fixture'ları: [{"page","ok","problems","links"}]; tür farkları bağlantı başına raporlanır."""
+    import extraction
+    out = []
+    for path in sorted(glob.glob(os.path.join(root, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            links = extraction.extract_issue_links(f.read(), "", ())
+        exp_file = expected_path(path)
+        if update:
+            with open(exp_file, "w", encoding="utf-8") as f:
+                json.dump(links, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+        with open(exp_file, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        problems = []
+        if [l["url"] for l in links] != [l["url"] for l in expected]:
+            problems.append("bağlantı listesi != expected")
+        else:
+            for got, exp in zip(links, expected):
+                if got != exp:
+                    problems.append(f"{exp['url'].rsplit('/', 1)[-1]}: tür {got['type']!r} != {exp['type']!r}"
+                                    if got["type"] != exp["type"] else f"{exp['url']}: başlık farklı")
+        out.append({"page": os.path.basename(path), "ok": not problems, "problems": problems, "links": len(links)})
+    return out
+
+
+def check_key_numbers(path: str) -> list:
+    """Etki büyüklüğü vakaları: [{"page","ok","problems","effects"}]."""
+    from key_numbers import parse_key_numbers
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        cases = json.load(f)
+    out = []
+    for case in cases:
+        got = parse_key_numbers(case["text"]).to_dict()
+        problems = [f"{k}: {got[k]!r} != {case['expected'][k]!r}"
+                    for k in case["expected"] if got.get(k) != case["expected"][k]]
+        out.append({"page": case["name"], "ok": not problems, "problems": problems,
+                    "effects": len(got["effects"])})
+    return out
+
+
+def _timed(fn, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="app.py ve jama_scraper.py çıkarım parity/hız benchmark'ı")
+    ap.add_argument("--fixtures", default=FIXTURES, help="HTML fixture klasörü")
+    ap.add_argument("--issues", default=ISSUE_FIXTURES, help="İçindekiler (TOC) fixture klasörü")
+    ap.add_argument("--key-numbers", default=KEY_NUMBER_CASES, help="Etki büyüklüğü vaka dosyası")
+    ap.add_argument("--runs", type=int, default=50, help="Sayfa başına ölçüm tekrarı")
+    ap.add_argument("--update", action="store_true", help="expected.json dosyalarını mevcut çıktıyla yeniden yaz")
+    ap.add_argument("--json", action="store_true", help="Sonucu JSON olarak yaz")
+    args = ap.parse_args()
+
+    sys.path.insert(0, HERE)
+    import app
+    import jama_scraper
+
+    pages = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+    if not pages:
+        print(f"Fixture bulunamadı: {args.fixtures}", file=sys.stderr)
+        return 1
+
+    srv, base = serve_fixtures(args.fixtures)
+    report = {"pages": [], "mismatches": 0}
+    try:
+        for path in pages:
+            name = os.path.basename(path)
+            url = f"{base}/{name}"
+            cli_rec = jama_scraper.extract_file(path)
+            mcp_rec = app.scrape_url_raw(url)[0]
+
+            exp_file = expected_path(path)
+            if args.update:
+                with open(exp_file, "w", encoding="utf-8") as f:
+                    json.dump(cli_rec, f, ensure_ascii=False, indent=2)
+                    f.write("\n")
+            with open(exp_file, "r", encoding="utf-8") as f:
+                expected = json.load(f)
+
+            problems = []
+            # MCP yolu istenen URL'yi, dosya yolu sayfanın canonical adresini kaydeder.
+            if {k: mcp_rec[k] for k in ("title", "va")} != {k: cli_rec[k] for k in ("title", "va")}:
+                problems.append("app != jama_scraper")
+            if cli_rec != expected:
+                problems.append("jama_scraper != expected")
+            report["mismatches"] += bool(problems)
+
+            report["pages"].append({
+                "page": name,
+                "ok": not problems,
+                "problems": problems,
+                "key_numbers": len(cli_rec["va"]["findings"]["key_numbers"]),
+                "app": _timed(lambda: app.scrape_url_raw(url), args.runs),
+                "jama_scraper": _timed(lambda: jama_scraper.extract_file(path), args.runs),
+            })
+    finally:
+        srv.shutdown()
+    report["issues"] = check_issues(args.issues, args.update)
+    report["mismatches"] += sum(1 for p in report["issues"] if not p["ok"])
+    report["key_numbers"] = check_key_numbers(args.key_numbers)
+    report["mismatches"] += sum(1 for p in report["key_numbers"] if not p["ok"])
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"{'page':<28}{'parity':>8}{'app ms':>10}{'cli ms':>10}{'kn':>5}")
+        for p in report["pages"]:
+            print(f"{p['page']:<28}{'ok' if p['ok'] else 'FAIL':>8}"
+                  f"{p['app']['median_ms']:>10.2f}{p['jama_scraper']['median_ms']:>10.2f}{p['key_numbers']:>5}")
+            for msg in p["problems"]:
+                print(f"    {msg}")
+        for p in report["issues"]:
+            print(f"{p['page']:<28}{'ok' if p['ok'] else 'FAIL':>8}{p['links']:>10} bağlantı (TOC)")
+            for msg in p["problems"]:
+                print(f"    {msg}")
+        for p in report["key_numbers"]:
+            print(f"{p['page']:<28}{'ok' if p['ok'] else 'FAIL':>8}{p['effects']:>10} etki (key_numbers)")
+            for msg in p["problems"]:
+                print(f"    {msg}")
+        total = len(pages) + len(report["issues"]) + len(report["key_numbers"])
+        print(f"\n{total - report['mismatches']}/{total} sayfa/vaka eşleşti")
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
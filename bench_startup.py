@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark'ı.
+
+Her modülün import süresini (`python -X importtime`) ve `python -m server`
+sürecinin MCP `initialize` isteğine ilk yanıtı verme süresini ölçer.
+Bütçe aşılırsa ya da hafif kalması gereken modüller ağır bağımlılıkları
+(requests, bs4, pptx, selenium) eager import ederse çıkış kodu 1 olur (CI adımı
+bu koda bakar). Ölçülen süreçlerin depo/önbellek/çıktı dosyaları geçici bir
+klasöre yazılır; çalışma dizinindeki data/ ve outputs/ değişmez.
+
+Kullanım:
+    python bench_startup.py
+    python bench_startup.py --runs 5 --budget server=800 --budget first_response=2000
+    python bench_startup.py --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MODULES = ["extraction", "fetchers", "app", "va_to_pptx", "jama_scraper", "server"]
+
+# Bu modüller import edildiğinde aşağıdaki paketler sys.modules'e girmemeli.
+LAZY_MODULES = ["extraction", "fetchers", "app", "jama_scraper", "server"]
+HEAVY_DEPS = ["requests", "bs4", "pptx", "lxml", "selenium", "webdriver_manager"]
+
+# Milisaniye cinsinden varsayılan bütçeler (CI makineleri için cömert tutuldu).
+DEFAULT_BUDGETS_MS = {
+    "app": 100.0,
+    "server": 2500.0,
+    "first_response": 5000.0,
+}
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench_startup", "version": "1.0.0"},
+    },
+}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# main() içinde geçici klasöre ayarlanır
+STATE_DIR = ""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = HERE + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    if STATE_DIR:
+        env["ARTICLE_DB"] = os.path.join(STATE_DIR, "articles.sqlite3")
+        env["ARTIFACT_CACHE_DIR"] = os.path.join(STATE_DIR, "artifacts")
+        env["SHARED_STATE_DIR"] = STATE_DIR
+        env["OUTPUT_DIR"] = os.path.join(STATE_DIR, "outputs")
+    return env
+
+
+def import_time_ms(module: str) -> float:
+    """Temiz bir yorumlayıcıda `module` için kümülatif import süresi (ms)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, env=_env(), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import edilemedi:\n{proc.stderr.strip()[-2000:]}")
+    # "import time:   self [us] | cumulative | imported package"
+    for line in reversed(proc.stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000.0
+    raise RuntimeError(f"{module} için importtime satırı bulunamadı")
+
+
+def leaked_heavy_deps(module: str) -> list:
+    """`module` import edildikten sonra yüklenmiş ağır bağımlılıkları döndürür."""
+    code = (
+        "import sys, json\n"
+        f"import {module}\n"
+        f"print(json.dumps([m for m in {HEAVY_DEPS!r} if m in sys.modules]))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=HERE, env=_env(), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import edilemedi:\n{proc.stderr.strip()[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def first_response_ms(timeout: float = 30.0) -> float:
+    """`python -m server` başlatılıp ilk `initialize` yanıtı gelene kadar geçen süre (ms)."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "server"],
+        cwd=HERE, env=_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    result = {}
+
+    def _read():
+        result["line"] = proc.stdout.readline()
+        result["t"] = time.perf_counter()
+
+    reader = threading.Thread(target=_read, daemon=True)
+    reader.start()
+    try:
+        proc.stdin.write((json.dumps(INITIALIZE_REQUEST) + "\n").encode())
+        proc.stdin.flush()
+        reader.join(timeout)
+        if reader.is_alive() or not result.get("line"):
+            raise RuntimeError(f"server {timeout:.0f} sn içinde initialize yanıtı vermedi")
+        msg = json.loads(result["line"])
+        if msg.get("id") != 1 or "result" not in msg:
+            raise RuntimeError(f"Beklenmeyen initialize yanıtı: {msg}")
+        return (result["t"] - t0) * 1000.0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _parse_budgets(items) -> dict:
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for item in items or []:
+        name, _, val = item.partition("=")
+        if not val:
+            raise SystemExit(f"Geçersiz bütçe: {item!r} (beklenen: ad=ms)")
+        budgets[name.strip()] = float(val)
+    return budgets
+
+
+def main() -> int:
+    global STATE_DIR
+    with tempfile.TemporaryDirectory(prefix="bench_startup-") as STATE_DIR:
+        return _run()
+
+
+def _run() -> int:
+    ap = argparse.ArgumentParser(description="MCP server cold-start benchmark'ı.")
+    ap.add_argument("--runs", type=int, default=3, help="Ölçüm tekrar sayısı (medyan raporlanır)")
+    ap.add_argument("--budget", action="append", metavar="AD=MS",
+                    help="Bütçe geçersiz kılma, örn. server=800 veya first_response=2000")
+    ap.add_argument("--skip-server", action="store_true", help="İlk MCP yanıtı ölçümünü atla")
+    ap.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yaz")
+    args = ap.parse_args()
+
+    budgets = _parse_budgets(args.budget)
+    report = {"import_ms": {}, "leaks": {}, "first_response_ms": None, "failures": []}
+
+    for mod in MODULES:
+        try:
+            samples = [import_time_ms(mod) for _ in range(args.runs)]
+        except RuntimeError as e:
+            report["failures"].append(str(e))
+            continue
+        report["import_ms"][mod] = round(statistics.median(samples), 2)
+
+    for mod in LAZY_MODULES:
+        try:
+            leaks = leaked_heavy_deps(mod)
+        except RuntimeError as e:
+            report["failures"].append(str(e))
+            continue
+        report["leaks"][mod] = leaks
+        if leaks:
+            report["failures"].append(f"{mod} ağır bağımlılıkları eager import ediyor: {', '.join(leaks)}")
+
+    if not args.skip_server:
+        try:
+            samples = [first_response_ms() for _ in range(args.runs)]
+            report["first_response_ms"] = round(statistics.median(samples), 2)
+        except RuntimeError as e:
+            report["failures"].append(str(e))
+
+    measured = dict(report["import_ms"])
+    if report["first_response_ms"] is not None:
+        measured["first_response"] = report["first_response_ms"]
+    for name, limit in budgets.items():
+        if name in measured and measured[name] > limit:
+            report["failures"].append(f"{name}: {measured[name]:.1f} ms > bütçe {limit:.1f} ms")
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for mod, ms in report["import_ms"].items():
+            limit = budgets.get(mod)
+            print(f"import {mod:<14} {ms:9.1f} ms" + (f"  (bütçe {limit:.0f} ms)" if limit else ""))
+        if report["first_response_ms"] is not None:
+            print(f"ilk MCP yanıtı      {report['first_response_ms']:9.1f} ms"
+                  f"  (bütçe {budgets['first_response']:.0f} ms)")
+        for f in report["failures"]:
+            print(f"FAIL: {f}")
+        print("OK" if not report["failures"] else "Bütçe/regresyon kontrolü başarısız.")
+
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
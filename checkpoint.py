@@ -0,0 +1,126 @@
+# checkpoint.py
+# Toplu scrape/render işleri için devam ettirilebilir checkpoint manifest'i.
+#
+# Manifest, append-only bir JSON Lines günlüğüdür: her satır bir öğenin son
+# durumunu kaydeder ({"key","status","output","error","attempts","ts"}).
+# Her güncelleme tek bir O_APPEND write + fsync ile yazılır; süreç yarıda
+# ölürse en fazla son (yarım) satır kaybolur ve yükleme sırasında atlanır.
+# Yüklerken günlük, öğe başına tek satıra sıkıştırılıp os.replace ile atomik
+# olarak yeniden yazılır; böylece dosya boyutu öğe sayısıyla sınırlı kalır.
+
+import os, re, time, hashlib, tempfile, threading
+from typing import Dict, Iterable, List, Optional
+
+from jsonl import dumps_line, loads_line
+
+PENDING, DONE, FAILED = "pending", "done", "failed"
+
+def output_name(key: str, ext: str) -> str:
+    """Öğe anahtarından (URL/yol) kararlı ve çakışmasız bir çıktı dosya adı üretir."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", key.rstrip("/").rsplit("/", 1)[-1])[:60].strip("-") or "article"
+    return f"{slug}-{hashlib.sha1(key.encode()).hexdigest()[:8]}{ext}"
+
+class Manifest:
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.items: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._fd = None
+        self._load()
+
+    # ---------- persistence ----------
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        rec = loads_line(line)
+                    except ValueError:
+                        continue  # çökmeden kalan yarım satır
+                    if isinstance(rec, dict) and rec.get("key"):
+                        self.items[rec["key"]] = rec
+            self._compact()
+        d = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(d, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _compact(self):
+        d = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=".manifest-", dir=d)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"".join(dumps_line(rec) for rec in self.items.values()))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _append(self, rec: dict):
+        self._append_many([rec])
+
+    def _append_many(self, recs: List[dict]):
+        # tek tamponlu write + tek fsync; çökmede en fazla son (yarım) satır kaybolur
+        if not recs:
+            return
+        buf = memoryview(b"".join(dumps_line(rec) for rec in recs))
+        with self._lock:
+            for rec in recs:
+                self.items[rec["key"]] = rec
+            while buf:
+                buf = buf[os.write(self._fd, buf):]
+            if self.fsync:
+                os.fsync(self._fd)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- state ----------
+    def status(self, key: str) -> Optional[str]:
+        rec = self.items.get(key)
+        return rec["status"] if rec else None
+
+    def _record(self, key: str, status: str, output: str = "", error: str = "") -> dict:
+        prev = self.items.get(key) or {}
+        attempts = prev.get("attempts", 0) + (1 if status in (DONE, FAILED) else 0)
+        return {"key": key, "status": status, "output": output or prev.get("output", ""),
+                "error": error, "attempts": attempts, "ts": round(time.time(), 3)}
+
+    def _update(self, key: str, status: str, output: str = "", error: str = ""):
+        self._append(self._record(key, status, output, error))
+
+    def mark_pending(self, keys: Iterable[str]):
+        """Yeni öğeleri tek yazma ve tek fsync ile kaydeder (done/failed öğe başına fsync'lenir)."""
+        self._append_many([self._record(key, PENDING) for key in dict.fromkeys(keys) if key not in self.items])
+
+    def mark_done(self, key: str, output: str = ""):
+        self._update(key, DONE, output=output)
+
+    def mark_failed(self, key: str, error: str):
+        self._update(key, FAILED, error=error)
+
+    def remaining(self, keys: Iterable[str], resume: bool = True) -> List[str]:
+        """`resume` ise tamamlanmış öğeleri atlar; başarısız ve bekleyenler yeniden denenir."""
+        keys = list(dict.fromkeys(keys))
+        if not resume:
+            return keys
+        return [k for k in keys if self.status(k) != DONE]
+
+    def summary(self) -> Dict[str, int]:
+        out = {PENDING: 0, DONE: 0, FAILED: 0}
+        for rec in self.items.values():
+            out[rec["status"]] = out.get(rec["status"], 0) + 1
+        return out
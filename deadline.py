@@ -0,0 +1,115 @@
+# deadline.py
+# Araç çağrısı başına uçtan uca süre bütçesi ve iptal.
+#
+# Bir `Deadline` çağrı başında oluşturulur, aşamalara `stage(share)` ile bölünür
+# ve her dış çağrıya (HTTP, GitHub API, tarayıcı) iletilir: her çağrının timeout'u
+# kalan süreyle sınırlanır. İstemci iptal ettiğinde ya da süre dolduğunda
+# `cancel()` kayıtlı geri çağrıları çalıştırır (yanıt bağlantısını kapat, sürücüyü
+# öldür); sonraki her `check()`/`timeout()` hemen DeadlineExceeded fırlatır, böylece
+# havuz iş parçacığı işi bırakır ve yuvası serbest kalır.
+#
+#   TOOL_DEADLINE_SECONDS (varsayılan: 90)
+
+import os, time, logging, threading
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TOOL_DEADLINE_SECONDS = float(os.environ.get("TOOL_DEADLINE_SECONDS", "90"))
+
+class DeadlineExceeded(TimeoutError):
+    """Süre bütçesi doldu veya çağrı iptal edildi."""
+
+class _Scope:
+    # Kök ve tüm alt aşamalar tarafından paylaşılan iptal durumu
+    def __init__(self):
+        self.event = threading.Event()
+        self.reason = ""
+        self.lock = threading.Lock()
+        self.callbacks: List[Callable[[], None]] = []
+
+class Deadline:
+    def __init__(self, seconds: Optional[float] = None, _parent: "Optional[Deadline]" = None):
+        seconds = TOOL_DEADLINE_SECONDS if seconds is None else seconds
+        self.expires = time.monotonic() + seconds
+        if _parent is not None:
+            self.expires = min(self.expires, _parent.expires)
+        self._scope = _parent._scope if _parent is not None else _Scope()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._scope.event.is_set()
+
+    def remaining(self) -> float:
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires - time.monotonic())
+
+    def check(self, what: str = ""):
+        """İptal edildiyse veya süre dolduysa DeadlineExceeded fırlatır."""
+        if self.cancelled:
+            raise DeadlineExceeded(f"{what or 'işlem'} iptal edildi: {self._scope.reason}")
+        if time.monotonic() >= self.expires:
+            raise DeadlineExceeded(f"{what or 'işlem'} için süre doldu")
+
+    def timeout(self, cap: Optional[float] = None, what: str = "") -> float:
+        """Bir dış çağrı için timeout: kalan süre (en fazla `cap`)."""
+        self.check(what)
+        r = self.remaining()
+        return min(r, cap) if cap else r
+
+    def stage(self, share: float) -> "Deadline":
+        """Kalan sürenin `share` oranı kadar bütçeli alt aşama; iptal durumu paylaşılır."""
+        return Deadline(self.remaining() * share, _parent=self)
+
+    def on_cancel(self, fn: Callable[[], None]) -> Callable[[], None]:
+        """İptalde çağrılacak `fn`'i kaydeder; kaydı silen fonksiyonu döndürür."""
+        s = self._scope
+        with s.lock:
+            if not s.event.is_set():
+                s.callbacks.append(fn)
+                def unregister():
+                    with s.lock:
+                        if fn in s.callbacks:
+                            s.callbacks.remove(fn)
+                return unregister
+        _safe_call(fn)   # zaten iptal edilmiş
+        return lambda: None
+
+    def cancel(self, reason: str = "cancelled"):
+        s = self._scope
+        with s.lock:
+            if s.event.is_set():
+                return
+            s.reason = reason
+            s.event.set()
+            callbacks, s.callbacks = s.callbacks, []
+        for fn in callbacks:
+            _safe_call(fn)
+
+def _safe_call(fn):
+    try:
+        fn()
+    except Exception as e:
+        logger.debug(f"Cancel callback failed: {e}")
+
+@asynccontextmanager
+async def guard(deadline: Deadline):
+    """
+    Blok `deadline` süresini aşarsa veya istemci iptal ederse (CancelledError)
+    deadline'ı iptal eder; havuzdaki işler bağlantılarını/sürücülerini kapatıp durur.
+    """
+    import asyncio
+    try:
+        async with asyncio.timeout(deadline.remaining()):
+            yield deadline
+    except DeadlineExceeded:
+        deadline.cancel("deadline exceeded")
+        raise
+    except TimeoutError:
+        deadline.cancel("deadline exceeded")
+        raise DeadlineExceeded("İşlem süresi doldu")
+    except asyncio.CancelledError:
+        deadline.cancel("client cancelled")
+        raise
@@ -0,0 +1,160 @@
+# executors.py
+# MCP araçları için ayrı, sınırlı kuyruklu yürütücüler.
+#
+#   IO  havuzu: ThreadPoolExecutor  - ağ istekleri, GitHub yükleme, SQLite, dosya kopyalama
+#   CPU havuzu: ProcessPoolExecutor - HTML parse ve PPTX render (GIL dışında, çekirdek başına)
+#
+# Her havuz en fazla `workers + queue` iş kabul eder. Kapasite doluysa iş
+# QUEUE_WAIT_SECONDS kadar ertelenir; hâlâ yer yoksa `Busy` fırlatılır ve araç
+# istemciye açık bir "meşgul" sonucu döndürür. Böylece aşırı yükte kuyruk sınırsız
+# büyümez ve kabul edilen işlerin gecikmesi öngörülebilir kalır.
+#
+#   IO_WORKERS   (varsayılan: 16)          IO_QUEUE   (varsayılan: 64)
+#   CPU_WORKERS  (varsayılan: çekirdek sayısı / MCP_WORKERS; 0 = CPU işleri IO havuzunda)
+#   CPU_QUEUE    (varsayılan: 2 * CPU_WORKERS)
+#   QUEUE_WAIT_SECONDS (varsayılan: 0 = beklemeden reddet)
+
+import os, time, asyncio, threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor
+from typing import Optional
+
+QUEUE_WAIT_SECONDS = float(os.environ.get("QUEUE_WAIT_SECONDS", "0"))
+
+class Busy(Exception):
+    """Havuz kapasitesi dolu; iş kabul edilmedi."""
+
+class BoundedPool:
+    def __init__(self, name: str, factory, workers: int, queue: int):
+        self.name, self.workers, self.queue = name, workers, queue
+        self.capacity = workers + queue
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.inflight = self.submitted = self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._factory(self.workers)
+        return self._executor
+
+    def _reset(self):
+        with self._lock:
+            broken, self._executor = self._executor, None
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _fut):
+        with self._lock:
+            self.inflight -= 1
+        self._slots.release()
+
+    def try_submit(self, fn, *args):
+        """Yer varsa işi gönderir ve concurrent Future döndürür; yoksa None."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            fut = self.executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.inflight += 1
+            self.submitted += 1
+        fut.add_done_callback(self._release)
+        return fut
+
+    async def run(self, fn, *args, wait: Optional[float] = None):
+        """`fn(*args)`'ı havuzda çalıştırır; kapasite `wait` saniye içinde açılmazsa Busy."""
+        wait = QUEUE_WAIT_SECONDS if wait is None else wait
+        deadline = time.monotonic() + wait
+        while True:
+            fut = self.try_submit(fn, *args)
+            if fut is not None:
+                try:
+                    return await asyncio.wrap_future(fut)
+                except asyncio.CancelledError:
+                    # henüz başlamadıysa kuyruktan çıkar; başladıysa iş deadline ile durur
+                    fut.cancel()
+                    raise
+                except BrokenExecutor:
+                    # çöken bir süreç havuzu kalıcı olarak bozulur; sonraki iş yeni havuz açar
+                    self._reset()
+                    raise
+            if time.monotonic() >= deadline:
+                with self._lock:
+                    self.rejected += 1
+                raise Busy(f"{self.name} havuzu dolu ({self.capacity} iş); lütfen daha sonra tekrar deneyin.")
+            await asyncio.sleep(0.05)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "queue": self.queue, "inflight": self.inflight,
+                    "submitted": self.submitted, "rejected": self.rejected}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+def _thread_pool(workers: int) -> Executor:
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="io")
+
+def _init_cpu_worker():
+    # her spawn sürecinde bir kez: ağır importlar, desenler ve şablonlar ilk işten önce hazır
+    import app
+    app.warm_worker()
+
+def _process_pool(workers: int) -> Executor:
+    import multiprocessing
+    # spawn: olay döngüsü ve yardımcı iş parçacıkları olan süreçte fork güvenli değil
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_cpu_worker)
+
+def _make_pools():
+    io_workers = int(os.environ.get("IO_WORKERS", "16"))
+    io = BoundedPool("io", _thread_pool, io_workers, int(os.environ.get("IO_QUEUE", str(io_workers * 4))))
+    # çok işçili HTTP dağıtımında çekirdekler işçilere bölünür (toplam süreç sayısı çekirdek sayısını aşmaz)
+    from workers import worker_count
+    cpu_default = max(1, (os.cpu_count() or 1) // worker_count())
+    cpu_workers = int(os.environ.get("CPU_WORKERS", str(cpu_default)))
+    if cpu_workers <= 0:
+        return io, io
+    cpu = BoundedPool("cpu", _process_pool, cpu_workers, int(os.environ.get("CPU_QUEUE", str(cpu_workers * 2))))
+    return io, cpu
+
+IO, CPU = _make_pools()
+
+async def run_io(fn, *args, wait: Optional[float] = None):
+    return await IO.run(fn, *args, wait=wait)
+
+async def run_cpu(fn, *args, wait: Optional[float] = None):
+    return await CPU.run(fn, *args, wait=wait)
+
+def _noop() -> int:
+    return os.getpid()
+
+def prestart_cpu_pool(timeout: float = 120) -> int:
+    """
+    Süreç havuzunu başlatır (warm-up) ve her süreçte başlatıcının (_init_cpu_worker)
+    bitmesini bekler; hazır süreç sayısını döndürür. Bir iş yalnızca başlatıcısı bitmiş
+    süreçte çalışır, bu yüzden her süreçten en az bir yanıt gelene kadar tur tekrarlanır.
+    """
+    if CPU is IO:
+        return 0
+    pids = set()
+    end = time.monotonic() + timeout
+    while len(pids) < CPU.workers and time.monotonic() < end:
+        futs = [CPU.executor.submit(_noop) for _ in range(CPU.workers)]
+        pids |= {f.result() for f in futs}
+    return len(pids)
+
+def stats() -> dict:
+    return {"io": IO.stats(), "cpu": CPU.stats() if CPU is not IO else None}
+
+def shutdown():
+    IO.shutdown()
+    if CPU is not IO:
+        CPU.shutdown()
@@ -0,0 +1,400 @@
+# extraction.py
+# app.py (MCP) ve jama_scraper.py (CLI) tarafından paylaşılan tek çıkarım çekirdeği.
+#
+#   fetch (fetchers.HttpFetcher / BrowserFetcher / FileFetcher)
+#     -> parse  (extract_sections: abstract DOM/meta + Key Points -> ham bölümler)
+#     -> derive (derive_va: ham bölümler -> VA kaydı; sezgiler)
+#
+# bs4 yalnızca parse aşamasında, ilk kullanımda import edilir; derive aşaması
+# saf Python'dur ve saklanan ham bölümler üzerinde yeniden çalıştırılabilir.
+
+import os, re, html, unicodedata
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from va_records import VARecord, VA, Study, Findings, ResearchInContext
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# pull_* sezgileri veya derive_va değiştiğinde artırılmalı: depodaki eski sürümlü
+# kayıtlar `python article_store.py rederive` ile ham bölümlerden yeniden türetilir.
+HEURISTICS_VERSION = "core/1"
+
+# -------------------- patterns --------------------
+# Desenler ilk kullanımda derlenir; warm-up `compile_patterns()` ile hepsini önceden derler.
+_PATTERNS = {
+    "ws": (r"\s+", 0),
+    "sentence_split": (r"(?<=[.!?])\s+", 0),
+    "key_point": (r"(question|findings|meaning)\.?\s*(.+)", re.I),
+    "cmp_vs": (r"\bvs\.?\s+([^.;:]+)", re.I),
+    "cmp_versus": (r"\bversus\s+([^.;:]+)", re.I),
+    "cmp_compared": (r"\bcompared with\s+([^.;:]+)", re.I),
+    "pr_min": (r"\bPR-?min\b", re.I),
+    "pr_gym": (r"\bPR-?gym\b", re.I),
+    "location": (
+        r"(?:(?:\d+\s+(?:center|centers|site|sites|unit|units|hospital|hospitals))"
+        r"|(?:across the\s+[A-Za-z ,\-]+)"
+        r"|(?:in\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)"
+        r"|(?:multicenter|single-center|single centre|multicentre))",
+        re.I,
+    ),
+    "primary_outcome": (r"(primary (?:outcome|endpoint)[^.;:]*[.;:]?)", re.I),
+    # pull_key_numbers: desen başına ayrı finditer (tek alternation değil). Eşleşmeler
+    # örtüşebilir ("95% CI ..." hem kn_pct hem kn_ci) ve çıktı desen sırasıyla gruplanır;
+    # tek alternation ikisini de bozar. Tek geçişli tipli ayrıştırıcı: key_numbers._SCANNER.
+    "kn_n": (r"\bn\s*=\s*\d{2,4}\b", re.I),
+    "kn_pct": (r"\b\d{1,3}\s?%\b", re.I),
+    "kn_p": (r"\bp\s*[<=>]\s*0?\.\d+\b", re.I),
+    "kn_ratio": (r"\b(?:OR|RR|HR)\s*=\s*\d+(?:\.\d+)?\b", re.I),
+    "kn_ci_old": (r"\bCI\s*\(?\d{1,2}%\)?\s*:\s*\d+(?:\.\d+)?\s*[–-]\s*\d+(?:\.\d+)?\b", re.I),
+    "kn_ci": (r"\b\d{1,2}%\s*CI\s*[,:]?\s*-?\d+(?:\.\d+)?%?\s*(?:[–-]|to)\s*-?\d+(?:\.\d+)?\b", re.I),
+    "kn_unit": (r"\b[-+]?\d+(?:\.\d+)?\s*(?:m|km|min|days|weeks)\b", re.I),
+}
+_KEY_NUMBER_PATTERNS = ("kn_n", "kn_pct", "kn_p", "kn_ratio", "kn_ci_old", "kn_ci", "kn_unit")
+
+@lru_cache(maxsize=None)
+def _rx(name: str) -> "re.Pattern":
+    src, flags = _PATTERNS[name]
+    return re.compile(src, flags)
+
+@lru_cache(maxsize=512)
+def _heading_prefix_rx(heading: str) -> "re.Pattern":
+    return re.compile(r"^\s*" + re.escape(heading) + r"\s*:?\s*", re.I)
+
+def compile_patterns() -> int:
+    """Tüm çıkarım desenlerini derler; derlenen desen sayısını döndürür."""
+    for name in _PATTERNS:
+        _rx(name)
+    return len(_PATTERNS)
+
+# -------------------- text utils --------------------
+def clean(s: Optional[str]) -> str:
+    if not s:
+        return ""
+    s = html.unescape(s)
+    s = unicodedata.normalize("NFKC", s)
+    s = _rx("ws").sub(" ", s).strip()
+    # Bazı tarayıcı kombinasyonlarında U+2212 (−) karışabiliyor; ASCII tire yap:
+    return s.replace("−", "-")
+
+def first_sentence(t: str) -> str:
+    t = (t or "").strip()
+    if not t: return ""
+    return _rx("sentence_split").split(t, maxsplit=1)[0].strip()
+
+def rest_sentences(t: str) -> str:
+    t = (t or "").strip()
+    if not t: return ""
+    parts = _rx("sentence_split").split(t, maxsplit=1)
+    return parts[1].strip() if len(parts) > 1 else ""
+
+HEADING_MAP = {
+    "importance":"importance",
+    "objective":"objective",
+    "design, setting, and participants":"dsp",
+    "design, settings, and participants":"dsp",
+    "design and participants":"dsp",
+    "participants":"dsp",
+    "intervention":"interventions",
+    "interventions":"interventions",
+    "main outcomes and measures":"moam",
+    "outcomes":"moam",
+    "results":"results",
+    "conclusions and relevance":"conclusions",
+    "conclusions":"conclusions",
+    "meaning":"meaning",
+    "trial registration":"trial_registration",
+    # Yeni şablon için olası başlık varyantları:
+    "setting":"settings_locations",
+    "settings":"settings_locations",
+    "location":"settings_locations",
+    "locations":"settings_locations",
+    "settings/locations":"settings_locations",
+    "setting/locations":"settings_locations",
+    "setting and locations":"settings_locations",
+    "settings and locations":"settings_locations",
+    "study setting":"settings_locations",
+}
+
+def norm_heading(h: str) -> Optional[str]:
+    return HEADING_MAP.get(clean(h).lower().rstrip(":"))
+
+# -------------------- parsers --------------------
+def parse_abstract_dom(soup: "BeautifulSoup") -> Dict[str,str]:
+    """#abstract içindeki <p><strong>H</strong> metin...</p> bloklarını sözlüğe döker."""
+    out = {}
+    abstract = soup.find(id="abstract")
+    if not abstract:
+        return out
+    for p in abstract.find_all("p", recursive=True):
+        strong = p.find("strong")
+        if not strong:
+            continue
+        key = norm_heading(strong.get_text(" ", strip=True))
+        if not key:
+            continue
+        whole = p.get_text(" ", strip=True)
+        # başlığı baştan kes
+        content = _heading_prefix_rx(strong.get_text(strip=True)).sub("", whole, count=1)
+        out[key] = clean(content)
+    return out
+
+def parse_abstract_meta(soup: "BeautifulSoup") -> Dict[str,str]:
+    """<meta name="citation_abstract" content="...HTML..."> içindeki HTML'i parse eder."""
+    from bs4 import BeautifulSoup
+    out = {}
+    meta = soup.find("meta", attrs={"name":"citation_abstract"})
+    if not meta or not meta.get("content"):
+        return out
+    inner = BeautifulSoup(meta["content"], "lxml")
+    # h3 -> p komşularını al
+    for h in inner.find_all(["h3","strong"]):
+        key = norm_heading(h.get_text(" ", strip=True))
+        if not key:
+            continue
+        content = ""
+        sib = h.find_next_sibling()
+        if sib and sib.name == "p":
+            content = sib.get_text(" ", strip=True)
+        else:
+            # p>strong yapısı
+            par = h.parent if h.parent and h.parent.name == "p" else None
+            if par:
+                whole = par.get_text(" ", strip=True)
+                content = _heading_prefix_rx(h.get_text(strip=True)).sub("", whole, count=1)
+        if content:
+            out[key] = clean(content)
+    return out
+
+def parse_key_points(soup: "BeautifulSoup") -> Dict[str,str]:
+    """Key Points kutusu varsa Question/Findings/Meaning alanlarını döndürür."""
+    out = {"question":"", "findings":"", "meaning":""}
+    # "Key Points" başlığını arayıp yakınındaki p/strong bloklarını topla
+    hdr = None
+    for tag in soup.find_all(["h2","h3","h4"]):
+        if clean(tag.get_text()).lower() == "key points":
+            hdr = tag; break
+    if not hdr:
+        return out
+    container = hdr.parent
+    for p in container.find_all("p"):
+        t = clean(p.get_text(" ", strip=True))
+        # "Question. ..." gibi olabilir
+        m = _rx("key_point").match(t)
+        if m:
+            out[m.group(1).lower()] = clean(m.group(2))
+    return out
+
+def extract_title(soup: "BeautifulSoup") -> str:
+    # Başlık: h1 -> og:title -> citation_title
+    title = ""
+    h1 = soup.find("h1")
+    if h1: title = clean(h1.get_text(" ", strip=True))
+    if not title:
+        og = soup.find("meta", attrs={"property":"og:title"})
+        if og and og.get("content"): title = clean(og["content"])
+    if not title:
+        ct = soup.find("meta", attrs={"name":"citation_title"})
+        if ct and ct.get("content"): title = clean(ct["content"])
+    return title
+
+def extract_page_url(soup: "BeautifulSoup") -> str:
+    """Kayıtlı sayfalar için asıl makale adresi: citation_public_url -> og:url -> canonical."""
+    for attrs in ({"name":"citation_public_url"}, {"property":"og:url"}):
+        m = soup.find("meta", attrs=attrs)
+        if m and m.get("content"):
+            return m["content"].strip()
+    link = soup.find("link", rel="canonical")
+    if link and link.get("href"):
+        return link["href"].strip()
+    return ""
+
+_DOI_RGX = re.compile(r"\b10\.\d{4,9}/[^\s\"'<>]+")
+_DOI_META = ("citation_doi", "dc.identifier", "prism.doi")
+
+def extract_doi(soup: "BeautifulSoup") -> str:
+    """Makale DOI'si: citation_doi -> dc.identifier -> prism.doi ("doi:" / doi.org önekleri atılır)."""
+    for name in _DOI_META:
+        for m in soup.find_all("meta", attrs={"name": re.compile(f"^{re.escape(name)}$", re.I)}):
+            hit = _DOI_RGX.search(m.get("content") or "")
+            if hit:
+                return hit.group(0).rstrip(".,;")
+    return ""
+
+def extract_sections(soup: "BeautifulSoup") -> Dict:
+    """Ham bölümler: {"sections": abstract başlık->metin, "key_points": question/findings/meaning}."""
+    # 1) Abstract: DOM -> meta fallback
+    secs = parse_abstract_dom(soup) or parse_abstract_meta(soup)
+    # 2) Key Points varsa
+    return {"sections": secs, "key_points": parse_key_points(soup)}
+
+# -------------------- smart pulls --------------------
+def pull_comparator(text: str) -> str:
+    t = clean(text)
+    for name in ("cmp_vs", "cmp_versus", "cmp_compared"):
+        m = _rx(name).search(t)
+        if m: return clean(m.group(1))
+    # JAMA örneğine özel failsafe
+    if _rx("pr_min").search(t) and _rx("pr_gym").search(t):
+        return "PR-gym"
+    return ""
+
+def pull_key_numbers(text: str) -> list:
+    t = clean(text)
+    out = []
+    for name in _KEY_NUMBER_PATTERNS:
+        out += [m.group(0) for m in _rx(name).finditer(t)]
+    # tekilleştir
+    return list(dict.fromkeys(out))[:8]
+
+def pull_settings_locations(sections: Dict[str,str]) -> str:
+    """
+    1) 'settings_locations' başlığı varsa onu döndür.
+    2) Yoksa DSP (design/setting/participants) içinden lokasyon/merkez geçen ilk anlamlı cümleyi kırparak döndür.
+    """
+    if sections.get("settings_locations"):
+        return clean(sections["settings_locations"])
+    dsp = sections.get("dsp", "")
+    if not dsp:
+        return ""
+    loc = _rx("location")
+    for s in _rx("sentence_split").split(dsp):
+        if loc.search(s):
+            # Gereksiz detayları kısalt: 250 karakteri geçmesin
+            return clean(s)[:250]
+    return ""
+
+def pull_primary_outcome_from_text(moam: str, backup_texts: str = "") -> str:
+    """
+    Eğer MOAM içinde 'primary outcome/endpoint' ifadesi açıkça varsa onu alır.
+    Yoksa yedek metinler içinde arar; yine yoksa MOAM'ı döndürür.
+    """
+    for t in (moam, backup_texts):
+        m = _rx("primary_outcome").search(clean(t))
+        if m:
+            return clean(m.group(1))
+    return clean(moam)
+
+# -------------------- derive --------------------
+def derive_va(raw: Dict) -> VA:
+    """Sezgi aşaması: ham bölümlerden VA kaydını türetir (HTML/ağ gerekmez)."""
+    secs = raw.get("sections") or {}
+    kp = raw.get("key_points") or {}
+
+    participants   = secs.get("dsp","")
+    intervention   = secs.get("interventions","")
+    moam_text      = secs.get("moam","")
+    conclusions    = secs.get("conclusions","") or secs.get("meaning","")
+
+    # Key Points ile zenginleştir
+    before         = kp.get("question")  or secs.get("importance","")
+    findings_sum   = kp.get("findings")  or secs.get("results","")
+    implications   = kp.get("meaning")   or conclusions
+
+    comparator     = pull_comparator(intervention) or pull_comparator(participants)
+    settings_locs  = pull_settings_locations(secs)
+    # Primary outcome'u biraz daha akıllıca yakala; yoksa MOAM'a düş
+    primary_outcome = pull_primary_outcome_from_text(moam_text, participants + " " + intervention)
+
+    return VA(
+        Study(participants, intervention, comparator, primary_outcome, settings_locs),
+        Findings(findings_sum, tuple(pull_key_numbers(findings_sum))),
+        ResearchInContext(before, secs.get("objective",""), implications),
+    )
+
+# -------------------- issue table of contents --------------------
+# Sayı (issue) / içindekiler sayfalarında makale bağlantıları /fullarticle/ içerir; makale
+# türü bağlantının yakınındaki bir etikette ("Original Investigation") ya da grubun
+# başlığında yazar. Tür hiçbir bağlantı için bulunamazsa (bilinmeyen düzen) tüm
+# makale bağlantıları döndürülür.
+ARTICLE_TYPES = (
+    "original investigation", "research letter", "editorial", "invited commentary",
+    "special communication", "review", "viewpoint", "comment & response", "correction",
+    "notice of retraction", "research", "brief report", "clinical guidelines synopsis",
+)
+DEFAULT_ISSUE_TYPES = ("original investigation",)
+
+def _article_type(text: str) -> str:
+    t = clean(text).lower()
+    if len(t) > 60:
+        return ""
+    return next((ty for ty in ARTICLE_TYPES if t == ty or t.startswith(ty + " ")), "")
+
+def _article_path(href: str) -> str:
+    from urllib.parse import urlsplit
+    path = urlsplit(href.strip()).path.rstrip("/")
+    return path if "/fullarticle/" in path else ""
+
+def _link_type(a) -> str:
+    # 1) yalnızca bu makalenin bağlantısını içeren en geniş atadaki kısa etiket metinleri;
+    #    başka makale bağlantısı içeren ata (bölüm, sayfa) taranmaz
+    own = _article_path(a["href"])
+    node = a.parent
+    while node is not None and node.name not in ("body", "html", "[document]"):
+        if any(_article_path(x["href"]) not in ("", own) for x in node.find_all("a", href=True)):
+            break
+        for el in node.find_all(["span", "div", "p", "li"]):
+            if el.find("a", href=True) is not None:
+                continue
+            ty = _article_type(el.get_text(" "))
+            if ty:
+                return ty
+        node = node.parent
+    # 2) en yakın önceki bölüm başlığı (makale başlığı olan h2/h3'ler atlanır)
+    for h in a.find_all_previous(["h2", "h3"]):
+        if h.find("a", href=True) is None:
+            return _article_type(h.get_text(" "))
+    return ""
+
+def extract_issue_links(html_src: str, base_url: str = "", types=DEFAULT_ISSUE_TYPES) -> List[Dict]:
+    """
+    İçindekiler sayfasındaki makale bağlantıları: [{"url","title","type"}], sayfa sırasıyla,
+    tekrarsız. `types` boşsa tür süzgeci uygulanmaz.
+    """
+    from bs4 import BeautifulSoup
+    from urllib.parse import urljoin, urlsplit, urlunsplit
+    soup = BeautifulSoup(html_src, "lxml")
+    base = base_url or extract_page_url(soup)
+    seen, links = set(), []
+    for a in soup.find_all("a", href=True):
+        href = urljoin(base, a["href"].strip())
+        parts = urlsplit(href)
+        if "/fullarticle/" not in parts.path:
+            continue
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/"), "", ""))
+        title = clean(a.get_text(" "))
+        if url in seen:
+            # aynı makalenin ikinci bağlantısı (ör. PDF/başlık) başlığı tamamlayabilir
+            for item in links:
+                if item["url"] == url and not item["title"]:
+                    item["title"] = title
+            continue
+        seen.add(url)
+        links.append({"url": url, "title": title, "type": _link_type(a)})
+    wanted = {t.lower() for t in types or ()}
+    if wanted and any(item["type"] for item in links):
+        links = [item for item in links if item["type"] in wanted]
+    return links
+
+# -------------------- pipeline --------------------
+def extract_article(html_src: str, url: str = "") -> Tuple[VARecord, Dict]:
+    """
+    HTML'den (VARecord, ham bölümler) üretir. `url` boşsa sayfadaki
+    citation_public_url / og:url / canonical kullanılır.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_src, "lxml")
+    raw = extract_sections(soup)
+    rec = VARecord(url or extract_page_url(soup), extract_title(soup), derive_va(raw), extract_doi(soup))
+    return rec, raw
+
+def scrape(target: str, fetcher, deadline=None) -> Tuple[dict, Dict]:
+    """
+    `fetcher` (fetchers.HttpFetcher / BrowserFetcher / FileFetcher) ile sayfayı alır
+    ve ({"url","title","va"}, ham bölümler) döndürür. `deadline` fetch'e iletilir.
+    """
+    rec, raw = extract_article(fetcher.fetch(target, deadline), fetcher.page_url(target))
+    if not rec.url:
+        rec.url = target if "://" in target else "file://" + os.path.abspath(target)
+    return rec.to_dict(), raw
@@ -0,0 +1,177 @@
+# fetchers.py
+# extraction.scrape() için takılabilir sayfa kaynakları:
+#   HttpFetcher    - paylaşılan, bağlantı havuzlu requests oturumu (MCP server yolu)
+#   BrowserFetcher - headless Chrome (jama_scraper sürücü havuzu)
+#   FileFetcher    - kayıtlı HTML dosyası (offline corpus / fixture'lar)
+
+import os, threading
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+    from deadline import Deadline
+
+HTTP_HEADERS = {"User-Agent":"Mozilla/5.0","Accept-Language":"en-US,en;q=0.9"}
+WARM_HOSTS = ("https://jamanetwork.com", os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/"))
+
+# -------------------- http pool --------------------
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> "requests.Session":
+    """Süreç genelinde paylaşılan, bağlantı havuzlu requests oturumu."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                pool_size = int(os.environ.get("HTTP_POOL_SIZE", "10"))
+                sess = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                _session = sess
+    return _session
+
+def warm_http_pool(hosts=WARM_HOSTS, timeout: float = 5.0) -> dict:
+    """Her host'a HEAD isteği atarak havuzda keep-alive bağlantı açar. {host: status|hata}"""
+    sess = get_session()
+    out = {}
+    for host in hosts:
+        try:
+            out[host] = sess.head(host, headers=HTTP_HEADERS, timeout=timeout, allow_redirects=False).status_code
+        except Exception as e:
+            out[host] = f"error: {e}"
+    return out
+
+# -------------------- fetchers --------------------
+class Fetcher:
+    name = "base"
+
+    def fetch(self, target: str, deadline: "Optional[Deadline]" = None) -> str:
+        """Sayfa HTML'i; `deadline` verilirse bekleme kalan süreyle sınırlanır ve iptalde kesilir."""
+        raise NotImplementedError
+
+    def page_url(self, target: str) -> str:
+        """Kayda yazılacak URL; "" ise sayfadaki canonical adres kullanılır."""
+        return target
+
+class HttpFetcher(Fetcher):
+    name = "http"
+
+    def __init__(self, timeout: float = 25):
+        self.timeout = timeout
+
+    def fetch(self, target: str, deadline: "Optional[Deadline]" = None) -> str:
+        if deadline is None:
+            r = get_session().get(target, headers=HTTP_HEADERS, timeout=self.timeout)
+            r.raise_for_status()
+            return r.text
+        # Gövde parça parça okunur: her parçada süre/iptal kontrolü, iptalde bağlantı kapatılır.
+        r = get_session().get(target, headers=HTTP_HEADERS, stream=True,
+                              timeout=deadline.timeout(self.timeout, "fetch"))
+        unregister = deadline.on_cancel(lambda: _abort_response(r))
+        try:
+            r.raise_for_status()
+            chunks = []
+            for chunk in r.iter_content(64 * 1024):
+                deadline.check("fetch")
+                chunks.append(chunk)
+            return b"".join(chunks).decode(r.encoding or "utf-8", errors="replace")
+        finally:
+            unregister()
+            r.close()
+
+    def revalidate(self, target: str, etag: str = "", last_modified: str = "",
+                   deadline: "Optional[Deadline]" = None) -> Tuple[int, Optional[str], str, str]:
+        """
+        Koşullu GET (If-None-Match / If-Modified-Since): (status, html | None, etag, last_modified).
+        304'te gövde indirilmez ve html None döner; doğrulayıcılar sunucu yenilerini göndermezse korunur.
+        `deadline` fetch() ile aynı şekilde uygulanır.
+        """
+        headers = dict(HTTP_HEADERS)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if deadline is None:
+            r = get_session().get(target, headers=headers, timeout=self.timeout)
+            if r.status_code == 304:
+                return 304, None, r.headers.get("ETag") or etag, r.headers.get("Last-Modified") or last_modified
+            r.raise_for_status()
+            return r.status_code, r.text, r.headers.get("ETag", ""), r.headers.get("Last-Modified", "")
+        r = get_session().get(target, headers=headers, stream=True,
+                              timeout=deadline.timeout(self.timeout, "revalidate"))
+        unregister = deadline.on_cancel(lambda: _abort_response(r))
+        try:
+            if r.status_code == 304:
+                return 304, None, r.headers.get("ETag") or etag, r.headers.get("Last-Modified") or last_modified
+            r.raise_for_status()
+            chunks = []
+            for chunk in r.iter_content(64 * 1024):
+                deadline.check("revalidate")
+                chunks.append(chunk)
+            html_src = b"".join(chunks).decode(r.encoding or "utf-8", errors="replace")
+            return r.status_code, html_src, r.headers.get("ETag", ""), r.headers.get("Last-Modified", "")
+        finally:
+            unregister()
+            r.close()
+
+def _abort_response(r):
+    """Okuma süren yanıtın bağlantısını keser: bloklu recv hemen döner (r.close() okuyucuyu bekler)."""
+    import socket
+    try:
+        fd = r.raw.fileno()
+    except (OSError, ValueError, AttributeError):
+        return
+    # shutdown soket düzeyindedir; dup edilmiş fd üzerinden çağırmak asıl bağlantıyı da keser
+    s = socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        s.close()
+
+class BrowserFetcher(Fetcher):
+    name = "browser"
+
+    def fetch(self, target: str, deadline: "Optional[Deadline]" = None) -> str:
+        import jama_scraper
+        d = jama_scraper.acquire_driver()
+        broken = True
+        unregister = deadline.on_cancel(lambda: jama_scraper.kill_driver(d)) if deadline else None
+        try:
+            if deadline is None:
+                d.get(target); jama_scraper.wait_for_load(d)
+            else:
+                d.set_page_load_timeout(max(1, int(deadline.timeout(what="browser"))))
+                d.get(target)
+                jama_scraper.wait_for_load(d, timeout=deadline.timeout(15, "browser"))
+                deadline.check("browser")
+            html_src = d.page_source
+            broken = False
+        finally:
+            if unregister: unregister()
+            jama_scraper.release_driver(d, broken=broken)
+        return html_src
+
+class FileFetcher(Fetcher):
+    name = "file"
+
+    def fetch(self, target: str, deadline: "Optional[Deadline]" = None) -> str:
+        path = target[len("file://"):] if target.startswith("file://") else target
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def page_url(self, target: str) -> str:
+        return ""
+
+FETCHERS = {"http": HttpFetcher, "browser": BrowserFetcher, "file": FileFetcher}
+
+def get_fetcher(name: str) -> Fetcher:
+    try:
+        return FETCHERS[name]()
+    except KeyError:
+        raise ValueError(f"Bilinmeyen fetch backend: {name} (seçenekler: {', '.join(FETCHERS)})")
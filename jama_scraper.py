@@ -1,89 +1,67 @@
 # jama_scraper.py
 # Kullanım:
 #   python jama_scraper.py "URL" -o va.json
+#   python jama_scraper.py --html arsiv/ "kayitlar/**/*.html" --out-dir va_out
+#   python jama_scraper.py URL1 URL2 ... --jsonl va.jsonl      ("-" -> stdout)
+#   python jama_scraper.py --urls-file urls.txt --manifest run.manifest --resume
 
-import re, json, argparse, time, html, unicodedata
-from typing import Dict, Optional
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-# -------------------- text utils --------------------
-def clean(s: Optional[str]) -> str:
-    if not s:
-        return ""
-    s = html.unescape(s)
-    s = unicodedata.normalize("NFKC", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    # Bazı tarayıcı kombinasyonlarında U+2212 (−) karışabiliyor; ASCII tire yap:
-    s = s.replace("\u2212", "-")
-    return s
-
-def norm_heading(h: str) -> Optional[str]:
-    h = clean(h).lower().rstrip(":")
-    MAP = {
-        "importance":"importance",
-        "objective":"objective",
-        "design, setting, and participants":"dsp",
-        "design, settings, and participants":"dsp",
-        "design and participants":"dsp",
-        "participants":"dsp",
-        "intervention":"interventions",
-        "interventions":"interventions",
-        "main outcomes and measures":"moam",
-        "outcomes":"moam",
-        "results":"results",
-        "conclusions and relevance":"conclusions",
-        "conclusions":"conclusions",
-        "meaning":"meaning",
-        "trial registration":"trial_registration",
-        # Yeni şablon için olası başlık varyantları:
-        "setting":"settings_locations",
-        "settings":"settings_locations",
-        "location":"settings_locations",
-        "locations":"settings_locations",
-        "settings/locations":"settings_locations",
-        "setting/locations":"settings_locations",
-        "setting and locations":"settings_locations",
-        "settings and locations":"settings_locations",
-        "study setting":"settings_locations",
-    }
-    return MAP.get(h)
-
-def pull_comparator(text: str) -> str:
-    t = clean(text)
-    for pat in [r"\bvs\.?\s+([^.;:]+)", r"\bversus\s+([^.;:]+)", r"\bcompared with\s+([^.;:]+)"]:
-        m = re.search(pat, t, flags=re.I)
-        if m: return clean(m.group(1))
-    # JAMA örneğine özel failsafe
-    if re.search(r"\bPR-?min\b", t, flags=re.I) and re.search(r"\bPR-?gym\b", t, flags=re.I):
-        return "PR-gym"
-    return ""
-
-def pull_key_numbers(text: str) -> list:
-    t = clean(text)
-    pats = [
-        r"\bn\s*=\s*\d{2,4}\b",
-        r"\b\d{1,3}\s?%\b",
-        r"\bp\s*[<=>]\s*0?\.\d+\b",
-        r"\b(?:OR|RR|HR)\s*=\s*\d+(?:\.\d+)?\b",
-        r"\bCI\s*\(?\d{1,2}%\)?\s*:\s*\d+(?:\.\d+)?\s*[–-]\s*\d+(?:\.\d+)?\b",
-        r"\b[-+]?\d+(?:\.\d+)?\s*(?:m|km|min|days|weeks)\b",
-    ]
-    out = []
-    for rgx in pats:
-        out += [m.group(0) for m in re.finditer(rgx, t, flags=re.I)]
-    # tekilleştir
-    seen, uniq = set(), []
-    for x in out:
-        if x not in seen:
-            seen.add(x); uniq.append(x)
-    return uniq[:8]
+import os, sys, glob, json, argparse, time, atexit, threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import TYPE_CHECKING, Dict, Optional
+from jsonl import JsonlWriter
+from checkpoint import Manifest, output_name
+from va_records import VARecord, VA
+
+# selenium / webdriver_manager yalnızca tarayıcı yolunda gerekir; ilk kullanımda yüklenir.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from selenium import webdriver
+
+# -------------------- extraction core --------------------
+# Parse ve sezgiler app.py (MCP) ile paylaşılan extraction.py çekirdeğinde;
+# buradaki adlar geriye dönük uyum için yeniden dışa aktarılır.
+import extraction
+from extraction import (
+    HEURISTICS_VERSION, clean, norm_heading, parse_abstract_dom, parse_abstract_meta,
+    parse_key_points, pull_comparator, pull_key_numbers, pull_settings_locations,
+    pull_primary_outcome_from_text, extract_sections, derive_va, extract_title,
+)
+from fetchers import BrowserFetcher, FileFetcher
 
 # -------------------- selenium --------------------
-def get_driver() -> webdriver.Chrome:
+# Yalın tarayıcı profili (JAMA_BROWSER_LEAN=1, varsayılan): çıkarıcı yalnızca metin okur.
+#   - page_load_strategy "eager": DOMContentLoaded'da döner, alt kaynakları beklemez
+#   - resimler, bildirimler, medya, eklentiler kapalı (Chrome tercihleri)
+#   - görsel/font/video/stil dosyaları ve bilinen izleyici/reklam adresleri CDP
+#     Network.setBlockedURLs ile engellenir (JAMA_BROWSER_BLOCK ile değiştirilebilir)
+#   - JAMA_BROWSER_ALLOW_HOSTS listesi dışındaki tüm host'lar DNS düzeyinde çözülmez
+#     (üçüncü taraf alan adları hiç bağlanmaz); "*" ile kapatılır.
+DEFAULT_BLOCK_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.css",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*adservice.google.*", "*facebook.net*", "*hotjar.com*", "*scorecardresearch.com*", "*adsystem*",
+    "*trendmd.com*", "*altmetric.com*", "*onetrust.com*", "*cookielaw.org*",
+)
+DEFAULT_ALLOW_HOSTS = "jamanetwork.com,*.jamanetwork.com,*.silverchair.com,*.silverchair-cdn.com"
+
+def _env_list(name: str, default) -> list:
+    v = os.environ.get(name)
+    if v is None:
+        return list(default)
+    return [x.strip() for x in v.split(",") if x.strip()]
+
+def _lean_profile() -> bool:
+    return os.environ.get("JAMA_BROWSER_LEAN", "1").strip().lower() not in ("0", "false", "no", "off")
+
+def get_driver() -> "webdriver.Chrome":
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    lean = _lean_profile()
     opts = Options()
     opts.add_argument("--headless=new")
     opts.add_argument("--disable-gpu")
@@ -93,207 +71,426 @@ def get_driver() -> webdriver.Chrome:
     opts.add_argument("--window-size=1920,1080")
     opts.add_experimental_option("excludeSwitches", ["enable-logging"])
     opts.add_argument("--log-level=3")
+    opts.add_argument(BROWSER_MARKER)   # sahipsiz süreç taramasında bizim chrome'larımızı tanır
     opts.add_argument("--lang=en-US,en;q=0.9,tr;q=0.8")
     opts.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    if lean:
+        opts.page_load_strategy = "eager"
+        opts.add_argument("--blink-settings=imagesEnabled=false")
+        opts.add_argument("--disable-extensions")
+        opts.add_argument("--disable-background-networking")
+        opts.add_argument("--disable-component-update")
+        opts.add_argument("--disable-default-apps")
+        opts.add_argument("--disable-sync")
+        opts.add_argument("--mute-audio")
+        opts.add_argument("--autoplay-policy=user-gesture-required")
+        opts.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+            "profile.managed_default_content_settings.plugins": 2,
+            "profile.managed_default_content_settings.geolocation": 2,
+        })
+        allow = _env_list("JAMA_BROWSER_ALLOW_HOSTS", DEFAULT_ALLOW_HOSTS.split(","))
+        if allow and "*" not in allow:
+            rules = ["MAP * ~NOTFOUND"] + [f"EXCLUDE {h}" for h in allow]
+            opts.add_argument("--host-resolver-rules=" + ", ".join(rules))
+    drv = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    if lean:
+        blocked = _env_list("JAMA_BROWSER_BLOCK", DEFAULT_BLOCK_PATTERNS)
+        if blocked:
+            try:
+                drv.execute_cdp_cmd("Network.enable", {})
+                drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+            except Exception:
+                pass   # CDP yoksa tercihler ve host kuralları yine geçerli
+    return drv
+
+# -------------------- driver pool --------------------
+# JAMA_BROWSER_POOL > 0 ise kullanılan sürücüler kapatılmak yerine havuza döner
+# ve sonraki sayfalarda yeniden kullanılır. Varsayılan 0: her sayfada yeni sürücü.
+#
+# Uzun süre çalışan süreçlerde Chrome belleği her gezinmede büyür. Bir sürücü
+# JAMA_BROWSER_MAX_PAGES sayfadan sonra veya süreç ağacının RSS'i
+# JAMA_BROWSER_MAX_RSS_MB'ı aştığında havuza dönmez, kapatılıp yenisiyle değiştirilir.
+# Kapatılan sürücünün ağacında kalan süreçler öldürülür. Önceki çökmüş çalışmalardan kalan
+# sahipsiz chromedriver/chrome süreçleri ilk sürücü başlatılırken ve kapanışta
+# temizlenir (JAMA_BROWSER_REAP=0 ile kapatılır).
+#
+#   JAMA_BROWSER_MAX_PAGES  (varsayılan: 50; 0 = sınırsız)
+#   JAMA_BROWSER_MAX_RSS_MB (varsayılan: 1024; 0 = sınırsız)
+#   JAMA_BROWSER_REAP       (varsayılan: 1)
+BROWSER_MARKER = "--jama-scraper-browser"
 
-def wait_for_load(drv: webdriver.Chrome, timeout: float = 15.0):
+_driver_pool: list = []
+_driver_pool_lock = threading.Lock()
+_live: Dict[int, dict] = {}        # id(drv) -> {"pid", "pages", "started"}
+_browser_counters = {"started": 0, "recycled": 0, "reaped": 0}
+_reaped_at_start = False
+
+def _pool_max() -> int:
+    return int(os.environ.get("JAMA_BROWSER_POOL", "0"))
+
+def _max_pages() -> int:
+    return int(os.environ.get("JAMA_BROWSER_MAX_PAGES", "50"))
+
+def _max_rss() -> int:
+    return int(float(os.environ.get("JAMA_BROWSER_MAX_RSS_MB", "1024")) * 1024 * 1024)
+
+def _driver_pid(drv) -> int:
+    proc = getattr(getattr(drv, "service", None), "process", None)
+    return getattr(proc, "pid", 0) or 0
+
+def reap_orphans() -> int:
+    """Sahipsiz chromedriver/chrome süreçlerini öldürür; öldürülen ağaç sayısını döndürür."""
+    if os.environ.get("JAMA_BROWSER_REAP", "1").strip().lower() in ("0", "false", "no", "off"):
+        return 0
+    import procs
+    with _driver_pool_lock:
+        live = [rec["pid"] for rec in _live.values()]
+    n = 0
+    for pid in procs.find_orphans(BROWSER_MARKER, exclude=live):
+        if procs.kill_tree(pid):
+            n += 1
+    if n:
+        with _driver_pool_lock:
+            _browser_counters["reaped"] += n
+        print(f"[browser] {n} sahipsiz tarayıcı süreci temizlendi", file=sys.stderr)
+    return n
+
+def _new_driver() -> "webdriver.Chrome":
+    global _reaped_at_start
+    if not _reaped_at_start:
+        _reaped_at_start = True
+        reap_orphans()
+    drv = get_driver()
+    with _driver_pool_lock:
+        _live[id(drv)] = {"pid": _driver_pid(drv), "pages": 0, "started": time.time()}
+        _browser_counters["started"] += 1
+    return drv
+
+def _close_driver(drv: "webdriver.Chrome", force: bool = False):
+    # quit sonrası ağaçta kalan (takılmış renderer vb.) süreçleri de öldürür
+    with _driver_pool_lock:
+        rec = _live.pop(id(drv), None)
+    pid = rec["pid"] if rec else _driver_pid(drv)
+    import procs
+    if force and pid:
+        procs.kill_tree(pid)
+    pids = procs.tree(pid) if pid else []   # quit sonrası chrome'lar init'e devredilir; önceden al
+    try:
+        drv.quit()
+    except Exception:
+        pass
+    procs.kill_pids(pids)
+
+def _needs_recycle(rec: dict) -> bool:
+    if _max_pages() and rec["pages"] >= _max_pages():
+        return True
+    if _max_rss() and rec["pid"]:
+        import procs
+        return procs.rss_bytes(procs.tree(rec["pid"])) > _max_rss()
+    return False
+
+def acquire_driver() -> "webdriver.Chrome":
+    with _driver_pool_lock:
+        if _driver_pool:
+            return _driver_pool.pop()
+    return _new_driver()
+
+def release_driver(drv: "webdriver.Chrome", broken: bool = False):
+    with _driver_pool_lock:
+        rec = _live.get(id(drv))
+        if rec is not None:
+            rec["pages"] += 1
+    if not broken and rec is not None and _needs_recycle(rec):
+        with _driver_pool_lock:
+            _browser_counters["recycled"] += 1
+        broken = True
+    if not broken:
+        with _driver_pool_lock:
+            if len(_driver_pool) < _pool_max():
+                _driver_pool.append(drv); return
+    _close_driver(drv)
+
+def prestart_drivers(n: int) -> int:
+    """Havuza en fazla `n` (ve JAMA_BROWSER_POOL) adet sürücü başlatır; havuzdaki sürücü sayısını döndürür."""
+    target = min(n, _pool_max())
+    while True:
+        with _driver_pool_lock:
+            if len(_driver_pool) >= target:
+                return len(_driver_pool)
+        drv = _new_driver()
+        with _driver_pool_lock:
+            _driver_pool.append(drv)
+
+def kill_driver(drv: "webdriver.Chrome"):
+    """Sürücüyü beklemeden sonlandırır (iptal/süre aşımı): önce süreç ağacı, sonra quit."""
+    _close_driver(drv, force=True)
+
+def shutdown_drivers():
+    """Havuzdaki ve kullanımdaki tüm sürücüleri kapatır, sahipsiz süreçleri temizler."""
+    with _driver_pool_lock:
+        drivers, _driver_pool[:] = list(_driver_pool), []
+    for drv in drivers:
+        _close_driver(drv)
+    with _driver_pool_lock:
+        leftover = [rec["pid"] for rec in _live.values()]
+        _live.clear()
+    import procs
+    for pid in leftover:
+        procs.kill_tree(pid)
+    if _browser_counters["started"]:   # tarayıcı hiç açılmadıysa taramaya gerek yok
+        reap_orphans()
+
+def browser_stats() -> dict:
+    """Canlı tarayıcı sayısı, bellek kullanımı ve yaşam döngüsü sayaçları."""
+    import procs
+    with _driver_pool_lock:
+        live = [dict(rec) for rec in _live.values()]
+        pooled = len(_driver_pool)
+        counters = dict(_browser_counters)
+    now = time.time()
+    drivers = []
+    for rec in live:
+        rss = procs.rss_bytes(procs.tree(rec["pid"])) if rec["pid"] else 0
+        drivers.append({"pid": rec["pid"], "pages": rec["pages"], "rss_bytes": rss,
+                        "age_seconds": round(now - rec["started"], 1)})
+    return dict(counters, live=len(drivers), pooled=pooled,
+                rss_bytes=sum(d["rss_bytes"] for d in drivers), drivers=drivers,
+                limits={"max_pages": _max_pages(), "max_rss_bytes": _max_rss()})
+
+atexit.register(shutdown_drivers)
+
+def wait_for_load(drv: "webdriver.Chrome", timeout: float = 15.0):
+    # Yalın profilde alt kaynaklar engellendiğinden DOM hazır ("interactive") olması yeterli.
+    ready = ("interactive", "complete") if _lean_profile() else ("complete",)
     end = time.time() + timeout
     while time.time() < end:
-        if drv.execute_script("return document.readyState") == "complete":
+        if drv.execute_script("return document.readyState") in ready:
             time.sleep(0.4); return
         time.sleep(0.2)
 
-# -------------------- parsers --------------------
-def parse_abstract_dom(soup: BeautifulSoup) -> Dict[str,str]:
-    """#abstract içindeki <p><strong>H</strong> metin...</p> bloklarını sözlüğe döker."""
-    out = {}
-    abstract = soup.find(id="abstract") or soup.select_one("#abstract")
-    if not abstract:
-        return out
-    for p in abstract.find_all("p", recursive=True):
-        strong = p.find("strong")
-        if not strong:
-            continue
-        key = norm_heading(strong.get_text(" ", strip=True))
-        if not key:
-            continue
-        whole = p.get_text(" ", strip=True)
-        # başlığı baştan kes
-        content = re.sub(r"^\s*"+re.escape(strong.get_text(strip=True))+r"\s*:?\s*", "", whole, flags=re.I)
-        out[key] = clean(content)
-    return out
-
-def parse_abstract_meta(soup: BeautifulSoup) -> Dict[str,str]:
-    """<meta name="citation_abstract" content="...HTML..."> içindeki HTML'i parse eder."""
-    out = {}
-    meta = soup.find("meta", attrs={"name":"citation_abstract"})
-    if not meta or not meta.get("content"):
-        return out
-    inner = BeautifulSoup(meta["content"], "lxml")
-    # h3 -> p komşularını al
-    for h in inner.find_all(["h3","strong"]):
-        key = norm_heading(h.get_text(" ", strip=True))
-        if not key:
-            continue
-        content = ""
-        sib = h.find_next_sibling()
-        if sib and sib.name == "p":
-            content = sib.get_text(" ", strip=True)
+# -------------------- extraction --------------------
+def extract_va(soup: "BeautifulSoup") -> Dict:
+    return extract_va_record(soup).to_dict()
+
+def extract_va_record(soup: "BeautifulSoup") -> VA:
+    return derive_va(extract_sections(soup))
+
+def extract_html(html_src: str, url: str = "") -> Dict:
+    """Ham HTML'den {"url","title","va"} kaydı üretir (ağ erişimi yok)."""
+    return extract_html_record(html_src, url).to_dict()
+
+def extract_html_record(html_src: str, url: str = "") -> VARecord:
+    return extract_html_raw(html_src, url)[0]
+
+def extract_html_raw(html_src: str, url: str = ""):
+    """(VARecord, ham bölümler) döndürür; ham bölümler depoda yeniden türetme için saklanır."""
+    return extraction.extract_article(html_src, url)
+
+def scrape(url: str) -> Dict:
+    return scrape_raw(url)[0]
+
+def scrape_raw(url: str):
+    """Tarayıcıyla çeker; ({"url","title","va"}, ham bölümler) döndürür."""
+    return extraction.scrape(url, BrowserFetcher())
+
+# -------------------- offline corpus --------------------
+def iter_html_files(patterns):
+    """Dizin veya glob desenlerinden .html/.htm dosya yollarını (tekrarsız) üretir."""
+    seen = set()
+    for pat in patterns:
+        if os.path.isdir(pat):
+            paths = glob.iglob(os.path.join(pat, "**", "*.htm*"), recursive=True)
         else:
-            # p>strong yapısı
-            par = h.parent if h.parent and h.parent.name == "p" else None
-            if par:
-                whole = par.get_text(" ", strip=True)
-                content = re.sub(r"^\s*"+re.escape(h.get_text(strip=True))+r"\s*:?\s*", "", whole, flags=re.I)
-        if content:
-            out[key] = clean(content)
-    return out
-
-def parse_key_points(soup: BeautifulSoup) -> Dict[str,str]:
-    """Key Points kutusu varsa Question/Findings/Meaning alanlarını döndürür."""
-    out = {"question":"", "findings":"", "meaning":""}
-    # "Key Points" başlığını arayıp yakınındaki p/strong bloklarını topla
-    hdr = None
-    for tag in soup.find_all(["h2","h3","h4"]):
-        if clean(tag.get_text()).lower() == "key points":
-            hdr = tag; break
-    if not hdr:
-        return out
-    container = hdr.parent
-    # Öncelik: aynı container içindeki strong başlıkları
-    for p in container.find_all("p"):
-        t = clean(p.get_text(" ", strip=True))
-        # "Question. ..." gibi olabilir
-        m = re.match(r"(question|findings|meaning)\.?\s*(.+)", t, flags=re.I)
-        if m:
-            k, v = m.group(1).lower(), clean(m.group(2))
-            out[k] = v
-    return out
-
-# -------------------- smart pulls --------------------
-_LOC_SNIPPET_RGX = re.compile(
-    r"(?:(?:\d+\s+(?:center|centers|site|sites|unit|units|hospital|hospitals))"
-    r"|(?:across the\s+[A-Za-z ,\-]+)"
-    r"|(?:in\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)"
-    r"|(?:multicenter|single-center|single centre|multicentre))",
-    flags=re.I
-)
+            paths = glob.iglob(pat, recursive=True)
+        for p in sorted(paths):
+            if os.path.isfile(p) and p not in seen:
+                seen.add(p)
+                yield p
+
+def extract_file(path: str, with_raw: bool = False):
+    """Kayıtlı HTML'den kayıt üretir; `with_raw` ise (kayıt, ham bölümler) döndürür."""
+    data, raw = extraction.scrape(path, FileFetcher())
+    return (data, raw) if with_raw else data
 
-def pull_settings_locations(sections: Dict[str,str]) -> str:
+def _extract_file_safe(path: str):
+    try:
+        data, raw = extract_file(path, with_raw=True)
+        return path, data, raw, None
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+
+def extract_corpus(paths, workers: Optional[int] = None):
     """
-    1) 'settings_locations' başlığı varsa onu döndür.
-    2) Yoksa DSP (design/setting/participants) içinden lokasyon/merkez geçen ilk anlamlı cümleyi kırparak döndür.
+    Kayıtlı HTML dosyalarını çekirdek sayısı kadar süreçte paralel işler ve
+    sonuçları tamamlandıkça (path, data, ham bölümler, hata) olarak üretir.
+    Bellekte en fazla workers*4 iş bekler; dosya sayısından bağımsız olarak
+    bellek sabit kalır.
     """
-    if sections.get("settings_locations"):
-        return clean(sections["settings_locations"])
-
-    dsp = sections.get("dsp", "")
-    if not dsp:
-        return ""
-
-    # Cümlelere böl ve anahtar desen içeren ilk cümleyi al
-    sentences = re.split(r"(?<=[.!?])\s+", dsp)
-    for s in sentences:
-        if _LOC_SNIPPET_RGX.search(s):
-            # Gereksiz detayları kısalt: 250 karakteri geçmesin
-            s = clean(s)
-            return s[:250]
-    return ""
-
-def pull_primary_outcome_from_text(moam: str, backup_texts: str = "") -> str:
+    workers = workers or os.cpu_count() or 1
+    window = workers * 4
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = set()
+        for p in paths:
+            pending.add(ex.submit(_extract_file_safe, p))
+            if len(pending) >= window: break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+                nxt = next(paths, None)
+                if nxt is not None:
+                    pending.add(ex.submit(_extract_file_safe, nxt))
+
+def _write_json(path: str, data: Dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def _emit(data: Dict, out_path: str, writer: Optional[JsonlWriter], durable: bool = False) -> str:
     """
-    Eğer MOAM içinde 'primary outcome/endpoint' ifadesi açıkça varsa onu alır.
-    Yoksa yedek metinler içinde arar; yine yoksa MOAM'ı döndürür.
+    Kaydı JSONL'e ya da tek JSON dosyasına yazar; çıktı konumunu döndürür.
+    `durable` ise (manifest kullanımı) JSONL tamponu hemen boşaltılır ki
+    "done" işaretlenen kayıt diskte olsun.
     """
-    texts = [moam, backup_texts]
-    for t in texts:
-        tt = clean(t)
-        m = re.search(r"(primary (?:outcome|endpoint)[^.;:]*[.;:]?)", tt, flags=re.I)
-        if m:
-            return clean(m.group(1))
-    return clean(moam)
+    if writer is not None:
+        writer.write(data)
+        if durable: writer.flush()
+        return writer.path
+    _write_json(out_path, data)
+    return out_path
 
-# -------------------- extraction --------------------
-def extract_va(soup: BeautifulSoup) -> Dict:
-    # 1) Abstract: DOM -> meta fallback
-    secs = parse_abstract_dom(soup)
-    if not secs:
-        secs = parse_abstract_meta(soup)
-
-    # 2) Key Points varsa
-    kp = parse_key_points(soup)
-
-    participants   = secs.get("dsp","")
-    intervention   = secs.get("interventions","")
-    moam_text      = secs.get("moam","")
-    results        = secs.get("results","")
-    importance     = secs.get("importance","")
-    objective      = secs.get("objective","")
-    conclusions    = secs.get("conclusions","") or secs.get("meaning","")
-
-    # Key Points ile zenginleştir
-    before         = kp["question"]  or importance
-    findings_sum   = kp["findings"]  or results
-    implications   = kp["meaning"]   or conclusions
-
-    comparator     = pull_comparator(intervention) or pull_comparator(participants)
-
-    # Yeni alan: Settings / Locations
-    settings_locs  = pull_settings_locations(secs)
-
-    # Primary outcome'u biraz daha akıllıca yakala; yoksa MOAM'a düş
-    primary_outcome = pull_primary_outcome_from_text(moam_text, participants + " " + intervention)
-
-    return {
-        "the_study": {
-            "participants": participants,
-            "intervention": intervention,
-            "comparator": comparator,
-            "primary_outcome": primary_outcome,
-            "settings_locations": settings_locs
-        },
-        "findings": {
-            "summary": findings_sum,
-            "key_numbers": pull_key_numbers(findings_sum)
-        },
-        "research_in_context": {
-            "before": before,
-            "added_value": objective,
-            "implications": implications
-        }
-    }
+def run_corpus(patterns, out_dir: str, workers: Optional[int] = None,
+               writer: Optional[JsonlWriter] = None,
+               manifest: Optional[Manifest] = None, resume: bool = False, store=None) -> Dict:
+    """
+    Kayıtlı HTML'leri işler; `writer` verilirse kayıtlar dosya başına JSON yerine
+    JSONL'e akar. `store` (ArticleStore) verilirse kayıtlar ham bölümleriyle saklanır.
+    """
+    if writer is None:
+        os.makedirs(out_dir, exist_ok=True)
+    paths = iter_html_files(patterns)
+    if manifest is not None:
+        paths = manifest.remaining(paths, resume=resume)
+        manifest.mark_pending(paths)
+    t0 = time.perf_counter()
+    ok = failed = 0
+    for path, data, raw, err in extract_corpus(paths, workers):
+        if err:
+            failed += 1
+            if manifest is not None: manifest.mark_failed(path, err)
+            print(f"HATA {path}: {err}", file=sys.stderr)
+            continue
+        ok += 1
+        # aynı adlı dosyalar farklı klasörlerde olabilir: ad tam yoldan türetilir (run_urls ile aynı şema)
+        out = os.path.join(out_dir, output_name(path, ".json"))
+        out = _emit(data, out, writer, durable=manifest is not None)
+        if store is not None: store.upsert(data, raw=raw, heuristics_version=HEURISTICS_VERSION)
+        if manifest is not None: manifest.mark_done(path, out)
+        if ok % 100 == 0:
+            el = time.perf_counter() - t0
+            print(f"{ok} sayfa, {ok/el:.1f} sayfa/sn", file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    stats = {"ok": ok, "failed": failed, "seconds": round(elapsed, 3),
+             "pages_per_second": round((ok + failed) / elapsed, 2) if elapsed > 0 else 0.0}
+    print(f"Bitti: {ok} başarılı, {failed} hatalı, {stats['seconds']} sn, "
+          f"{stats['pages_per_second']} sayfa/sn", file=sys.stderr)
+    return stats
 
-def scrape(url: str) -> Dict:
-    d = get_driver()
-    try:
-        d.get(url); wait_for_load(d)
-        html_src = d.page_source
-    finally:
-        d.quit()
-    soup = BeautifulSoup(html_src, "lxml")
-    # Başlık: h1 -> og:title -> citation_title
-    title = ""
-    h1 = soup.find("h1")
-    if h1: title = clean(h1.get_text(" ", strip=True))
-    if not title:
-        og = soup.find("meta", attrs={"property":"og:title"})
-        if og and og.get("content"): title = clean(og["content"])
-    if not title:
-        ct = soup.find("meta", attrs={"name":"citation_title"})
-        if ct and ct.get("content"): title = clean(ct["content"])
-
-    va = extract_va(soup)
-    return {"url": url, "title": title, "va": va}
+def run_urls(urls, out_dir: str = "va_out", writer: Optional[JsonlWriter] = None,
+             manifest: Optional[Manifest] = None, resume: bool = False, store=None) -> Dict:
+    """
+    URL'leri sırayla çeker; her kayıt çıkarıldığı anda JSONL'e (ya da URL başına
+    JSON dosyasına) yazılır. `manifest` verilirse her URL'nin durumu ve çıktı
+    konumu kaydedilir; `resume` ile tamamlanmış URL'ler atlanır.
+    """
+    if writer is None:
+        os.makedirs(out_dir, exist_ok=True)
+    urls = list(dict.fromkeys(urls))
+    skipped = 0
+    if manifest is not None:
+        todo = manifest.remaining(urls, resume=resume)
+        skipped = len(urls) - len(todo)
+        urls = todo
+        manifest.mark_pending(urls)
+    ok = failed = 0
+    for url in urls:
+        try:
+            data, raw = scrape_raw(url)
+            out = _emit(data, os.path.join(out_dir, output_name(url, ".json")), writer,
+                        durable=manifest is not None)
+            if store is not None: store.upsert(data, raw=raw, heuristics_version=HEURISTICS_VERSION)
+            ok += 1
+            if manifest is not None: manifest.mark_done(url, out)
+        except Exception as e:
+            failed += 1
+            if manifest is not None: manifest.mark_failed(url, f"{type(e).__name__}: {e}")
+            print(f"HATA {url}: {type(e).__name__}: {e}", file=sys.stderr)
+    if skipped:
+        print(f"{skipped} URL önceki çalıştırmada tamamlanmış, atlandı.", file=sys.stderr)
+    return {"ok": ok, "failed": failed, "skipped": skipped}
+
+def read_urls_file(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [ln.strip() for ln in f if ln.strip() and not ln.lstrip().startswith("#")]
 
 # -------------------- cli --------------------
 if __name__ == "__main__":
     ap = argparse.ArgumentParser(description="JAMA makalesinden Visual Abstract JSON üretir.")
-    ap.add_argument("url")
+    ap.add_argument("urls", nargs="*", metavar="url")
     ap.add_argument("-o", "--out", default="va.json")
+    ap.add_argument("--html", nargs="+", metavar="DIZIN|GLOB",
+                    help="Ağa çıkmadan kayıtlı HTML dosyalarını işle (dizin veya glob)")
+    ap.add_argument("--out-dir", default="va_out", help="--html modunda JSON çıktılarının dizini")
+    ap.add_argument("--workers", type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    ap.add_argument("--jsonl", metavar="DOSYA|-",
+                    help="Kayıtları tek tek JSON dosyaları yerine JSON Lines olarak ekle ('-' = stdout)")
+    ap.add_argument("--flush-every", type=int, default=50, help="JSONL tamponunun boşaltılma aralığı (kayıt)")
+    ap.add_argument("--urls-file", help="Satır başına bir URL içeren dosya ('#' ile başlayanlar atlanır)")
+    ap.add_argument("--manifest", help="Toplu çalıştırma için checkpoint manifest dosyası")
+    ap.add_argument("--resume", action="store_true",
+                    help="Manifest'te tamamlanmış öğeleri atla; yalnızca başarısız/bekleyenleri çalıştır")
+    ap.add_argument("--store", nargs="?", const=os.environ.get("ARTICLE_DB", "data/articles.sqlite3"),
+                    metavar="DB", help="Kayıtları ham bölümleriyle SQLite makale deposuna da yaz")
     args = ap.parse_args()
 
-    data = scrape(args.url)
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"JSON yazıldı: {args.out}")
+    urls = list(args.urls)
+    if args.urls_file:
+        urls += read_urls_file(args.urls_file)
+    if not (args.html or urls):
+        ap.error("URL, --urls-file veya --html gerekli")
+    if args.resume and not args.manifest:
+        ap.error("--resume için --manifest gerekli")
+
+    store = None
+    if args.store:
+        from article_store import ArticleStore
+        store = ArticleStore(args.store)
+
+    if not args.html and len(urls) == 1 and not (args.jsonl or args.manifest):
+        data, raw = scrape_raw(urls[0])
+        _write_json(args.out, data)
+        if store is not None: store.upsert(data, raw=raw, heuristics_version=HEURISTICS_VERSION)
+        print(f"JSON yazıldı: {args.out}")
+        sys.exit(0)
+
+    manifest = Manifest(args.manifest) if args.manifest else None
+    writer = JsonlWriter(args.jsonl, flush_every=args.flush_every) if args.jsonl else None
+    try:
+        if args.html:
+            run_corpus(args.html, args.out_dir, args.workers, writer=writer,
+                       manifest=manifest, resume=args.resume, store=store)
+        else:
+            stats = run_urls(urls, args.out_dir, writer=writer, manifest=manifest,
+                             resume=args.resume, store=store)
+            print(f"Bitti: {stats['ok']} başarılı, {stats['failed']} hatalı", file=sys.stderr)
+    finally:
+        if writer is not None:
+            writer.close()
+            if args.jsonl != "-":
+                print(f"JSONL yazıldı: {args.jsonl} ({writer.count} kayıt)", file=sys.stderr)
+        if manifest is not None:
+            print(f"Manifest: {manifest.summary()}", file=sys.stderr)
+            manifest.close()
@@ -0,0 +1,81 @@
+# jsonl.py
+# JSON Lines okuma/yazma yardımcıları. orjson kuruluysa onu, değilse stdlib json'u kullanır.
+#
+#   with JsonlWriter("va.jsonl") as w:      # "-" -> stdout
+#       w.write({"url": ..., "title": ..., "va": ...})
+
+import sys, json
+from typing import Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # opsiyonel hızlı serializer
+    orjson = None
+
+def dumps_line(obj) -> bytes:
+    """Tek satırlık JSON (sonunda \\n) döndürür."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def loads_line(line):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+class JsonlWriter:
+    """
+    Kayıtları üretildikleri anda JSONL dosyasına (ya da "-" ile stdout'a) ekler.
+    `flush_every` kayıtta bir tampon boşaltılır; bellekte en fazla bu kadar kayıt tutulur.
+    """
+
+    def __init__(self, path: str = "-", flush_every: int = 50):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._buf = []
+        if path == "-":
+            self._fh, self._owned = sys.stdout.buffer, False
+        else:
+            self._fh, self._owned = open(path, "ab"), True
+
+    def write(self, obj):
+        self._buf.append(dumps_line(obj))
+        self.count += 1
+        if len(self._buf) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._fh.write(b"".join(self._buf))
+            self._buf.clear()
+        self._fh.flush()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._owned:
+                self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_jsonl(path: str = "-", limit: Optional[int] = None) -> Iterator[dict]:
+    """JSONL dosyasını (veya "-" ile stdin'i) satır satır okur; boş satırları atlar."""
+    fh = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        n = 0
+        for line in fh:
+            if not line.strip():
+                continue
+            yield loads_line(line)
+            n += 1
+            if limit is not None and n >= limit:
+                break
+    finally:
+        if fh is not sys.stdin.buffer:
+            fh.close()
@@ -0,0 +1,205 @@
+# key_numbers.py
+# Bulgular metninden tipli sayısal kayıtlar çıkarır: etki ölçüsü (OR/RR/HR/MD/...),
+# nokta tahmini, güven aralığı, p-değeri, örneklem büyüklüğü ve yüzdeler.
+#
+# Tek bir derlenmiş tarayıcı (alternation regex) metni bir kez soldan sağa tarar;
+# eşleşmeler sırayla işlenip son etki ölçüsüne CI / p-değeri bağlanır.
+#
+#   python key_numbers.py va.jsonl > key_numbers.jsonl
+#   python key_numbers.py va.jsonl --workers 8 --field results
+
+import os, re, sys, argparse, threading
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+_NUM = r"[-+]?\d+(?:\.\d+)?"
+_CI_SEP = r"\s*(?:to|–|—|-|,)\s*"
+
+# Etiket -> standart kısaltma. Kısaltmalar büyük/küçük harfe duyarlı eşleşir ("or",
+# "md" düzyazıda sıradan kelimedir); açık adlar duyarsız.
+ABBREVIATIONS = {
+    "OR": "OR", "aOR": "OR", "RR": "RR", "aRR": "RR", "IRR": "IRR",
+    "HR": "HR", "aHR": "HR", "MD": "MD", "RD": "RD",
+}
+NAMES = {
+    "odds ratio": "OR", "adjusted odds ratio": "OR",
+    "relative risk": "RR", "risk ratio": "RR", "rate ratio": "RR",
+    "incidence rate ratio": "IRR",
+    "hazard ratio": "HR", "adjusted hazard ratio": "HR",
+    "mean difference": "MD", "mean change": "MD",
+    "risk difference": "RD", "absolute difference": "RD",
+    # yalnızca JAMA'nın "difference, 3.2" biçiminde (etiket + , = : + sayı) etki olarak alınır
+    "difference": "MD",
+}
+MEASURES = dict(ABBREVIATIONS, **NAMES)
+_RATIOS = {"OR", "RR", "IRR", "HR"}
+
+def _alt(words) -> str:
+    return "|".join(sorted((re.escape(w) for w in words), key=len, reverse=True))
+
+_LABELS = rf"(?-i:{_alt(ABBREVIATIONS)})|{_alt(k for k in NAMES if k != 'difference')}"
+_EFFECT_LABELS = rf"{_LABELS}|difference(?=\s*[,:=])"
+
+def _measure(label: str) -> str:
+    return ABBREVIATIONS.get(label) or NAMES.get(label.lower(), "")
+
+# Alternatifler aynı konumda soldan sağa denenir: sıralama önemlidir
+# (ör. "95% CI" yüzde olarak değil CI olarak yakalanmalı).
+_SCANNER = re.compile(
+    # 1) Etiket + sayı: "OR, 0.84", "HR 0.72", "aOR = 1.9", "difference, 3.2";
+    #    "absolute difference, -2.8%" yüzde puanı birimli tahmindir
+    rf"(?P<effect>\b(?P<measure>{_EFFECT_LABELS})\b[\s,:=]*(?P<est>{_NUM})(?P<est_pct>\s*%)?)"
+    # 2) CI: "(95% CI, 0.41-1.70)", "95% CI: -10.1 to 16.5", "CI (95%): 1.2–3.4";
+    #    önünde bir değer varsa ("3.2 m (95% CI ...") nokta tahmini olarak alınır
+    rf"|(?P<ci>(?:(?P<pre>{_NUM})\s*(?P<pre_unit>%|[A-Za-z]{{1,12}})?\s*[(\[]\s*)?"
+    rf"(?:(?P<lvl>\d{{2}}(?:\.\d)?)\s*%\s*CI|CI\s*\(?(?P<lvl2>\d{{2}}(?:\.\d)?)\s*%\)?)"
+    rf"\s*[,:]?\s*(?P<lo>{_NUM})%?{_CI_SEP}(?P<hi>{_NUM})%?)"
+    # 3) p-değeri: "P = .63", "p<0.001", "P ≤ .05"
+    r"|(?P<p>\bP\s*(?P<pop>[<=>≤≥])\s*(?P<pval>0?\.\d+|[01](?:\.\d+)?)\b)"
+    # 4) örneklem: "n = 266", "N=1,204", "a total of 266 adults", "among 4,512 participants"
+    r"|(?P<n>\b[nN]\s*=\s*(?P<nval>\d[\d,]*)"
+    r"|\b(?:total of|of|among|including|included|enrolled)\s+(?P<nval2>\d[\d,]*)\s+"
+    r"(?:participants|patients|adults|children|individuals|women|men|persons|people|infants|adolescents|veterans|residents))"
+    # 5) yüzde: "12%", "45.3 %"
+    rf"|(?P<pct>(?P<pctval>\d+(?:\.\d+)?)\s?%)"
+    # 6) etiket tek başına ("mean difference in walk distance was 3.2 m (95% CI ...)")
+    rf"|(?P<label>\b(?P<label_m>{_LABELS})\b)"
+    # 7) cümle sonu: bekleyen etiketi ve son etkiyi düşürür
+    r"|(?P<eos>\.\s+(?=[A-Z]))",
+    flags=re.I,
+)
+
+@dataclass(slots=True)
+class EffectSize:
+    measure: str = ""
+    estimate: Optional[float] = None
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+    ci_level: Optional[float] = None
+    p_value: Optional[float] = None
+    p_operator: str = ""
+    text: str = ""
+    unit: str = ""      # "%" = yüzde puanı (RD/MD); oranlar birimsiz
+
+    def to_dict(self) -> dict:
+        return {"measure": self.measure, "estimate": self.estimate, "ci_low": self.ci_low,
+                "ci_high": self.ci_high, "ci_level": self.ci_level, "p_value": self.p_value,
+                "p_operator": self.p_operator, "text": self.text, "unit": self.unit}
+
+@dataclass(slots=True)
+class KeyNumbers:
+    effects: List[EffectSize] = field(default_factory=list)
+    p_values: List[float] = field(default_factory=list)
+    n: List[int] = field(default_factory=list)
+    percentages: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"effects": [e.to_dict() for e in self.effects], "p_values": self.p_values,
+                "n": self.n, "percentages": self.percentages}
+
+def _f(s: Optional[str]) -> Optional[float]:
+    return float(s) if s is not None else None
+
+def parse_key_numbers(text: str) -> KeyNumbers:
+    """Metni tek geçişte tarar ve tipli KeyNumbers döndürür."""
+    out = KeyNumbers()
+    if not text:
+        return out
+    text = text.replace("−", "-")
+    last: Optional[EffectSize] = None   # CI/p bağlanabilecek son etki
+    pending_label = ""                  # sayısız görülen etiket ("mean difference ... was")
+    for m in _SCANNER.finditer(text):
+        kind = m.lastgroup  # en son kapanan grup: her zaman dıştaki alternatif
+        if kind == "effect":
+            measure, est = _measure(m.group("measure")), float(m.group("est"))
+            if m.group("est_pct") and measure in _RATIOS:
+                # "% " birimli oran olmaz ("HR 45%"): yalnızca yüzde
+                out.percentages.append(abs(est))
+                continue
+            last = EffectSize(measure, est, text=m.group(0), unit="%" if m.group("est_pct") else "")
+            out.effects.append(last)
+            pending_label = ""
+        elif kind == "ci":
+            lvl = _f(m.group("lvl") or m.group("lvl2"))
+            lo, hi = float(m.group("lo")), float(m.group("hi"))
+            if m.group("pre") is None and last is not None and last.ci_low is None:
+                last.ci_low, last.ci_high, last.ci_level = lo, hi, lvl
+                last.text += " " + m.group(0)
+            else:
+                last = EffectSize(_measure(pending_label) if pending_label else "", _f(m.group("pre")), lo, hi, lvl,
+                                  text=m.group(0))
+                out.effects.append(last)
+                pending_label = ""
+                if m.group("pre_unit") == "%":
+                    out.percentages.append(float(m.group("pre")))
+        elif kind == "p":
+            pv = float(m.group("pval"))
+            out.p_values.append(pv)
+            if last is not None and last.p_value is None:
+                last.p_value, last.p_operator = pv, m.group("pop").replace("≤", "<=").replace("≥", ">=")
+        elif kind == "n":
+            out.n.append(int((m.group("nval") or m.group("nval2")).replace(",", "")))
+        elif kind == "pct":
+            out.percentages.append(float(m.group("pctval")))
+        elif kind == "label":
+            pending_label = m.group("label_m")
+        elif kind == "eos":
+            pending_label, last = "", None
+    return out
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Çağrılar arasında paylaşılan süreç havuzu; süreç sayısı değişirse yeniden açılır."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+        return _pool
+
+def parse_many(texts: Iterable[str], workers: Optional[int] = None, chunksize: int = 64) -> List[KeyNumbers]:
+    """
+    Birçok metni işler; workers > 1 ise paylaşılan süreç havuzunda parçalar halinde
+    (havuz ilk çağrıda açılır, sonraki partiler aynı süreçleri kullanır).
+    """
+    texts = list(texts)
+    if not workers or workers <= 1 or len(texts) < chunksize:
+        return [parse_key_numbers(t) for t in texts]
+    return list(_get_pool(workers).map(parse_key_numbers, texts, chunksize=chunksize))
+
+def _record_text(rec: dict, fld: str) -> str:
+    fd = ((rec.get("va") or {}).get("findings") or {})
+    if fld == "summary":
+        return fd.get("summary", "") or ""
+    return (rec.get(fld) or fd.get(fld) or "")
+
+# -------------------- cli --------------------
+if __name__ == "__main__":
+    from jsonl import iter_jsonl, JsonlWriter
+    ap = argparse.ArgumentParser(description="VA JSONL kayıtlarından tipli etki büyüklüğü kayıtları üretir.")
+    ap.add_argument("jsonl", help="Girdi JSONL ('-' = stdin)")
+    ap.add_argument("-o", "--out", default="-", help="Çıktı JSONL ('-' = stdout)")
+    ap.add_argument("--field", default="summary", help="Ayrıştırılacak alan (varsayılan: findings.summary)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="Süreç sayısı")
+    ap.add_argument("--batch", type=int, default=2000, help="Bellekte tutulacak kayıt sayısı")
+    args = ap.parse_args()
+
+    def _flush(batch, w):
+        parsed = parse_many([_record_text(r, args.field) for r in batch], workers=args.workers)
+        for rec, kn in zip(batch, parsed):
+            w.write({"url": rec.get("url", ""), "key_numbers": kn.to_dict()})
+
+    with JsonlWriter(args.out) as w:
+        batch = []
+        for rec in iter_jsonl(args.jsonl):
+            batch.append(rec)
+            if len(batch) >= args.batch:
+                _flush(batch, w); batch = []
+        if batch:
+            _flush(batch, w)
+    print(f"{w.count} kayıt işlendi", file=sys.stderr)
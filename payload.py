@@ -0,0 +1,139 @@
+# payload.py
+# MCP yanıtlarını küçültmek için kayıt projeksiyonu, kısaltma ve içerik özetleri.
+#   resolve_fields(fields)      - alan girdilerini kayıt şemasına göre doğrular, tam yollara çevirir
+#   project(record, fields)     - yalnızca istenen alanlar (nokta yolu ya da tekil yaprak adı)
+#   compact(record, max_chars)  - uzun metinleri kelime sınırında kısaltır, boş alanları atar
+#   record_hash(record)         - {title, va} özeti; istemci tarafı önbellek referansı
+#   changed_fields(old, new)    - yalnızca değişen yapraklar {yol: yeni değer}
+#
+#   COMPACT_MAX_CHARS (varsayılan: 160)
+
+import os, json, hashlib
+from typing import Dict, Iterable, List, Optional
+
+COMPACT_MAX_CHARS = int(os.environ.get("COMPACT_MAX_CHARS", "160"))
+
+def content_of(record: Dict) -> Dict:
+    """Değişiklik karşılaştırmasına giren alanlar (URL ve depo meta verisi hariç)."""
+    return {"title": record.get("title", ""), "va": record.get("va") or {}}
+
+def record_hash(record: Dict) -> str:
+    """content_of() üzerinden kararlı sha256 özeti (watch tablosundaki record_hash ile aynı)."""
+    data = json.dumps(content_of(record), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def diff_paths(old, new, prefix: str = "") -> List[str]:
+    """İki kaydın farklı olan yaprak alanları ("va.the_study.participants" gibi)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        out = []
+        for k in sorted(set(old) | set(new)):
+            out += diff_paths(old.get(k), new.get(k), f"{prefix}.{k}" if prefix else k)
+        return out
+    return [] if old == new else [prefix or "."]
+
+def _get(record, path: str):
+    node = record
+    for part in path.split("."):
+        if not isinstance(node, dict) or part not in node:
+            raise KeyError(path)
+        node = node[part]
+    return node
+
+def _put(out: Dict, path: str, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        out = out.setdefault(part, {})
+    out[parts[-1]] = value
+
+def _leaves(record, prefix: str = "") -> Iterable[str]:
+    for k, v in record.items():
+        path = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            yield from _leaves(v, path)
+        else:
+            yield path
+
+def resolve_field(record: Dict, field: str) -> str:
+    """
+    "va.the_study.primary_outcome" olduğu gibi; "primary_outcome" gibi kısa ad kayıtta
+    tek bir yaprağa karşılık geliyorsa o yola çevrilir.
+    """
+    try:
+        _get(record, field)
+        return field
+    except KeyError:
+        pass
+    matches = [p for p in _leaves(record) if p.rsplit(".", 1)[-1] == field]
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise ValueError(f"Belirsiz alan: {field} ({', '.join(matches)})")
+    raise ValueError(f"Bilinmeyen alan: {field}")
+
+def record_schema() -> Dict:
+    """Tel formatındaki tüm alanlar boş değerlerle (isteğe bağlı doi ve research_in_context dahil)."""
+    from va_records import VA, VARecord, ResearchInContext
+    return VARecord(doi="-", va=VA(research_in_context=ResearchInContext())).to_dict()
+
+def resolve_fields(fields: Optional[List[str]]) -> List[str]:
+    """
+    `fields` girdilerini kayıt şemasına göre tam yollara çevirir (sayfa çekilmeden önce
+    doğrulama için). Bilinmeyen ya da belirsiz girdilerin hepsi tek ValueError'da raporlanır.
+    """
+    schema = record_schema()
+    paths, errors = [], []
+    for f in fields or []:
+        try:
+            paths.append(resolve_field(schema, f))
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        raise ValueError("; ".join(errors))
+    return list(dict.fromkeys(paths))
+
+def project(record: Dict, fields: Optional[List[str]]) -> Dict:
+    """
+    Kaydın yalnızca `fields` alanlarını iç içe yapıyı koruyarak döndürür; boşsa kaydın tamamı.
+    Şemada olup bu kayıtta bulunmayan alanlar (ör. DOI'siz kayıtta "doi") atlanır.
+    """
+    if not fields:
+        return record
+    out: Dict = {}
+    for path in resolve_fields(fields):
+        try:
+            _put(out, path, _get(record, path))
+        except KeyError:
+            continue
+    return out
+
+def _shorten(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0] or text[:max_chars]
+    return cut.rstrip(" ,;:") + "…"
+
+def compact(value, max_chars: int = 0):
+    """Uzun metinleri `max_chars`'ta (0 -> COMPACT_MAX_CHARS) kısaltır; boş metin/liste/sözlükleri atar."""
+    limit = max_chars or COMPACT_MAX_CHARS
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            v = compact(v, limit)
+            if v not in ("", None, [], {}):
+                out[k] = v
+        return out
+    if isinstance(value, list):
+        return [compact(v, limit) for v in value if v not in ("", None)]
+    if isinstance(value, str):
+        return _shorten(value, limit)
+    return value
+
+def changed_fields(old: Dict, new: Dict) -> Dict[str, object]:
+    """`old`'dan `new`'e değişen yapraklar; silinen alanlar None olarak."""
+    out = {}
+    for path in diff_paths(old, new):
+        try:
+            out[path] = _get(new, path)
+        except KeyError:
+            out[path] = None
+    return out
@@ -0,0 +1,130 @@
+# procs.py
+# Tarayıcı süreç ağacı yardımcıları (/proc tabanlı, ek bağımlılık yok).
+#
+#   tree(pid)            -> pid ve tüm alt süreçleri
+#   rss_bytes(pids)      -> toplam yerleşik bellek (VmRSS)
+#   kill_tree(pid)       -> ağacı SIGKILL ile sonlandırır
+#   kill_pids(pids)      -> listedeki hâlâ yaşayan süreçleri sonlandırır
+#   find_orphans(marker) -> sahipsiz kalmış chromedriver / chrome süreçleri
+#
+# /proc olmayan platformlarda (macOS, Windows) fonksiyonlar boş sonuç döndürür;
+# tarayıcı yaşam döngüsü yine sayfa sayısına göre çalışır.
+
+import os, signal
+from typing import Dict, Iterable, List, Optional
+
+_PROC = "/proc"
+
+def available() -> bool:
+    return os.path.isdir(os.path.join(_PROC, "self"))
+
+def _stat(pid: int) -> Optional[tuple]:
+    # (comm, ppid); comm parantez içinde ve boşluk içerebilir
+    try:
+        with open(f"{_PROC}/{pid}/stat", "rb") as f:
+            data = f.read().decode("utf-8", "replace")
+    except OSError:
+        return None
+    lp, rp = data.find("("), data.rfind(")")
+    fields = data[rp + 2:].split()
+    try:
+        return data[lp + 1:rp], int(fields[1])
+    except (IndexError, ValueError):
+        return None
+
+def _pids() -> List[int]:
+    try:
+        return [int(n) for n in os.listdir(_PROC) if n.isdigit()]
+    except OSError:
+        return []
+
+def _children_map() -> Dict[int, List[int]]:
+    m: Dict[int, List[int]] = {}
+    for pid in _pids():
+        st = _stat(pid)
+        if st:
+            m.setdefault(st[1], []).append(pid)
+    return m
+
+def tree(pid: int) -> List[int]:
+    """`pid` ve tüm alt süreçleri (yaşamıyorsa boş liste)."""
+    if not pid or _stat(pid) is None:
+        return []
+    children = _children_map()
+    out, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        out.append(p)
+        stack.extend(children.get(p, ()))
+    return out
+
+def rss_bytes(pids: Iterable[int]) -> int:
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"{_PROC}/{pid}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+def kill_pids(pids: Iterable[int]) -> int:
+    """Hâlâ yaşayan süreçleri SIGKILL ile öldürür; sinyal gönderilen süreç sayısını döndürür."""
+    killed = 0
+    for p in pids:
+        if _stat(p) is None:
+            continue
+        try:
+            os.kill(p, signal.SIGKILL)
+            killed += 1
+        except OSError:
+            pass
+    return killed
+
+def kill_tree(pid: int) -> int:
+    """Ağacı yapraklardan köke doğru öldürür."""
+    return kill_pids(list(reversed(tree(pid))))
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f"{_PROC}/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+def _owned(pid: int) -> bool:
+    try:
+        return os.stat(f"{_PROC}/{pid}").st_uid == os.getuid()
+    except OSError:
+        return False
+
+def find_orphans(marker: str, exclude: Iterable[int] = ()) -> List[int]:
+    """
+    Sahipsiz tarayıcı süreçleri: ebeveyni init (1) olan ya da ebeveyni artık yaşamayan,
+    bu kullanıcıya ait chromedriver süreçleri ile komut satırında `marker` bulunan chrome
+    süreçleri. `exclude` ağaçlarındaki (canlı sürücüler) süreçler hiçbir zaman dahil edilmez.
+    """
+    if not available():
+        return []
+    keep = set()
+    for pid in exclude:
+        keep.update(tree(pid))
+    me = os.getpid()
+    out = []
+    for pid in _pids():
+        if pid == me or pid in keep:
+            continue
+        st = _stat(pid)
+        if not st:
+            continue
+        comm, ppid = st
+        if ppid != 1 and _stat(ppid) is not None:
+            continue
+        if not _owned(pid):
+            continue
+        if comm.startswith("chromedriver") or (marker in _cmdline(pid) and "chrom" in comm.lower()):
+            out.append(pid)
+    return out
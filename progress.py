@@ -0,0 +1,60 @@
+# progress.py
+# MCP araçları için kısıtlanmış (throttled) ilerleme bildirimleri.
+#
+# `Progress`, FastMCP Context.report_progress üzerine ince bir katmandır: aşama
+# geçişleri her zaman, toplu işlerdeki öğe ilerlemeleri ise en fazla
+# PROGRESS_INTERVAL_SECONDS'ta bir gönderilir (son öğe her zaman gönderilir).
+# İstemci progressToken göndermediyse veya ctx yoksa (doğrudan çağrı) no-op'tur;
+# bildirim hataları aracın sonucunu etkilemez.
+#
+#   PROGRESS_INTERVAL_SECONDS (varsayılan: 0.5)
+
+import os, time, asyncio, logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = float(os.environ.get("PROGRESS_INTERVAL_SECONDS", "0.5"))
+
+class Progress:
+    def __init__(self, ctx, total: float, interval: Optional[float] = None):
+        self.ctx, self.total = ctx, total
+        self.interval = PROGRESS_INTERVAL_SECONDS if interval is None else interval
+        self.done = 0
+        self.stage = ""
+        self.sent = self.suppressed = 0
+        self._last = 0.0
+
+    async def _send(self, message: str, force: bool):
+        if self.ctx is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            self.suppressed += 1
+            return
+        self._last = now
+        try:
+            await self.ctx.report_progress(self.done, self.total, message)
+            self.sent += 1
+        except Exception as e:
+            logger.debug(f"Progress notification failed: {e}")
+
+    async def stage_start(self, stage: str, message: str = ""):
+        """Yeni aşama (ör. "fetch", "render"); aşama geçişleri kısıtlanmaz."""
+        self.stage = stage
+        await self._send(f"{stage}: {message}" if message else stage, force=True)
+
+    async def advance(self, n: int = 1, partial: str = ""):
+        """`n` öğe tamamlandı; `partial` son tamamlanan öğenin kısa özeti (başlık, yol, hata)."""
+        self.done = min(self.done + n, self.total)
+        msg = f"{self.stage} {self.done:g}/{self.total:g}" if self.stage else f"{self.done:g}/{self.total:g}"
+        if partial:
+            msg += f" - {partial}"
+        await self._send(msg, force=self.done >= self.total)
+
+    def threadsafe_stage(self, loop: "asyncio.AbstractEventLoop"):
+        """Havuz iş parçacığından çağrılabilen `on_stage(stage)` geri çağrısı döndürür."""
+        def on_stage(stage: str, message: str = ""):
+            if self.ctx is not None:
+                asyncio.run_coroutine_threadsafe(self.stage_start(stage, message), loop)
+        return on_stage
@@ -0,0 +1,195 @@
+# retention.py
+# OUTPUT_DIR (outputs/) için boyut / yaş / dosya sayısı sınırlı saklama yöneticisi.
+#
+# Arka plandaki süpürme (sweep) önce OUTPUT_MAX_AGE_HOURS'tan eski dosyaları,
+# ardından toplam boyut veya dosya sayısı sınırı aşıldığı sürece en uzun süredir
+# kullanılmayan dosyaları siler. O anda render edilen, sunulan veya GitHub'a
+# yüklenen dosyalar `pin()` ile işaretlenir ve hiçbir koşulda silinmez.
+# Çok işçili HTTP dağıtımında pinler, son kullanım zamanları ve kullanım özeti
+# workers.SharedRetention ile süreçler arası paylaşılır (her işçi aynı sayıları raporlar,
+# LRU sırası tüm işçilerdeki kullanımı görür); süpürme yalnızca "retention" liderliğini
+# alan işçide çalışır.
+#
+#   OUTPUT_MAX_MB           (varsayılan: 1024; 0 = sınırsız)
+#   OUTPUT_MAX_FILES        (varsayılan: 2000; 0 = sınırsız)
+#   OUTPUT_MAX_AGE_HOURS    (varsayılan: 168; 0 = sınırsız)
+#   OUTPUT_SWEEP_SECONDS    (varsayılan: 300)
+
+import os, time, logging, threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class RetentionManager:
+    def __init__(self, root: str, max_bytes: int = 0, max_files: int = 0, max_age: float = 0,
+                 interval: float = 300, shared=None):
+        self.root, self.max_bytes, self.max_files, self.max_age = root, max_bytes, max_files, max_age
+        self.interval = interval
+        self.shared = shared                   # workers.SharedRetention | None
+        self._lock = threading.Lock()
+        self._pins: Dict[str, int] = {}        # abspath -> referans sayısı
+        self._last_use: Dict[str, float] = {}  # abspath -> son kullanım (mtime'dan yeni ise)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._usage = {"files": 0, "bytes": 0}
+        self.evicted_files = self.evicted_bytes = self.sweeps = 0
+        self.last_sweep: Optional[float] = None
+
+    # ---- kullanım işaretleri ----
+    @contextmanager
+    def pin(self, path: str):
+        """Blok süresince `path` silinmez; çıkışta son kullanım zamanı güncellenir."""
+        key = os.path.abspath(path)
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        if self.shared is not None:
+            self.shared.acquire(key)
+        try:
+            yield path
+        finally:
+            now = time.time()
+            if self.shared is not None:
+                self.shared.release(key)
+                self.shared.touch(key, now)
+            with self._lock:
+                n = self._pins.pop(key) - 1
+                if n: self._pins[key] = n
+                self._last_use[key] = now
+
+    def touch(self, path: str):
+        key, now = os.path.abspath(path), time.time()
+        if self.shared is not None:
+            self.shared.touch(key, now)
+        with self._lock:
+            self._last_use[key] = now
+
+    # ---- süpürme ----
+    def _scan(self, shared_last_use=None):
+        with self._lock:
+            last_use = dict(self._last_use)
+        for p, used in (shared_last_use or {}).items():
+            last_use[p] = max(used, last_use.get(p, 0.0))
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.startswith("."):
+                    continue
+                p = os.path.abspath(os.path.join(dirpath, name))
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                files.append((max(st.st_mtime, last_use.get(p, 0.0)), st.st_size, p))
+        return files
+
+    def _remove(self, p: str, size: int) -> bool:
+        # kilit altında çağrılır: pin kontrolü ile silme arasında yarış olmaz; diğer işçilerin
+        # pinleri silmeyle aynı SQLite yazma işleminde kontrol edilir
+        if p in self._pins:
+            return False
+        if self.shared is not None:
+            if not self.shared.unlink_unless_pinned(p):
+                return False
+        else:
+            try:
+                os.unlink(p)
+            except OSError:
+                return False
+        self._last_use.pop(p, None)
+        self.evicted_files += 1
+        self.evicted_bytes += size
+        return True
+
+    def sweep(self) -> dict:
+        """Bir süpürme turu; silinen dosya sayısı ve boyutunu döndürür."""
+        if not os.path.isdir(self.root):
+            return {"removed_files": 0, "removed_bytes": 0}
+        shared_last_use = self.shared.last_used() if self.shared is not None else {}
+        files = sorted(self._scan(shared_last_use))   # en eski kullanım başta; tarama kilit dışında
+        with self._lock:
+            total = sum(f[1] for f in files)
+            count = len(files)
+            removed = removed_bytes = 0
+            now = time.time()
+            kept = []
+            for used, size, p in files:
+                expired = self.max_age and now - used > self.max_age
+                over = (self.max_bytes and total > self.max_bytes) or (self.max_files and count > self.max_files)
+                if (expired or over) and self._remove(p, size):
+                    total -= size; count -= 1
+                    removed += 1; removed_bytes += size
+                else:
+                    kept.append(p)
+            # artık var olmayan dosyaların kullanım kayıtlarını temizle
+            live = set(kept) | set(self._pins)
+            for p in [p for p in self._last_use if p not in live]:
+                del self._last_use[p]
+            self._usage = {"files": count, "bytes": total}
+            self.sweeps += 1
+            self.last_sweep = now
+        if self.shared is not None:
+            self.shared.forget([p for p in shared_last_use if p not in live])
+            self.shared.record_sweep(count, total, removed, removed_bytes, now)
+        if removed:
+            logger.info(f"Retention sweep removed {removed} files ({removed_bytes} bytes) from {self.root}")
+        return {"removed_files": removed, "removed_bytes": removed_bytes}
+
+    def _run(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Retention sweep failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        """Arka plan süpürme iş parçacığını başlatır (ilk tur hemen çalışır)."""
+        from workers import leader
+        if self._thread is None and leader("retention"):
+            self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        limits = {"max_bytes": self.max_bytes, "max_files": self.max_files, "max_age_seconds": self.max_age}
+        if self.shared is not None:
+            # tüm işçilerde aynı: son süpürmenin (lider işçi) özeti ve canlı pinler
+            return dict(self.shared.usage(), root=self.root, pinned=self.shared.pinned_count(), limits=limits)
+        with self._lock:
+            return {
+                "root": self.root,
+                "files": self._usage["files"],
+                "bytes": self._usage["bytes"],
+                "pinned": len(self._pins),
+                "limits": limits,
+                "evicted_files": self.evicted_files,
+                "evicted_bytes": self.evicted_bytes,
+                "sweeps": self.sweeps,
+                "last_sweep": self.last_sweep,
+            }
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_retention() -> RetentionManager:
+    """OUTPUT_DIR için ortam değişkenlerinden yapılandırılan süreç genelinde tek yönetici."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                from workers import SharedRetention, shared_dir, worker_count
+                shared = SharedRetention(os.path.join(shared_dir(), "retention.sqlite3")) if worker_count() > 1 else None
+                _manager = RetentionManager(
+                    os.environ.get("OUTPUT_DIR", "outputs"),
+                    max_bytes=int(float(os.environ.get("OUTPUT_MAX_MB", "1024")) * 1024 * 1024),
+                    max_files=int(os.environ.get("OUTPUT_MAX_FILES", "2000")),
+                    max_age=float(os.environ.get("OUTPUT_MAX_AGE_HOURS", "168")) * 3600,
+                    interval=float(os.environ.get("OUTPUT_SWEEP_SECONDS", "300")),
+                    shared=shared,
+                )
+    return _manager
@@ -1,7 +1,23 @@
 import asyncio
-from mcp.server.fastmcp import FastMCP
-from app import scrape_url, render_to_pptx, upload_to_github_release
+from mcp.server.fastmcp import Context, FastMCP
+from app import (fetch_url, parse_html, render_to_pptx, render_texts_to_pptx, slide_texts, template_output_path,
+                 lookup_artifact, store_artifact, upload_to_github_release)
+import app
+from extraction import DEFAULT_ISSUE_TYPES, extract_issue_links
+from article_store import get_store
+from retention import get_retention
+from watch import get_watcher
+from template_registry import default_template, get_registry
+import payload
+from contextlib import ExitStack
+import executors
+import workers
+from executors import Busy, run_io, run_cpu
+from progress import Progress
+from deadline import Deadline, DeadlineExceeded, guard
 import os
+import sys
+import time
 import logging
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -11,19 +27,94 @@ import json
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Readiness / warm-up durumu
+READY = threading.Event()
+METRICS = {
+    "warmup_enabled": False,
+    "warmup_duration_seconds": None,
+    "warmup_steps": {},
+}
+
+def _env_flag(name: str, default: str = "0") -> bool:
+    return os.environ.get(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+def warmup():
+    """
+    Kurulum maliyetlerini ilk kullanıcı isteği yerine açılışta öder:
+    PPTX şablonunu önbelleğe alır, çıkarım desenlerini derler, jamanetwork.com ve
+    api.github.com için HTTP havuzunu açar, CPU süreç havuzunu başlatır (her süreç
+    bs4/pptx importunu, desenleri ve şablonları başlatıcısında hazırlar), istenirse
+    tarayıcı havuzunu başlatır.
+    Adım hataları loglanır ama hazır olmayı engellemez.
+    """
+    t0 = time.perf_counter()
+    steps = METRICS["warmup_steps"]
+
+    def step(name, fn):
+        s0 = time.perf_counter()
+        try:
+            result = fn()
+            steps[name] = {"ok": True, "seconds": round(time.perf_counter() - s0, 3), "result": result}
+        except Exception as e:
+            steps[name] = {"ok": False, "seconds": round(time.perf_counter() - s0, 3), "error": str(e)}
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+
+    def _templates():
+        # kayıt defterindeki tüm mevcut şablonlar; {ad: bayt}
+        return {e["name"]: app.preload_template(e["path"]) for e in get_registry().describe() if e["exists"]}
+    step("templates", _templates)
+    step("patterns", app.compile_patterns)
+    step("http_pool", app.warm_http_pool)
+    step("cpu_pool", executors.prestart_cpu_pool)
+    browsers = int(os.environ.get("JAMA_WARMUP_BROWSERS", "0"))
+    if browsers > 0:
+        def _browsers():
+            import jama_scraper
+            return jama_scraper.prestart_drivers(browsers)
+        step("browser_pool", _browsers)
+
+    METRICS["warmup_duration_seconds"] = round(time.perf_counter() - t0, 3)
+    logger.info(f"Warm-up completed in {METRICS['warmup_duration_seconds']:.3f}s: "
+                + ", ".join(f"{k}={'ok' if v['ok'] else 'failed'}" for k, v in steps.items()))
+    READY.set()
+
+def health_response(path: str):
+    """/health, /ready, /metrics yanıtı: (durum kodu, gövde); bilinmeyen yol için None."""
+    if path == '/health':
+        return 200, {
+            "status": "healthy",
+            "service": "jama-abstract-generator",
+            "ready": READY.is_set(),
+            "tools": ["scrape_jama_article", "create_powerpoint", "scrape_jama_articles", "search_articles", "crawl_issue",
+                      "watch_article", "unwatch_article", "refresh_watched", "list_templates"],
+            "outputs": get_retention().stats()
+        }
+    if path == '/ready':
+        return (200, {"status": "ready"}) if READY.is_set() else (503, {"status": "warming_up"})
+    if path == '/metrics':
+        from artifact_cache import get_cache
+        # tarayıcı yolu hiç kullanılmadıysa selenium/jama_scraper yüklenmez
+        scraper = sys.modules.get("jama_scraper")
+        return 200, dict(METRICS, ready=READY.is_set(), artifact_cache=get_cache().stats(),
+                         outputs=get_retention().stats(), executors=executors.stats(),
+                         watch=get_watcher().stats(),
+                         browsers=scraper.browser_stats() if scraper else None,
+                         worker={"pid": os.getpid(), "workers": workers.worker_count(),
+                                 "leader": workers.leaderships()})
+    return None
+
 # Simple HTTP health check server
 class HealthCheckHandler(BaseHTTPRequestHandler):
+    def _send_json(self, code, payload):
+        self.send_response(code)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
     def do_GET(self):
-        if self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "status": "healthy",
-                "service": "jama-abstract-generator",
-                "tools": ["scrape_jama_article", "create_powerpoint"]
-            }
-            self.wfile.write(json.dumps(response).encode())
+        response = health_response(self.path)
+        if response is not None:
+            self._send_json(*response)
         else:
             self.send_response(404)
             self.end_headers()
@@ -41,21 +132,71 @@ def start_health_server():
 # Create MCP server
 mcp = FastMCP("jama-abstract-generator")
 
+# HTTP modunda sağlık uçları MCP ile aynı kapıdan sunulur (stdio'da kullanılmaz)
+async def _health_route(request):
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import JSONResponse
+    code, payload = await run_in_threadpool(health_response, request.url.path)
+    return JSONResponse(payload, status_code=code)
+
+for _path in ("/health", "/ready", "/metrics"):
+    mcp.custom_route(_path, methods=["GET"])(_health_route)
+
+def _shape(data: dict, fields: list[str] | None, compact_mode: bool) -> dict:
+    """Yanıttaki kayıt: `fields` projeksiyonu, compact ise uzun metinler kısaltılır."""
+    out = payload.project(data, fields)
+    return payload.compact(out) if compact_mode else out
+
 @mcp.tool()
-async def scrape_jama_article(url: str) -> dict:
+async def scrape_jama_article(
+    url: str,
+    fields: list[str] | None = None,
+    compact: bool = False,
+    ctx: Context | None = None
+) -> dict:
     """
     JAMA Network makalesinden veri çeker ve yapılandırılmış formatta döndürür.
+    fields: yalnızca istenen alanlar (ör. ["title", "va.the_study.primary_outcome"]; tekil
+    yaprak adları da olur: ["title", "primary_outcome"]). Bilinmeyen/belirsiz alan sayfa
+    çekilmeden hata döndürür.
+    compact=True: uzun metinler COMPACT_MAX_CHARS'ta kısaltılır, boş alanlar ve result mesajı atılır.
+    Depoya her zaman kaydın tamamı yazılır. Yanıttaki hash, scrape_jama_articles'ta known ile kullanılır.
+    İlerleme bildirimleri: fetch -> parse -> store.
     """
+    try:
+        # alan yazım hataları sayfa çekilmeden reddedilir
+        fields = payload.resolve_fields(fields) if fields else None
+    except ValueError as e:
+        return {"result": f"Hata: {e}", "data": None}
+    progress = Progress(ctx, 3)
     try:
         logger.info(f"Scraping JAMA article: {url}")
-        # Run blocking function in executor
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, scrape_url, url)
+        # Uçtan uca süre bütçesi: iptal/süre aşımında bağlantı kapatılır, havuz yuvası boşalır
+        async with guard(Deadline()) as dl:
+            # Ağ beklemesi IO havuzunda, HTML parse CPU süreç havuzunda
+            await progress.stage_start("fetch", url)
+            html_src = await run_io(fetch_url, url, dl.stage(0.8))
+            await progress.advance(partial=f"{len(html_src)} bytes")
+            await progress.stage_start("parse")
+            data, raw = await run_cpu(parse_html, html_src, url)
+            await progress.advance(partial=data.get("title", ""))
         
         logger.info(f"Successfully scraped data for: {data.get('title', 'Unknown title')}")
+        # Yerel depoya kaydet (hata scrape sonucunu etkilemez)
+        await progress.stage_start("store")
+        try:
+            await run_io(lambda: get_store().upsert(data, raw=raw, heuristics_version=app.HEURISTICS_VERSION))
+        except Exception as e:
+            logger.warning(f"Article store write failed: {e}")
+        await progress.advance()
+        shaped = {"data": _shape(data, fields, compact), "hash": payload.record_hash(data)}
+        return shaped if compact else dict(shaped, result="Veri başarıyla çekildi.")
+    except Busy as e:
+        logger.warning(f"Scrape rejected: {e}")
         return {
-            "result": "Veri başarıyla çekildi.",
-            "data": data
+            "result": f"Meşgul: {e}",
+            "data": None,
+            "busy": True
         }
     except Exception as e:
         logger.error(f"Error scraping article: {str(e)}")
@@ -64,54 +205,101 @@ async def scrape_jama_article(url: str) -> dict:
             "data": None
         }
 
+async def _render_one(data: dict, texts: list, template: str, out_path: str) -> bool:
+    """Tek şablon: önbellekte varsa kopyala, yoksa render et; önbellekten mi döndürür."""
+    key, cached = await run_io(lookup_artifact, data, template, out_path)
+    if not cached:
+        await run_cpu(render_texts_to_pptx, texts, template, out_path)
+        await run_io(store_artifact, key, out_path)
+    return cached
+
 @mcp.tool()
 async def create_powerpoint(
     data: dict,
     output_filename: str = "visual_abstract.pptx",
     github_repo: str | None = None,
-    github_token: str | None = None
+    github_token: str | None = None,
+    templates: list[str] | None = None,
+    ctx: Context | None = None
 ) -> dict:
     """
     Çekilen makale verilerini kullanarak PowerPoint dosyası oluşturur.
-    İsteğe bağlı olarak GitHub release'e yükler.
+    templates: JAMA_TEMPLATE kayıt defterindeki şablon adları (ör. ["wide", "square", "print"]);
+    verilmezse varsayılan şablon. Birden fazla şablon tek geçişte paralel render edilir,
+    çıktılar <ad>-<şablon>.pptx olarak yazılır.
+    İsteğe bağlı olarak ilk çıktıyı GitHub release'e yükler.
+    İlerleme bildirimleri: render -> (upload:repo/cleanup/release/asset).
     """
+    upload = bool(github_repo and github_token)
     try:
         logger.info(f"Creating PowerPoint for: {data.get('title', 'Unknown title')}")
-        loop = asyncio.get_event_loop()
         
         # Template ve output path ayarla
-        template = os.environ.get("JAMA_TEMPLATE", "templates/abstract.pptx")
+        selected = get_registry().resolve(templates)
         out_dir = os.environ.get("OUTPUT_DIR", "outputs")
         os.makedirs(out_dir, exist_ok=True)
         out_path = os.path.join(out_dir, output_filename)
+        outs = [(name, path, template_output_path(out_path, name) if len(selected) > 1 else out_path)
+                for name, path in selected]
+        progress = Progress(ctx, len(outs) + (1 if upload else 0))
+        
+        # Uçtan uca süre bütçesi; render ve yükleme süresince dosyalar saklama süpürmesinden korunur
+        async with guard(Deadline()) as dl:
+            with ExitStack() as pins:
+                for _, _, out in outs:
+                    pins.enter_context(get_retention().pin(out))
+                # PPTX oluştur (aynı veri + şablon daha önce render edildiyse önbellekten);
+                # türetilmiş metinler bir kez hesaplanır, şablonlar CPU havuzunda paralel render edilir
+                await progress.stage_start("render", ", ".join(name for name, _, _ in outs))
+                texts = slide_texts(data)
+
+                async def render(name, template, out):
+                    cached = await _render_one(data, texts, template, out)
+                    await progress.advance(partial=out + (" (cache)" if cached else ""))
+                    return {"template": name, "output_path": out, "cached": cached}
+                rendered = await asyncio.gather(*(render(*o) for o in outs))
+                out_path = rendered[0]["output_path"]
+                cached = all(r["cached"] for r in rendered)
+                logger.info(f"PowerPoint {'served from cache' if cached else 'created'} at: "
+                            + ", ".join(r["output_path"] for r in rendered))
         
-        # PPTX oluştur
-        await loop.run_in_executor(None, render_to_pptx, data, template, out_path)
-        logger.info(f"PowerPoint created at: {out_path}")
+                # GitHub'a yükle (opsiyonel)
+                download_url = ""
+                if upload:
+                    logger.info(f"Uploading to GitHub repo: {github_repo}")
+                    title = data.get("title", "JAMA Abstract")
+                    on_stage = progress.threadsafe_stage(asyncio.get_running_loop())
+                    download_url, err = await run_io(
+                        upload_to_github_release, out_path, title, github_repo, github_token, on_stage, dl
+                    )
+                    await progress.advance(partial=download_url or "")
+                    if not download_url:
+                        logger.warning(f"GitHub upload failed: {err}")
+                        return {
+                            "result": f"PPTX oluşturuldu, fakat GitHub yükleme başarısız: {err}",
+                            "output_path": out_path,
+                            "download_url": "",
+                            "cached": cached,
+                            "outputs": rendered
+                        }
+                    logger.info(f"Successfully uploaded to GitHub: {download_url}")
         
-        # GitHub'a yükle (opsiyonel)
-        download_url = ""
-        if github_repo and github_token:
-            logger.info(f"Uploading to GitHub repo: {github_repo}")
-            title = data.get("title", "JAMA Abstract")
-            download_url, err = await loop.run_in_executor(
-                None, upload_to_github_release, out_path, title, github_repo, github_token
-            )
-            if not download_url:
-                logger.warning(f"GitHub upload failed: {err}")
                 return {
-                    "result": f"PPTX oluşturuldu, fakat GitHub yükleme başarısız: {err}",
+                    "result": "PPTX başarıyla oluşturuldu." + (" GitHub'a yüklendi." if download_url else ""),
                     "output_path": out_path,
-                    "download_url": ""
+                    "download_url": download_url or "",
+                    "cached": cached,
+                    "outputs": rendered
                 }
-            logger.info(f"Successfully uploaded to GitHub: {download_url}")
         
+    except Busy as e:
+        logger.warning(f"PowerPoint rejected: {e}")
         return {
-            "result": "PPTX başarıyla oluşturuldu." + (" GitHub'a yüklendi." if download_url else ""),
-            "output_path": out_path,
-            "download_url": download_url or ""
+            "result": f"Meşgul: {e}",
+            "output_path": "",
+            "download_url": "",
+            "busy": True
         }
-        
     except Exception as e:
         logger.error(f"Error creating PowerPoint: {str(e)}")
         return {
@@ -120,12 +308,401 @@ async def create_powerpoint(
             "download_url": ""
         }
 
+@mcp.tool()
+async def list_templates() -> dict:
+    """JAMA_TEMPLATE kayıt defterindeki şablonlar (create_powerpoint templates parametresi için)."""
+    entries = get_registry().describe()
+    return {"result": f"{len(entries)} şablon kayıtlı.", "templates": entries}
+
+@mcp.tool()
+async def search_articles(query: str, limit: int = 10) -> dict:
+    """
+    Daha önce çekilmiş makaleler arasında (başlık, katılımcılar, müdahale, bulgular)
+    yerel tam metin araması yapar. Ağa çıkmaz.
+    """
+    try:
+        hits = await run_io(lambda: get_store().search(query, limit))
+        return {
+            "result": f"{len(hits)} makale bulundu.",
+            "results": hits
+        }
+    except Busy as e:
+        return {
+            "result": f"Meşgul: {e}",
+            "results": [],
+            "busy": True
+        }
+    except Exception as e:
+        logger.error(f"Error searching articles: {str(e)}")
+        return {
+            "result": f"Hata: {str(e)}",
+            "results": []
+        }
+
+# Sayı tarama: makale başına fetch -> parse -> store -> render, CRAWL_CONCURRENCY ile sınırlı.
+# Toplu iş reddedilmek yerine havuzda CRAWL_QUEUE_WAIT_SECONDS kadar yer bekler.
+CRAWL_CONCURRENCY = int(os.environ.get("CRAWL_CONCURRENCY", "4"))
+CRAWL_DEADLINE_SECONDS = float(os.environ.get("CRAWL_DEADLINE_SECONDS", "1800"))
+CRAWL_QUEUE_WAIT_SECONDS = float(os.environ.get("CRAWL_QUEUE_WAIT_SECONDS", "30"))
+
+def _article_slug(url: str) -> str:
+    tail = url.rstrip("/").rsplit("/", 1)[-1]
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in tail) or "article"
+
+async def _load_article(url: str, dl: Deadline, refresh: bool) -> tuple[dict, str, dict | None]:
+    """
+    Depoda varsa kayıt oradan (refresh=True hariç), yoksa fetch -> parse -> store.
+    (kayıt, "cached" | "scraped", depodaki önceki kayıt)
+    """
+    wait = CRAWL_QUEUE_WAIT_SECONDS
+    previous = await run_io(lambda: get_store().get(url), wait=wait)
+    if previous and not refresh:
+        return previous, "cached", previous
+    html_src = await run_io(fetch_url, url, dl, wait=wait)
+    data, raw = await run_cpu(parse_html, html_src, url, wait=wait)
+    try:
+        await run_io(lambda: get_store().upsert(data, raw=raw, heuristics_version=app.HEURISTICS_VERSION), wait=wait)
+    except Exception as e:
+        logger.warning(f"Article store write failed: {e}")
+    return data, "scraped", previous
+
+async def _crawl_article(item: dict, dl: Deadline, template: str, out_dir: str,
+                         render: bool, refresh: bool) -> dict:
+    url = item["url"]
+    entry = {"url": url, "title": item.get("title", ""), "scrape": "", "render": "", "output_path": ""}
+    wait = CRAWL_QUEUE_WAIT_SECONDS
+    try:
+        data, entry["scrape"], _ = await _load_article(url, dl, refresh)
+        entry["title"] = data.get("title") or entry["title"]
+        if render:
+            out_path = os.path.join(out_dir, f"{_article_slug(url)}.pptx")
+            with get_retention().pin(out_path):
+                key, cached = await run_io(lookup_artifact, data, template, out_path, wait=wait)
+                if not cached:
+                    await run_cpu(render_to_pptx, data, template, out_path, wait=wait)
+                    await run_io(store_artifact, key, out_path, wait=wait)
+            entry["render"] = "cached" if cached else "rendered"
+            entry["output_path"] = out_path
+    except Busy as e:
+        entry["error"] = f"Meşgul: {e}"
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        entry["error"] = str(e)
+    return entry
+
+@mcp.tool()
+async def crawl_issue(
+    issue_url: str,
+    render: bool = True,
+    refresh: bool = False,
+    article_types: list[str] | None = None,
+    limit: int = 0,
+    ctx: Context | None = None
+) -> dict:
+    """
+    JAMA sayı / içindekiler sayfasındaki makaleleri bulur (varsayılan tür: Original
+    Investigation; article_types=[] ise tümü), her birini çeker ve isteğe bağlı olarak
+    PPTX'e render eder. Depoda kayıtlı makaleler yeniden indirilmez (refresh=True hariç),
+    aynı içerik önbellekteki PPTX'ten sunulur. Eşzamanlılık CRAWL_CONCURRENCY ile sınırlıdır.
+    İlerleme bildirimleri: toc -> articles (makale başına).
+    """
+    progress = Progress(ctx, 1)
+    types = DEFAULT_ISSUE_TYPES if article_types is None else tuple(article_types)
+    template = default_template()
+    out_dir = os.environ.get("OUTPUT_DIR", "outputs")
+    os.makedirs(out_dir, exist_ok=True)
+    links, entries = [], []
+    t0 = time.perf_counter()
+    note = ""
+    try:
+        logger.info(f"Crawling JAMA issue: {issue_url}")
+        async with guard(Deadline(CRAWL_DEADLINE_SECONDS)) as dl:
+            await progress.stage_start("toc", issue_url)
+            toc = await run_io(fetch_url, issue_url, dl)
+            links = await run_cpu(extract_issue_links, toc, issue_url, types)
+            if limit and limit > 0:
+                links = links[:limit]
+            progress.total = max(len(links), 1)
+            await progress.stage_start("articles", f"{len(links)} makale")
+
+            sem = asyncio.Semaphore(max(1, CRAWL_CONCURRENCY))
+            async def one(item):
+                async with sem:
+                    return await _crawl_article(item, dl, template, out_dir, render, refresh)
+            tasks = [asyncio.create_task(one(item)) for item in links]
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    entry = await fut
+                    entries.append(entry)
+                    await progress.advance(partial=entry.get("error") or entry["title"])
+            finally:
+                # süre dolduysa / iptal edildiyse kalan makaleler bırakılır
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    except DeadlineExceeded as e:
+        logger.warning(f"Issue crawl stopped: {e}")
+        note = f" Süre doldu, {len(links) - len(entries)} makale işlenmedi."
+    except Busy as e:
+        return {"result": f"Meşgul: {e}", "issue_url": issue_url, "articles": [], "busy": True}
+    except Exception as e:
+        logger.error(f"Error crawling issue: {str(e)}")
+        return {"result": f"Hata: {str(e)}", "issue_url": issue_url, "articles": []}
+
+    # Sonuçlar sayfa sırasıyla
+    order = {item["url"]: i for i, item in enumerate(links)}
+    entries.sort(key=lambda e: order.get(e["url"], 0))
+    count = lambda k, v: sum(1 for e in entries if e.get(k) == v)
+    summary = {
+        "found": len(links),
+        "scraped": count("scrape", "scraped"),
+        "from_store": count("scrape", "cached"),
+        "rendered": count("render", "rendered"),
+        "render_cached": count("render", "cached"),
+        "failed": sum(1 for e in entries if e.get("error")),
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+    logger.info(f"Issue crawl finished: {summary}")
+    return {
+        "result": (f"{summary['found']} makale bulundu: {summary['scraped']} çekildi, "
+                   f"{summary['from_store']} depodan, {summary['rendered']} render edildi, "
+                   f"{summary['render_cached']} önbellekten, {summary['failed']} hata.") + note,
+        "issue_url": issue_url,
+        "summary": summary,
+        "articles": entries
+    }
+
+async def _batch_article(url: str, dl: Deadline, known: str, fields: list[str] | None,
+                         compact_mode: bool, refresh: bool) -> dict:
+    entry = {"url": url}
+    try:
+        data, entry["scrape"], previous = await _load_article(url, dl, refresh)
+        entry["hash"] = digest = payload.record_hash(data)
+        base = None
+        if known and known != digest:
+            # istemcinin sürümü: depodaki önceki kayıt ya da saklı sürüm geçmişinden biri
+            if previous and known == payload.record_hash(previous):
+                base = previous
+            else:
+                base = await run_io(lambda: get_store().version(url, known), wait=CRAWL_QUEUE_WAIT_SECONDS)
+        if known and known == digest:
+            # istemcideki kayıt güncel: yalnızca referans
+            entry["unchanged"] = True
+        elif base is not None:
+            # istemcinin sürümü biliniyor: yalnızca değişen alanlar
+            entry["changed"] = payload.changed_fields(_shape(base, fields, compact_mode),
+                                                      _shape(data, fields, compact_mode))
+        else:
+            entry["data"] = _shape(data, fields, compact_mode)
+    except Busy as e:
+        entry["error"] = f"Meşgul: {e}"
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        entry["error"] = str(e)
+    return entry
+
+@mcp.tool()
+async def scrape_jama_articles(
+    urls: list[str],
+    fields: list[str] | None = None,
+    compact: bool = False,
+    known: dict[str, str] | None = None,
+    refresh: bool = False,
+    ctx: Context | None = None
+) -> dict:
+    """
+    Birden fazla makaleyi tek çağrıda çeker; fields ve compact scrape_jama_article ile aynıdır.
+    Depoda kayıtlı makaleler yeniden indirilmez (refresh=True hariç).
+    known: {url: hash} - istemcinin elindeki kayıtların hash'leri (önceki yanıtlardan).
+    Hash aynıysa yalnızca {"url","hash","unchanged": true}; istemcinin sürümü depodaki sürüm
+    geçmişindeyse (son ARTICLE_VERSIONS) yalnızca değişen alanlar ("changed": {yol: değer});
+    aksi halde "data".
+    Eşzamanlılık CRAWL_CONCURRENCY ile sınırlıdır. İlerleme bildirimleri: articles (makale başına).
+    """
+    known = known or {}
+    try:
+        fields = payload.resolve_fields(fields) if fields else None
+    except ValueError as e:
+        return {"result": f"Hata: {e}", "articles": []}
+    progress = Progress(ctx, max(len(urls), 1))
+    entries = {}
+    t0 = time.perf_counter()
+    note = ""
+    try:
+        async with guard(Deadline(CRAWL_DEADLINE_SECONDS)) as dl:
+            await progress.stage_start("articles", f"{len(urls)} makale")
+            sem = asyncio.Semaphore(max(1, CRAWL_CONCURRENCY))
+            async def one(url):
+                async with sem:
+                    return await _batch_article(url, dl, known.get(url, ""), fields, compact, refresh)
+            tasks = [asyncio.create_task(one(url)) for url in dict.fromkeys(urls)]
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    entry = await fut
+                    entries[entry["url"]] = entry
+                    await progress.advance(partial=entry.get("error") or entry["url"])
+            finally:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    except DeadlineExceeded as e:
+        logger.warning(f"Batch scrape stopped: {e}")
+        note = f" Süre doldu, {len(set(urls)) - len(entries)} makale işlenmedi."
+    except Busy as e:
+        return {"result": f"Meşgul: {e}", "articles": [], "busy": True}
+    except Exception as e:
+        logger.error(f"Error in batch scrape: {str(e)}")
+        return {"result": f"Hata: {str(e)}", "articles": []}
+
+    # İstek sırasıyla
+    articles = [entries[u] for u in dict.fromkeys(urls) if u in entries]
+    summary = {
+        "requested": len(articles),
+        "scraped": sum(1 for e in articles if e.get("scrape") == "scraped"),
+        "from_store": sum(1 for e in articles if e.get("scrape") == "cached"),
+        "unchanged": sum(1 for e in articles if e.get("unchanged")),
+        "changed": sum(1 for e in articles if "changed" in e),
+        "failed": sum(1 for e in articles if e.get("error")),
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+    if compact:
+        for e in articles:
+            e.pop("scrape", None)
+        return dict({"summary": summary, "articles": articles}, **({"note": note.strip()} if note else {}))
+    return {
+        "result": (f"{summary['requested']} makale: {summary['scraped']} çekildi, {summary['from_store']} depodan, "
+                   f"{summary['unchanged']} değişmedi, {summary['changed']} değişti, {summary['failed']} hata.") + note,
+        "summary": summary,
+        "articles": articles
+    }
+
+@mcp.tool()
+async def watch_article(url: str, output_filename: str = "", github_repo: str = "") -> dict:
+    """
+    Makaleyi izlemeye alır: refresh_watched (veya WATCH_INTERVAL_SECONDS) her turda sayfayı
+    koşullu istekle yeniden doğrular; içerik değişirse PPTX yeniden render edilir ve
+    github_repo verildiyse GITHUB_TOKEN ile yüklenir.
+    """
+    try:
+        key = await run_io(lambda: get_watcher().store.track(url, output_filename, github_repo))
+        return {"result": "Makale izlemeye alındı.", "url": key}
+    except Busy as e:
+        return {"result": f"Meşgul: {e}", "url": "", "busy": True}
+    except Exception as e:
+        logger.error(f"Error tracking article: {str(e)}")
+        return {"result": f"Hata: {str(e)}", "url": ""}
+
+@mcp.tool()
+async def unwatch_article(url: str) -> dict:
+    """Makaleyi izleme listesinden çıkarır."""
+    try:
+        removed = await run_io(lambda: get_watcher().store.untrack(url))
+        return {"result": "Makale izlemeden çıkarıldı." if removed else "Makale izlenmiyordu.", "removed": removed}
+    except Busy as e:
+        return {"result": f"Meşgul: {e}", "removed": False, "busy": True}
+    except Exception as e:
+        logger.error(f"Error untracking article: {str(e)}")
+        return {"result": f"Hata: {str(e)}", "removed": False}
+
+@mcp.tool()
+async def refresh_watched(ctx: Context | None = None) -> dict:
+    """
+    İzlenen tüm makaleleri hemen yeniden doğrular (304 / aynı gövde / aynı içerik ise
+    render yok); yalnızca değişenler yeniden render edilir ve yüklenir. Tur özetini döndürür.
+    Tur CRAWL_DEADLINE_SECONDS ile sınırlıdır ve istemci iptal ederse durur; başka bir tur
+    (bu veya başka bir işçide) sürüyorsa beklemeden "zaten çalışıyor" döner.
+    """
+    progress = Progress(ctx, 1)
+    try:
+        async with guard(Deadline(CRAWL_DEADLINE_SECONDS)) as dl:
+            await progress.stage_start("refresh")
+            summary = await run_io(get_watcher().run_once, 0, dl)
+        if summary["status"] == "already_running":
+            return {"result": "Başka bir yenileme turu zaten çalışıyor; sonucu bekleyin.", "summary": None,
+                    "already_running": True}
+        await progress.advance(partial=f"{summary['changed']} değişti")
+        note = f" Süre doldu, {summary['unfinished']} makale kontrol edilmedi." if summary["unfinished"] else ""
+        return {
+            "result": (f"{summary['tracked']} izlenen makale: {summary['changed']} değişti, "
+                       f"{summary['new']} yeni, {summary['not_modified'] + summary['unchanged']} değişmedi, "
+                       f"{summary['error']} hata.") + note,
+            "summary": summary
+        }
+    except DeadlineExceeded as e:
+        logger.warning(f"Watch refresh stopped: {e}")
+        return {"result": "Süre doldu; tamamlanan kontroller kaydedildi, kalanlar sonraki turda denenecek.",
+                "summary": None}
+    except Busy as e:
+        return {"result": f"Meşgul: {e}", "summary": None, "busy": True}
+    except Exception as e:
+        logger.error(f"Error refreshing watched articles: {str(e)}")
+        return {"result": f"Hata: {str(e)}", "summary": None}
+
+def start_background():
+    """Warm-up, saklama süpürmesi ve izleme turu; stdio sürecinde ve her HTTP işçisinde bir kez."""
+    # Warm-up (JAMA_WARMUP=1) arka planda çalışır; /ready bitene kadar 503 döner.
+    if _env_flag("JAMA_WARMUP"):
+        METRICS["warmup_enabled"] = True
+        threading.Thread(target=warmup, name="warmup", daemon=True).start()
+    else:
+        READY.set()
+
+    # outputs/ için boyut/yaş/sayı sınırlı arka plan süpürmesi (çok işçide yalnızca lider işçi)
+    get_retention().start()
+
+    # İzlenen makalelerin periyodik yeniden doğrulaması (WATCH_INTERVAL_SECONDS > 0; çok işçide tek işçi)
+    if get_watcher().start():
+        logger.info(f"Watch mode enabled: every {get_watcher().interval:g}s")
+
+def create_http_app():
+    """
+    Streamable HTTP ASGI uygulaması (uvicorn factory; her işçi süreçte bir kez çağrılır).
+    Oturumsuz (stateless_http): istek hangi işçiye düşerse düşsün bağımsız yanıtlanır;
+    ilerleme bildirimleri aynı yanıtın SSE akışında gönderilir.
+    """
+    mcp.settings.stateless_http = True
+    mcp.settings.streamable_http_path = os.environ.get("MCP_HTTP_PATH", "/mcp")
+    allowed = [h.strip() for h in os.environ.get("MCP_ALLOWED_HOSTS", "").split(",") if h.strip()]
+    if allowed:
+        from mcp.server.transport_security import TransportSecuritySettings
+        mcp.settings.transport_security = TransportSecuritySettings(
+            enable_dns_rebinding_protection=True, allowed_hosts=allowed,
+            allowed_origins=[f"{scheme}://{h}" for h in allowed for scheme in ("http", "https")])
+    elif os.environ.get("MCP_HTTP_HOST", "0.0.0.0") not in ("127.0.0.1", "localhost", "::1"):
+        # dış arayüzde dinlerken Host başlığı kısıtlanmaz (MCP_ALLOWED_HOSTS ile açılır)
+        mcp.settings.transport_security = None
+    start_background()
+    logger.info(f"Streamable HTTP worker {os.getpid()} ready at {mcp.settings.streamable_http_path}")
+    return mcp.streamable_http_app()
+
+def run_http():
+    """MCP_WORKERS işçi süreç tek kapıyı paylaşır; önbellek/depo/kilit durumu SHARED_STATE_DIR ve SQLite'ta."""
+    import uvicorn
+    host = os.environ.get("MCP_HTTP_HOST", "0.0.0.0")
+    port = int(os.environ.get("MCP_HTTP_PORT", os.environ.get("PORT", "8000")))
+    n = workers.worker_count()
+    logger.info(f"Serving streamable HTTP on {host}:{port} with {n} worker(s)")
+    if n > 1:
+        uvicorn.run("server:create_http_app", factory=True, host=host, port=port, workers=n,
+                    log_level="info", timeout_graceful_shutdown=30)
+    else:
+        uvicorn.run(create_http_app(), host=host, port=port, log_level="info")
+
 if __name__ == "__main__":
     logger.info("Starting JAMA Abstract Generator MCP Server...")
-    
+
+    # MCP_TRANSPORT=http: streamable HTTP, sağlık uçları aynı kapıda
+    if workers.http_mode():
+        run_http()
+        sys.exit(0)
+
     # Start health check server in background thread
     health_thread = threading.Thread(target=start_health_server, daemon=True)
     health_thread.start()
+
+    start_background()
     
     # Start MCP server
     mcp.run()
@@ -0,0 +1,97 @@
+# template_registry.py
+# JAMA_TEMPLATE arkasındaki adlandırılmış PPTX şablon kayıt defteri.
+#
+# JAMA_TEMPLATE şu biçimlerden biri olabilir:
+#   templates/abstract.pptx                                  tek şablon (adı: "abstract")
+#   templates/                                               klasördeki tüm *.pptx (adları: dosya adı)
+#   wide=templates/wide.pptx,square=templates/square.pptx    ad=yol listesi (virgül veya ;)
+# İlk şablon varsayılandır. Araçlar şablonu adıyla ya da doğrudan dosya yoluyla seçer;
+# doğrudan yol yalnızca kayıtlı bir şablonsa veya kayıtlı şablonların klasörlerinden
+# birinin içindeyse kabul edilir (istemci sunucudaki rastgele dosyaları okutamaz).
+#
+#   JAMA_TEMPLATE (varsayılan: templates/abstract.pptx)
+
+import os, glob, threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TEMPLATE = "templates/abstract.pptx"
+
+def _name_of(path: str) -> str:
+    return os.path.splitext(os.path.basename(path.rstrip("/\\")))[0] or "default"
+
+def parse_spec(spec: str) -> Dict[str, str]:
+    """JAMA_TEMPLATE değerini {ad: yol} sözlüğüne çevirir (sıra korunur)."""
+    spec = (spec or "").strip() or DEFAULT_TEMPLATE
+    if os.path.isdir(spec):
+        return {_name_of(p): p for p in sorted(glob.glob(os.path.join(spec, "*.pptx")))}
+    entries: Dict[str, str] = {}
+    for part in spec.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, sep, path = part.partition("=")
+        if not sep:
+            name, path = _name_of(part), part
+        entries[name.strip()] = path.strip()
+    return entries
+
+class TemplateRegistry:
+    def __init__(self, entries: Dict[str, str]):
+        self.entries = dict(entries) or {_name_of(DEFAULT_TEMPLATE): DEFAULT_TEMPLATE}
+        self.default = next(iter(self.entries))
+
+    def names(self) -> List[str]:
+        return list(self.entries)
+
+    def _allowed(self, path: str) -> bool:
+        # sembolik bağlar ve ../ çözülerek karşılaştırılır
+        real = os.path.realpath(path)
+        registered = {os.path.realpath(p) for p in self.entries.values()}
+        if real in registered:
+            return True
+        return real.endswith(".pptx") and any(os.path.dirname(real) == os.path.dirname(p) for p in registered)
+
+    def path(self, name_or_path: Optional[str] = None) -> str:
+        """
+        Ad -> yol; boş -> varsayılan. .pptx dosya yolu yalnızca kayıtlı bir şablonsa ya da
+        kayıtlı şablon klasörlerinden birindeyse kabul edilir. Aksi halde ValueError.
+        """
+        if not name_or_path:
+            return self.entries[self.default]
+        if name_or_path in self.entries:
+            return self.entries[name_or_path]
+        if name_or_path.endswith(".pptx") or os.path.sep in name_or_path:
+            if self._allowed(name_or_path):
+                return name_or_path
+            raise ValueError(f"Şablon yolu şablon klasörü dışında: {name_or_path} (kayıtlı: {', '.join(self.entries)})")
+        raise ValueError(f"Bilinmeyen şablon: {name_or_path} (kayıtlı: {', '.join(self.entries)})")
+
+    def resolve(self, names: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+        """[(ad, yol)]; `names` boşsa yalnızca varsayılan şablon. Tekrarlar atılır."""
+        out, seen = [], set()
+        for n in names or [self.default]:
+            path = self.path(n)
+            if path in seen:
+                continue
+            seen.add(path)
+            out.append((n if n in self.entries else _name_of(path), path))
+        return out
+
+    def describe(self) -> List[Dict]:
+        return [{"name": n, "path": p, "exists": os.path.exists(p), "default": n == self.default}
+                for n, p in self.entries.items()]
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> TemplateRegistry:
+    """JAMA_TEMPLATE'ten oluşturulan süreç genelinde tek kayıt defteri."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TemplateRegistry(parse_spec(os.environ.get("JAMA_TEMPLATE", DEFAULT_TEMPLATE)))
+    return _registry
+
+def default_template() -> str:
+    return get_registry().path()
@@ -0,0 +1,114 @@
+# va_records.py
+# Visual Abstract kayıtları için slotted, tipli sınıflar.
+#
+# to_dict() / from_dict() MCP/JSON tel formatındaki iç içe sözlükleri üretir/okur.
+# Önceki {"url","title","va": {"the_study","findings"}} biçimine eklemeler:
+#   va.research_in_context - extraction.derive_va her zaman üretir (alanları boş olabilir);
+#                            eski/LLM kayıtlarında yoksa None kalır ve yazılmaz
+#   doi                    - sayfa meta verisinden; yalnızca doluysa yazılır
+# Sınıflar __slots__ kullandığı için kayıt başına __dict__ maliyeti yoktur;
+# key_numbers tuple olarak tutulur.
+
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+def _text(v) -> str:
+    # LLM çıktılarında alanlar {"subtitle","description"} sözlüğü olabilir.
+    if isinstance(v, dict):
+        return v.get("description", "") or v.get("subtitle", "")
+    return v or ""
+
+@dataclass(slots=True)
+class Study:
+    participants: str = ""
+    intervention: str = ""
+    comparator: str = ""
+    primary_outcome: str = ""
+    settings_locations: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "participants": self.participants,
+            "intervention": self.intervention,
+            "comparator": self.comparator,
+            "primary_outcome": self.primary_outcome,
+            "settings_locations": self.settings_locations,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Optional[dict]) -> "Study":
+        d = d or {}
+        return cls(_text(d.get("participants")), _text(d.get("intervention")),
+                   _text(d.get("comparator")), _text(d.get("primary_outcome")),
+                   _text(d.get("settings_locations")))
+
+@dataclass(slots=True)
+class Findings:
+    summary: str = ""
+    key_numbers: Tuple[str, ...] = ()
+
+    def to_dict(self) -> dict:
+        return {"summary": self.summary, "key_numbers": list(self.key_numbers)}
+
+    @classmethod
+    def from_dict(cls, d: Optional[dict]) -> "Findings":
+        d = d or {}
+        return cls(_text(d.get("summary")), tuple(d.get("key_numbers") or ()))
+
+@dataclass(slots=True)
+class ResearchInContext:
+    before: str = ""
+    added_value: str = ""
+    implications: str = ""
+
+    def to_dict(self) -> dict:
+        return {"before": self.before, "added_value": self.added_value, "implications": self.implications}
+
+    @classmethod
+    def from_dict(cls, d: Optional[dict]) -> "ResearchInContext":
+        d = d or {}
+        return cls(_text(d.get("before")), _text(d.get("added_value")), _text(d.get("implications")))
+
+@dataclass(slots=True)
+class VA:
+    the_study: Study = field(default_factory=Study)
+    findings: Findings = field(default_factory=Findings)
+    # extraction.derive_va her zaman doldurur; bloğu olmayan eski kayıtlarda None ve
+    # to_dict() anahtarı hiç yazmaz.
+    research_in_context: Optional[ResearchInContext] = None
+
+    def to_dict(self) -> dict:
+        out = {"the_study": self.the_study.to_dict(), "findings": self.findings.to_dict()}
+        if self.research_in_context is not None:
+            out["research_in_context"] = self.research_in_context.to_dict()
+        return out
+
+    @classmethod
+    def from_dict(cls, d: Optional[dict]) -> "VA":
+        d = d or {}
+        ric = d.get("research_in_context")
+        return cls(Study.from_dict(d.get("the_study")), Findings.from_dict(d.get("findings")),
+                   ResearchInContext.from_dict(ric) if ric is not None else None)
+
+@dataclass(slots=True)
+class VARecord:
+    """
+    {"url","title","va"} + isteğe bağlı "doi". va.research_in_context extraction çıktısında
+    hep vardır; artifact_cache.artifact_key DOI'yi anahtara katmaz.
+    """
+    url: str = ""
+    title: str = ""
+    va: VA = field(default_factory=VA)
+    # Sayfa meta verisinden (citation_doi / dc.identifier); boşsa to_dict() anahtarı yazmaz.
+    doi: str = ""
+
+    def to_dict(self) -> dict:
+        out = {"url": self.url, "title": self.title, "va": self.va.to_dict()}
+        if self.doi:
+            out["doi"] = self.doi
+        return out
+
+    @classmethod
+    def from_dict(cls, d: Optional[dict]) -> "VARecord":
+        d = d or {}
+        return cls(d.get("url") or "", d.get("title") or "", VA.from_dict(d.get("va")), d.get("doi") or "")
@@ -1,12 +1,16 @@
 # va_to_pptx.py
 # Kullanım:
 #   python va_to_pptx.py --va va.json --in jama_va.pptx --out outputs/va_filled.pptx
+#   python va_to_pptx.py --va-jsonl va.jsonl --in jama_va.pptx --out-dir outputs --manifest render.manifest --resume
 
-import json, argparse, os, re
+import sys, json, argparse, os, re
 from pptx import Presentation
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 
+import autofit
+from va_records import VARecord
+
 # ---------- helpers ----------
 def find_shape_by_name(slide, name):
     if not name: return None
@@ -15,13 +19,17 @@ def find_shape_by_name(slide, name):
             return shp
     return None
 
-def set_text(shape, text, font_size=16, bullet=False, shrink_threshold=700):
+def set_text(shape, text, font_size=16, bullet=False, min_font_size=autofit.MIN_SIZE):
+    """Metni yazar; punto, kutuya sığan en büyük değer olur (en fazla `font_size`)."""
     if shape is None or not getattr(shape, "has_text_frame", False):
         return
     txt = text or ""
-    target_size = Pt(12 if len(txt) > shrink_threshold else font_size)
+    if bullet:
+        txt = "\n".join(ln for ln in txt.splitlines() if ln.strip())
+    target_size = Pt(autofit.fit_shape(shape, txt, font_size, min_font_size, autofit.shape_font(shape)))
     tf = shape.text_frame
     tf.clear()
+    tf.word_wrap = True
     if not bullet:
         p = tf.paragraphs[0]
         run = p.add_run(); run.text = txt
@@ -59,39 +67,46 @@ def pick(dct, key, sub=None):
         return v.get("description","") or v.get("subtitle","")
     return v or ""
 
-# ---------- main ----------
-def main(va_path, in_pptx, out_pptx):
-    with open(va_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+# LLM çıktısındaki {"subtitle","description"} alt alanı; düz metin alanlarda "".
+def llm_part(dct, key, sub):
+    v = (dct or {}).get(key)
+    return v.get(sub, "") if isinstance(v, dict) else ""
 
-    va = data.get("va", {})
-    ts = va.get("the_study", {})
-    fd = va.get("findings", {})
+# ---------- main ----------
+def render(data, in_pptx, out_pptx):
+    """`data` bir VARecord ya da VA JSON sözlüğü olabilir."""
+    if isinstance(data, VARecord):
+        rec, raw_ts, raw_fd = data, {}, {}
+    else:
+        rec = VARecord.from_dict(data)
+        raw_va = data.get("va") or {}
+        raw_ts, raw_fd = raw_va.get("the_study") or {}, raw_va.get("findings") or {}
+    ts = rec.va.the_study
 
-    title = data.get("title","")
-    url   = data.get("url","")
+    title = rec.title
+    url   = rec.url
 
     # Population
-    pop_subtitle = pick(ts, "participants", "subtitle") or first_sentence(pick(ts,"participants"))
-    pop_desc     = pick(ts, "participants", "description") or pick(ts,"participants")
+    pop_subtitle = llm_part(raw_ts, "participants", "subtitle") or first_sentence(ts.participants)
+    pop_desc     = ts.participants
 
     # Intervention
-    comparator   = pick(ts, "comparator")
-    inter_sub    = pick(ts, "intervention", "subtitle") or (f"Intervention vs {comparator}" if comparator else first_sentence(pick(ts,"intervention")))
-    inter_desc   = pick(ts, "intervention", "description") or pick(ts,"intervention")
+    comparator   = ts.comparator
+    inter_sub    = llm_part(raw_ts, "intervention", "subtitle") or (f"Intervention vs {comparator}" if comparator else first_sentence(ts.intervention))
+    inter_desc   = ts.intervention
 
     # Settings / Locations
-    settings_desc = pick(ts, "settings_locations", "description") or pick(ts, "settings_locations")
+    settings_desc = ts.settings_locations
 
     # Primary Outcome
-    primary_desc  = pick(ts, "primary_outcome", "description") or pick(ts, "primary_outcome")
+    primary_desc  = ts.primary_outcome
 
     # Findings
     # Eğer LLM çıktısı varsa (description_1/2) onu kullan; yoksa summary'den üret.
-    f1 = pick(fd, "description_1")
-    f2 = pick(fd, "description_2")
+    f1 = pick(raw_fd, "description_1")
+    f2 = pick(raw_fd, "description_2")
     if not (f1 or f2):
-        summary = pick(fd, "summary")
+        summary = rec.va.findings.summary
         f1 = first_sentence(summary)
         f2 = rest_sentences(summary)
 
@@ -115,12 +130,58 @@ def main(va_path, in_pptx, out_pptx):
 
     ensure_dir(out_pptx)
     prs.save(out_pptx)
+    return out_pptx
+
+def main(va_path, in_pptx, out_pptx):
+    with open(va_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    render(data, in_pptx, out_pptx)
     print(f"OK -> {out_pptx}")
 
+def main_batch(jsonl_path, in_pptx, out_dir, manifest_path=None, resume=False):
+    """
+    JSONL'deki her VA kaydını `out_dir` altına ayrı PPTX olarak basar.
+    Manifest verilirse kayıt (url) başına durum/çıktı tutulur; `resume` ile
+    tamamlanmış kayıtlar yeniden render edilmez.
+    """
+    from jsonl import iter_jsonl
+    from checkpoint import Manifest, output_name
+
+    manifest = Manifest(manifest_path) if manifest_path else None
+    ok = failed = skipped = 0
+    try:
+        for i, data in enumerate(iter_jsonl(jsonl_path)):
+            key = data.get("url") or f"{jsonl_path}#{i}"
+            if manifest is not None:
+                if resume and manifest.status(key) == "done":
+                    skipped += 1; continue
+                manifest.mark_pending([key])
+            out = os.path.join(out_dir, output_name(key, ".pptx"))
+            try:
+                render(data, in_pptx, out)
+                ok += 1
+                if manifest is not None: manifest.mark_done(key, out)
+            except Exception as e:
+                failed += 1
+                if manifest is not None: manifest.mark_failed(key, f"{type(e).__name__}: {e}")
+                print(f"HATA {key}: {type(e).__name__}: {e}", file=sys.stderr)
+    finally:
+        if manifest is not None: manifest.close()
+    print(f"Bitti: {ok} başarılı, {failed} hatalı, {skipped} atlandı -> {out_dir}")
+
 if __name__ == "__main__":
     ap = argparse.ArgumentParser(description="VA JSON'u JAMA VA şablonuna basar.")
-    ap.add_argument("--va", required=True)
+    ap.add_argument("--va")
+    ap.add_argument("--va-jsonl", help="Toplu render: satır başına bir VA kaydı içeren JSONL ('-' = stdin)")
     ap.add_argument("--in", dest="in_pptx", required=True)
     ap.add_argument("--out", default="outputs/va_filled.pptx")
+    ap.add_argument("--out-dir", default="outputs", help="--va-jsonl modunda PPTX çıktı dizini")
+    ap.add_argument("--manifest", help="Toplu render için checkpoint manifest dosyası")
+    ap.add_argument("--resume", action="store_true", help="Manifest'te tamamlanmış kayıtları atla")
     args = ap.parse_args()
-    main(args.va, args.in_pptx, args.out)
+    if args.va_jsonl:
+        main_batch(args.va_jsonl, args.in_pptx, args.out_dir, args.manifest, args.resume)
+    elif args.va:
+        main(args.va, args.in_pptx, args.out)
+    else:
+        ap.error("--va veya --va-jsonl gerekli")
@@ -0,0 +1,260 @@
+# watch.py
+# İzlenen makaleleri periyodik olarak yeniden doğrular; yalnızca içeriği değişenleri
+# yeniden render eder ve (istenirse) GitHub'a yükler.
+#
+# Makale başına maliyet değişiklikle orantılıdır:
+#   304 Not Modified (ETag / Last-Modified)  -> gövde indirilmez, parse yok
+#   200 + aynı gövde özeti                   -> parse yok
+#   200 + farklı gövde, aynı {title, va}     -> parse var, render/yükleme yok
+#   200 + farklı {title, va}                 -> depo güncellenir, PPTX render + yükleme
+# İzleme listesi ve doğrulayıcılar article_store'daki `watch` tablosunda tutulur.
+# GitHub token'ı depoya yazılmaz; yükleme GITHUB_TOKEN ortam değişkeniyle yapılır.
+#
+#   WATCH_INTERVAL_SECONDS (varsayılan: 0 = server içinde periyodik kontrol kapalı)
+#   WATCH_CONCURRENCY      (varsayılan: 4)
+#
+#   python watch.py add URL [--output dosya.pptx] [--repo kullanici/repo]
+#   python watch.py remove URL
+#   python watch.py list
+#   python watch.py run                    # tek tur
+#   python watch.py loop --interval 3600   # periyodik
+
+import os, sys, json, time, hashlib, logging, argparse, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from payload import content_of, diff_paths, record_hash
+from deadline import DeadlineExceeded
+from workers import leader, try_exclusive
+
+logger = logging.getLogger(__name__)
+
+NOT_MODIFIED, UNCHANGED, NEW, CHANGED, ERROR = "not_modified", "unchanged", "new", "changed", "error"
+ALREADY_RUNNING = "already_running"
+
+def _digest(obj) -> str:
+    data = obj.encode("utf-8") if isinstance(obj, str) else json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+class Watcher:
+    def __init__(self, store, template: str, out_dir: str, concurrency: int = 4,
+                 interval: float = 0, fetcher=None):
+        from fetchers import HttpFetcher
+        self.store, self.template, self.out_dir = store, template, out_dir
+        self.concurrency, self.interval = max(1, concurrency), interval
+        self.fetcher = fetcher or HttpFetcher(timeout=25)
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()   # aynı anda tek tur
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.totals = {NOT_MODIFIED: 0, UNCHANGED: 0, NEW: 0, CHANGED: 0, ERROR: 0}
+        self.runs = 0
+        self.last_run: Optional[Dict] = None
+
+    # ---- tek makale ----
+    def _publish(self, row: Dict, data: Dict, deadline=None) -> Dict:
+        import app
+        from checkpoint import output_name
+        from retention import get_retention
+        os.makedirs(self.out_dir, exist_ok=True)
+        out_path = os.path.join(self.out_dir, row.get("output_filename") or output_name(row["url"], ".pptx"))
+        result = {"output_path": out_path}
+        with get_retention().pin(out_path):
+            _, result["render_cached"] = app.render_to_pptx_cached(data, self.template, out_path)
+            token = os.environ.get("GITHUB_TOKEN", "")
+            if row.get("github_repo") and token:
+                url, err = app.upload_to_github_release(out_path, data.get("title", ""), row["github_repo"], token,
+                                                        deadline=deadline)
+                result["download_url"] = url or ""
+                if err:
+                    result["upload_error"] = err
+        return result
+
+    def check(self, row: Dict, deadline=None) -> Dict:
+        """
+        Bir izleme kaydını yeniden doğrular; {"url","status",...} döndürür. `deadline` verilirse
+        istek ve yükleme kalan süreyle sınırlanır; süre dolarsa DeadlineExceeded yukarı iletilir
+        (kayıt hata olarak işaretlenmez, sonraki turda yeniden denenir).
+        """
+        import extraction
+        url = row["fetch_url"]
+        now = time.time()
+        out = {"url": url}
+        try:
+            if deadline is not None:
+                deadline.check("watch")
+            status, html_src, etag, last_modified = self.fetcher.revalidate(
+                url, row.get("etag") or "", row.get("last_modified") or "", deadline=deadline)
+            state = {"etag": etag, "last_modified": last_modified, "checked_at": now}
+            if status == 304:
+                self.store.update_watch(url, last_status=NOT_MODIFIED, **state)
+                return dict(out, status=NOT_MODIFIED)
+            body_hash = _digest(html_src)
+            if body_hash == row.get("body_hash"):
+                self.store.update_watch(url, last_status=UNCHANGED, **state)
+                return dict(out, status=UNCHANGED)
+
+            rec, raw = extraction.extract_article(html_src, url)
+            data = rec.to_dict()
+            new_hash = record_hash(data)
+            stored = self.store.get(url)
+            previous = row.get("record_hash") or (record_hash(stored) if stored else None)
+            if new_hash == previous:
+                # biçim/reklam değişikliği: içerik aynı, yeniden render gerekmez
+                self.store.update_watch(url, body_hash=body_hash, record_hash=new_hash,
+                                        last_status=UNCHANGED, **state)
+                return dict(out, status=UNCHANGED)
+
+            kind = CHANGED if previous else NEW
+            fields = diff_paths(content_of(stored), content_of(data)) if stored else []
+            self.store.upsert(data, raw=raw, heuristics_version=extraction.HEURISTICS_VERSION)
+            published = self._publish(row, data, deadline)
+            # yükleme başarısız olsa da yeni içerik kaydedilir; sonraki tur yalnızca yeni değişikliklerde yükler
+            self.store.update_watch(url, body_hash=body_hash, record_hash=new_hash,
+                                    changed_at=now, last_status=kind, **state)
+            return dict(out, status=kind, title=data.get("title", ""), fields=fields, **published)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Watch check failed for {url}: {e}")
+            self.store.update_watch(url, checked_at=now, last_status=ERROR)
+            return dict(out, status=ERROR, error=str(e))
+
+    # ---- tur ----
+    def run_once(self, min_age: float = 0, deadline=None) -> Dict:
+        """
+        Tüm izlenen makaleleri (min_age > 0 ise yalnızca en az o kadar süredir kontrol
+        edilmemişleri) WATCH_CONCURRENCY eşzamanlı yeniden doğrular ve tur özetini döndürür.
+        Aynı anda tek tur çalışır (çok işçili dağıtımda işçiler arasında da): başka bir tur
+        sürüyorsa beklemeden {"status": "already_running"} döner. `deadline` dolarsa
+        başlamamış kontroller atlanır ve özetteki "unfinished" sayısına yazılır.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return {"status": ALREADY_RUNNING}
+        try:
+            with try_exclusive("watch-run") as owner:
+                if not owner:
+                    return {"status": ALREADY_RUNNING}
+                return self._run_rows(min_age, deadline)
+        finally:
+            self._run_lock.release()
+
+    def _run_rows(self, min_age: float, deadline) -> Dict:
+        t0 = time.perf_counter()
+        rows = self.store.tracked(checked_before=time.time() - min_age if min_age else None)
+        results, unfinished = [], 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="watch") as ex:
+            for fut in [ex.submit(self.check, row, deadline) for row in rows]:
+                try:
+                    results.append(fut.result())
+                except DeadlineExceeded:
+                    unfinished += 1
+        counts = {k: 0 for k in self.totals}
+        for r in results:
+            counts[r["status"]] += 1
+        summary = dict(counts, status="done" if not unfinished else "partial", tracked=len(rows),
+                       unfinished=unfinished, seconds=round(time.perf_counter() - t0, 2),
+                       finished_at=time.time(),
+                       changes=[r for r in results if r["status"] in (NEW, CHANGED, ERROR)])
+        with self._lock:
+            for k, v in counts.items():
+                self.totals[k] += v
+            self.runs += 1
+            self.last_run = summary
+        if counts[NEW] or counts[CHANGED] or counts[ERROR] or unfinished:
+            logger.info(f"Watch run: {counts[CHANGED]} changed, {counts[NEW]} new, "
+                        f"{counts[ERROR]} errors, {unfinished} unfinished of {len(rows)} tracked "
+                        f"in {summary['seconds']}s")
+        return summary
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning(f"Watch run failed: {e}")
+
+    def start(self) -> bool:
+        """
+        interval > 0 ise periyodik kontrol iş parçacığını başlatır (ilk tur bir aralık sonra).
+        Çok işçili dağıtımda yalnızca "watch" liderliğini alan işçide çalışır.
+        """
+        if self.interval <= 0 or self._thread is not None or not leader("watch"):
+            return False
+        self._thread = threading.Thread(target=self._run, name="watch", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            last = dict(self.last_run, changes=len(self.last_run["changes"])) if self.last_run else None
+            return {"interval_seconds": self.interval, "runs": self.runs, "totals": dict(self.totals), "last_run": last}
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def get_watcher() -> Watcher:
+    """ARTICLE_DB deposu, JAMA_TEMPLATE ve OUTPUT_DIR ile yapılandırılan süreç genelinde tek izleyici."""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                from article_store import get_store
+                from template_registry import default_template
+                _watcher = Watcher(
+                    get_store(),
+                    default_template(),
+                    os.environ.get("OUTPUT_DIR", "outputs"),
+                    concurrency=int(os.environ.get("WATCH_CONCURRENCY", "4")),
+                    interval=float(os.environ.get("WATCH_INTERVAL_SECONDS", "0")),
+                )
+    return _watcher
+
+# -------------------- cli --------------------
+def _print_summary(s: Dict):
+    if s["status"] == ALREADY_RUNNING:
+        print("Başka bir tur zaten çalışıyor.")
+        return
+    print(f"{s['tracked']} izlenen: {s[CHANGED]} değişti, {s[NEW]} yeni, {s[NOT_MODIFIED]} 304, "
+          f"{s[UNCHANGED]} değişmedi, {s[ERROR]} hata ({s['seconds']} sn)")
+    for c in s["changes"]:
+        extra = c.get("error") or ", ".join(c.get("fields") or []) or c.get("output_path", "")
+        print(f"  {c['status']:<8} {c['url']}  {extra}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser(description="İzlenen makaleleri yeniden doğrula, yalnızca değişenleri yeniden render et.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    a = sub.add_parser("add", help="Makaleyi izlemeye al")
+    a.add_argument("url")
+    a.add_argument("--output", default="", help="PPTX dosya adı (varsayılan: URL'den)")
+    a.add_argument("--repo", default="", help="Değişince yüklenecek GitHub repo (token: GITHUB_TOKEN)")
+    r = sub.add_parser("remove", help="Makaleyi izlemeden çıkar")
+    r.add_argument("url")
+    sub.add_parser("list", help="İzlenen makaleler")
+    sub.add_parser("run", help="Tek tur yeniden doğrulama")
+    l = sub.add_parser("loop", help="Periyodik yeniden doğrulama")
+    l.add_argument("--interval", type=float, default=float(os.environ.get("WATCH_INTERVAL_SECONDS", "0") or 3600))
+    args = ap.parse_args()
+
+    w = get_watcher()
+    if args.cmd == "add":
+        print(w.store.track(args.url, args.output, args.repo))
+    elif args.cmd == "remove":
+        print("çıkarıldı" if w.store.untrack(args.url) else "izlenmiyordu")
+    elif args.cmd == "list":
+        for row in w.store.tracked():
+            checked = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["checked_at"])) if row["checked_at"] else "-"
+            print(f"{row['last_status'] or '-':<13} {checked:<17} {row['fetch_url']}")
+    elif args.cmd == "run":
+        _print_summary(w.run_once())
+    elif args.cmd == "loop":
+        try:
+            while True:
+                _print_summary(w.run_once())
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            sys.exit(0)
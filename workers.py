@@ -0,0 +1,198 @@
+# workers.py
+# Çok işçili streamable HTTP dağıtımı (MCP_TRANSPORT=http, MCP_WORKERS > 1) için süreçler
+# arası koordinasyon. İşçiler aynı makinede ayrı süreçlerdir; durum SHARED_STATE_DIR
+# altındaki dosyalarla paylaşılır:
+#   worker_count()   - HTTP modunda MCP_WORKERS, stdio'da 1
+#   leader(name)     - flock ile tek sahip: periyodik işler (izleme turu, saklama süpürmesi)
+#                      yalnızca kilidi alan işçide çalışır; işçi ölürse kilit kendiliğinden düşer
+#   try_exclusive(name) - bloklamayan flock: aynı anda tek işçide çalışması gereken bölüm;
+#                      kilit başka işçideyse beklemeden False verir
+#   SharedRetention  - SQLite'ta süreçler arası saklama durumu: pinler, son kullanım zamanları
+#                      ve son süpürmenin kullanım özeti (her işçi /health'te aynı sayıları verir)
+#
+#   MCP_WORKERS       (varsayılan: 1)
+#   SHARED_STATE_DIR  (varsayılan: data)
+
+import os, time, sqlite3, logging, threading
+from contextlib import contextmanager
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+def http_mode() -> bool:
+    return os.environ.get("MCP_TRANSPORT", "stdio").strip().lower() in ("http", "streamable-http")
+
+def worker_count() -> int:
+    """Aynı kapıyı paylaşan işçi süreç sayısı (stdio modunda her zaman 1)."""
+    if not http_mode():
+        return 1
+    return max(1, int(os.environ.get("MCP_WORKERS", "1")))
+
+def shared_dir() -> str:
+    d = os.environ.get("SHARED_STATE_DIR", "data")
+    os.makedirs(os.path.join(d, "locks"), exist_ok=True)
+    return d
+
+def _lock_path(name: str) -> str:
+    return os.path.join(shared_dir(), "locks", f"{name}.lock")
+
+_held: Dict[str, int] = {}
+_held_lock = threading.Lock()
+
+def leader(name: str) -> bool:
+    """
+    `name` için kilidi bloklamadan almayı dener; alırsa süreç ömrü boyunca tutar.
+    Tek işçide (veya fcntl olmayan platformda) her zaman True.
+    """
+    if worker_count() <= 1:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        return True
+    with _held_lock:
+        if name in _held:
+            return True
+        fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        _held[name] = fd
+        return True
+
+def leaderships() -> list:
+    with _held_lock:
+        return sorted(_held)
+
+@contextmanager
+def try_exclusive(name: str):
+    """
+    Blok süresince tüm işçilerde tek sahip; kilit başka bir işçideyse beklemez, blok
+    False ile çalışır (çağıran "zaten çalışıyor" döndürür). Tek işçide her zaman True.
+    """
+    if worker_count() <= 1:
+        yield True
+        return
+    import fcntl
+    fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class SharedRetention:
+    """
+    retention.RetentionManager'ın süreçler arası durumu: (yol, pid) başına pin referansı
+    (ölü süreçlerin pinleri yok sayılır), yol başına son kullanım ve tek satırlık kullanım özeti.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pins (path TEXT NOT NULL, pid INTEGER NOT NULL, "
+            "refs INTEGER NOT NULL, since REAL NOT NULL, PRIMARY KEY (path, pid))")
+        conn.execute("CREATE TABLE IF NOT EXISTS last_use (path TEXT PRIMARY KEY, used_at REAL NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 1), files INTEGER, bytes INTEGER, "
+            "evicted_files INTEGER, evicted_bytes INTEGER, sweeps INTEGER, last_sweep REAL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, path: str):
+        self._conn().execute(
+            "INSERT INTO pins(path, pid, refs, since) VALUES (?,?,1,?) "
+            "ON CONFLICT(path, pid) DO UPDATE SET refs = refs + 1", (path, os.getpid(), time.time()))
+
+    def release(self, path: str):
+        conn = self._conn()
+        conn.execute("UPDATE pins SET refs = refs - 1 WHERE path = ? AND pid = ?", (path, os.getpid()))
+        conn.execute("DELETE FROM pins WHERE path = ? AND pid = ? AND refs <= 0", (path, os.getpid()))
+
+    def _live_pin(self, conn, path: str) -> bool:
+        rows = conn.execute("SELECT pid FROM pins WHERE path = ?", (path,)).fetchall()
+        dead = [pid for (pid,) in rows if not _alive(pid)]
+        if dead:
+            conn.executemany("DELETE FROM pins WHERE path = ? AND pid = ?", [(path, pid) for pid in dead])
+        return len(dead) < len(rows)
+
+    def is_pinned(self, path: str) -> bool:
+        """Canlı bir sürecin pinlediği yol mu (ölü süreçlere ait satırlar temizlenir)."""
+        return self._live_pin(self._conn(), path)
+
+    def unlink_unless_pinned(self, path: str) -> bool:
+        """
+        Pin kontrolü ve silme tek yazma işleminde (BEGIN IMMEDIATE): acquire() da yazma kilidi
+        aldığından kontrolle silme arasında başka bir süreç pin alamaz. Silindiyse True.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._live_pin(conn, path):
+                removed = False
+            else:
+                try:
+                    os.unlink(path)
+                    removed = True
+                except OSError:
+                    removed = False
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    # ---- son kullanım / kullanım özeti ----
+    def touch(self, path: str, when: float):
+        self._conn().execute("INSERT INTO last_use(path, used_at) VALUES (?, ?) "
+                             "ON CONFLICT(path) DO UPDATE SET used_at = MAX(used_at, excluded.used_at)", (path, when))
+
+    def last_used(self) -> Dict[str, float]:
+        return dict(self._conn().execute("SELECT path, used_at FROM last_use").fetchall())
+
+    def forget(self, paths):
+        self._conn().executemany("DELETE FROM last_use WHERE path = ?", [(p,) for p in paths])
+
+    def pinned_count(self) -> int:
+        conn = self._conn()
+        rows = conn.execute("SELECT DISTINCT path, pid FROM pins").fetchall()
+        return len({path for path, pid in rows if _alive(pid)})
+
+    def record_sweep(self, files: int, nbytes: int, evicted_files: int, evicted_bytes: int, when: float):
+        self._conn().execute(
+            "INSERT INTO usage(id, files, bytes, evicted_files, evicted_bytes, sweeps, last_sweep) "
+            "VALUES (1, ?, ?, ?, ?, 1, ?) ON CONFLICT(id) DO UPDATE SET files = excluded.files, "
+            "bytes = excluded.bytes, evicted_files = evicted_files + excluded.evicted_files, "
+            "evicted_bytes = evicted_bytes + excluded.evicted_bytes, sweeps = sweeps + 1, "
+            "last_sweep = excluded.last_sweep", (files, nbytes, evicted_files, evicted_bytes, when))
+
+    def usage(self) -> Dict:
+        row = self._conn().execute(
+            "SELECT files, bytes, evicted_files, evicted_bytes, sweeps, last_sweep FROM usage WHERE id = 1").fetchone()
+        keys = ("files", "bytes", "evicted_files", "evicted_bytes", "sweeps", "last_sweep")
+        return dict(zip(keys, row)) if row else dict(zip(keys, (0, 0, 0, 0, 0, None)))